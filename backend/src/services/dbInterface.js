@@ -1,7 +1,21 @@
+const zlib = require('zlib');
 const db = require('../db/connection');
 
 class DBInterface {
 
+  // Whether the crawler's post-processing has built the normalized ingredient tables
+  // (only a positive result is cached, since the tables appear after the first publish)
+  async hasNormalizedIngredients() {
+    if (this.normalizedIngredients) return true;
+    const row = await db.get(
+      `SELECT COUNT(*) AS count FROM sqlite_master
+       WHERE type = 'table' AND name IN ('product_ingredients', 'ingredient_dictionary')`
+    );
+    const columns = await db.all('PRAGMA table_info(products)');
+    this.normalizedIngredients = row.count === 2 && columns.some(column => column.name === 'goods_no');
+    return this.normalizedIngredients;
+  }
+
   // Search products with filters
   async searchProducts(filters = {}, limit = 10, offset = 0) {
     try {
@@ -54,8 +68,16 @@ class DBInterface {
       }
 
       if (filters.ingredients) {
-        query += ' AND ingredients LIKE ?';
-        params.push(`%${filters.ingredients}%`);
+        if (await this.hasNormalizedIngredients()) {
+          // Match against the crawler's normalized ingredient list (whitespace-insensitive)
+          query += ` AND EXISTS (SELECT 1 FROM product_ingredients pi
+                     JOIN ingredient_dictionary d ON d.ingredient_id = pi.ingredient_id
+                     WHERE pi.goods_no = products.goods_no AND d.name LIKE ?)`;
+          params.push(`%${String(filters.ingredients).replace(/\s+/g, '')}%`);
+        } else {
+          query += ' AND ingredients LIKE ?';
+          params.push(`%${filters.ingredients}%`);
+        }
       }
 
       // Ordering
@@ -99,11 +121,17 @@ class DBInterface {
 
       const ingredients = product.ingredients ? JSON.parse(product.ingredients) : [];
       let reviews = [];
-      try {
-        reviews = product.reviews ? JSON.parse(product.reviews) : [];
-      } catch (e) {
-        // If reviews is not valid JSON, treat as array of strings or text
-        reviews = product.reviews ? [product.reviews] : [];
+      if (product.reviews === undefined && product.goods_no) {
+        // Crawler now stores reviews in a separate table (one row per review)
+        reviews = await this.getReviewsByGoodsNo(product.goods_no);
+        product.reviews = reviews;
+      } else {
+        try {
+          reviews = product.reviews ? JSON.parse(product.reviews) : [];
+        } catch (e) {
+          // If reviews is not valid JSON, treat as array of strings or text
+          reviews = product.reviews ? [product.reviews] : [];
+        }
       }
       return {
         ...product,
@@ -118,6 +146,60 @@ class DBInterface {
     }
   }
 
+  // Get reviews from the crawler's review table (one row per review, optionally compressed)
+  async getReviewsByGoodsNo(goodsNo) {
+    const rows = await db.all(
+      `SELECT r.codec, r.dict_id, r.body FROM product_reviews pr
+       JOIN reviews r ON r.review_hash = pr.review_hash
+       WHERE pr.goods_no = ?
+       ORDER BY pr.position`,
+      [goodsNo]
+    );
+    const reviews = [];
+    for (const row of rows) {
+      try {
+        reviews.push(await this.decodeReview(row));
+      } catch (error) {
+        console.warn(`Failed to decode ${row.codec} review for ${goodsNo}:`, error.message);
+      }
+    }
+    return reviews;
+  }
+
+  // Shared compression dictionary (review_dictionaries.data), cached per dict_id
+  async getReviewDictionary(dictId) {
+    if (dictId === null || dictId === undefined) return null;
+    this.reviewDictionaries = this.reviewDictionaries || new Map();
+    if (!this.reviewDictionaries.has(dictId)) {
+      const row = await db.get('SELECT data FROM review_dictionaries WHERE dict_id = ?', [dictId]);
+      if (!row) throw new Error(`review dictionary ${dictId} not found`);
+      this.reviewDictionaries.set(dictId, Buffer.from(row.data));
+    }
+    return this.reviewDictionaries.get(dictId);
+  }
+
+  // Decode a review body the same way as the crawler's ReviewStore._decode
+  async decodeReview(row) {
+    if (row.codec === 'plain') {
+      return Buffer.isBuffer(row.body) ? row.body.toString('utf8') : row.body;
+    }
+    const body = Buffer.from(row.body);
+    const dictionary = await this.getReviewDictionary(row.dict_id);
+    const options = dictionary && dictionary.length ? { dictionary } : {};
+    if (row.codec === 'zlib') {
+      // Raw deflate (wbits -15) with an optional preset dictionary
+      return zlib.inflateRawSync(body, options).toString('utf8');
+    }
+    if (row.codec === 'zstd') {
+      // Built-in zstd needs Node >= 22.15; older runtimes cannot read zstd reviews
+      if (typeof zlib.zstdDecompressSync !== 'function') {
+        throw new Error('zstd is not supported by this Node.js version');
+      }
+      return zlib.zstdDecompressSync(body, options).toString('utf8');
+    }
+    throw new Error(`unknown review codec: ${row.codec}`);
+  }
+
   async searchReviews(productId) {
     const product = await this.getProductById(productId);
     return product.reviews;
@@ -27,14 +27,42 @@ HTTP_HEADERS = {
 REQUEST_TIMEOUT = 30
 RATE_LIMIT_DEFAULT = 1.0
 MAX_RETRIES_DEFAULT = 3
+HTTP_TRANSPORT_DEFAULT = 'auto'      # 'auto' (httpx가 있으면 HTTP/2), 'requests', 'httpx'
+HTTP_CONCURRENCY_DEFAULT = 4         # 동시 요청 수 (커넥션 풀 크기 기준)
+HTTP_POOL_HOSTS = 4                  # 커넥션 풀을 유지할 호스트 수 (올리브영, 이미지 CDN 등)
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
 
 # Selenium 관련 상수
 SELENIUM_WINDOW_SIZE = '1920,1080'
 SELENIUM_MAX_JS_DEPTH = 300
 SELENIUM_MAX_SCROLL_ATTEMPTS = 20
+SELECTOR_CACHE_PATH = 'output/selector_cache.json'  # 페이지 유형별로 학습한 셀렉터 우선순위
+SELECTOR_PROBE_TIMEOUT = 5           # 후보 셀렉터 전체를 기다리는 최대 시간 (초)
+SELECTOR_POLL_INTERVAL = 0.25        # 후보 셀렉터 재확인 간격 (초)
+SELENIUM_TABS_DEFAULT = 1            # 한 브라우저에서 동시에 여는 상품 탭 수 (1이면 기존 순차 방식)
+SELENIUM_TAB_MEMORY_BUDGET_MB = 1200 # 멀티 탭 모드에서 브라우저 메모리 상한 (넘으면 탭 수를 줄임)
+SELENIUM_PAGE_SETTLE_SECONDS = 2     # 페이지 로드 완료 후 동적 콘텐츠 대기 시간 (초)
+SELENIUM_PAGE_LOAD_TIMEOUT = 30      # 탭별 페이지 로드 최대 대기 시간 (초)
+SELENIUM_NAVIGATION_INTERVAL = 1.0   # 상품 페이지 요청 사이 최소 간격 (초)
+
+# 상주 브라우저 서비스 관련 상수 (원격 디버깅 Chrome에 Selenium이 연결)
+BROWSER_SERVICE_PORT = 9222
+BROWSER_PROFILE_DIR = 'output/browser_profile'        # 실행 간 재사용하는 프로필 (쿠키, 캐시, 동의 상태, --output-dir 기준)
+BROWSER_STATE_PATH = 'output/browser_service.json'    # 실행 중인 브라우저 pid/포트 기록 (--output-dir 기준)
+BROWSER_START_TIMEOUT = 20           # 브라우저 기동 후 헬스 체크 통과까지 최대 대기 (초)
+BROWSER_MAX_RSS_MB = 1500            # 브라우저 프로세스 트리 메모리가 이 값을 넘으면 재시작
+CHROME_BINARY_CANDIDATES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+
+# 상세 정보 추출 스케줄러 관련 상수 (우선순위 = 순위 가중치 × (경과 시간 + 변경 가산점))
+ENRICH_TIME_BUDGET_SECONDS = 1800    # enrich 1회 실행 시간 예산 (이후 새 상품을 시작하지 않음)
+ENRICH_RANK_HALF_WEIGHT = 20         # 순위 가중치가 1위의 절반이 되는 순위 간격
+ENRICH_TARGET_AGE_HOURS = 24         # 이 시간이 지나면 경과 점수 1.0
+ENRICH_STALENESS_CAP = 4.0           # 경과 점수 상한 (한 번도 추출하지 않은 상품에 적용)
+ENRICH_CHANGE_BONUS = 2.0            # 랭킹 정보 변경 / 지난 추출에서 내용 변경이 감지된 경우 가산점
 
 # 상품 추출 관련 상수
 MAX_REVIEWS_DEFAULT = 5
+INGREDIENTS_NOTICE_KEY = '화장품법에 따라 기재해야 하는 모든 성분'  # 상품정보 제공고시의 전성분 항목
 OLIVEYOUNG_BASE_URL = 'https://www.oliveyoung.co.kr'
 OLIVEYOUNG_SKINCARE_URL = f'{OLIVEYOUNG_BASE_URL}/store/main/getBestList.do'
 
@@ -47,13 +75,72 @@ OLIVEYOUNG_PARAMS_DEFAULT = {
     't_page': '랭킹',
     't_click': '판매랭킹_스킨케어'
 }
+RANKING_PAGE_SIZE_CANDIDATES = (100, 48, 24, 8)  # 랭킹 페이지 크기 후보 (큰 값부터 시도, rowsPerPage)
+PARSER_WORKERS_DEFAULT = None        # 랭킹 페이지 파싱 프로세스 수 (None이면 CPU 코어 수)
+PARSER_POOL_MIN_PAGES = 2            # 이보다 적은 페이지는 프로세스 풀 없이 바로 파싱
 
 # 출력 디렉토리 설정
 OUTPUT_DIR = 'output'
 IMAGES_DIR = 'output/images'
+IMAGE_OBJECTS_DIR = 'output/images/objects'    # SHA-256 기준 원본 이미지 저장소
+IMAGE_VARIANTS_DIR = 'output/images/variants'  # 썸네일/WebP 변환본
+SNAPSHOT_OBJECTS_DIR = 'output/snapshots/objects'  # 렌더링된 상품 페이지 스냅샷 (SHA-256 기준, 압축)
 CSV_FILENAME = 'products.csv'
 DB_FILENAME = 'products.db'
 
+# 읽기 전용 조회(storage.database_interface) 관련 상수
+DB_READ_POOL_SIZE = 4                # 읽기 전용 커넥션 수
+DB_MMAP_SIZE = 256 * 1024 * 1024     # 커넥션별 메모리 매핑 I/O 크기 (bytes)
+DB_QUERY_CACHE_SIZE = 256            # 조회 결과 LRU 캐시 항목 수
+DB_QUERY_MAX_LIMIT = 100             # 한 번에 조회할 수 있는 최대 상품 수
+
+# 이미지 저장 관련 상수
+IMAGE_THUMBNAIL_SIZES = (160, 320)   # 상품 카드용 썸네일 한 변 최대 크기 (px)
+IMAGE_WEBP_QUALITY = 80
+IMAGE_PHASH_MAX_DISTANCE = 3         # 같은 이미지로 볼 dHash 해밍 거리 (4개 16비트 구간 인덱스로 보장되는 최대값)
+
+# 리뷰 저장 관련 상수
+REVIEW_CODEC_DEFAULT = 'plain'     # 'plain', 'zlib', 'zstd' (zstd는 zstandard 패키지 필요)
+REVIEW_DICT_SIZE = 16 * 1024       # 공유 압축 사전 크기 (bytes)
+REVIEW_DICT_MIN_SAMPLES = 200      # 사전 학습에 필요한 최소 리뷰 수
+
+# 페이지 스냅샷 보관 관련 상수
+SNAPSHOT_COMPRESSION_LEVEL = 9     # zstd(zstandard 설치 시) 또는 zlib 압축 레벨
+
+# 데이터 후처리(집계 테이블) 관련 상수
+PRICE_BUCKET_SIZE = 10000     # 가격 구간 크기 (원)
+RATING_BUCKET_SIZE = 0.5      # 평점 구간 크기
+
+# 유사 상품 인덱스 관련 상수
+SIMILAR_TOP_K = 10                 # 상품당 저장할 유사 상품 수
+SIMILARITY_MIN_SCORE = 0.05        # 저장할 최소 코사인 유사도
+SIMILARITY_INGREDIENT_WEIGHT = 0.7 # 성분 유사도 가중치 (나머지는 리뷰 텍스트)
+SIMILARITY_REBUILD_RATIO = 0.3     # 변경 비율이 이 값을 넘으면 전체 재계산
+
+# 상품 요약(product_summaries) 관련 상수
+SUMMARY_TOKEN_BUDGET = 200         # 요약 문장 토큰 상한 (한글 1자 1토큰으로 보수적 추정)
+SUMMARY_TOP_INGREDIENTS = 8        # 요약에 넣을 성분 수 (전성분 표기 순서)
+SUMMARY_REVIEW_HIGHLIGHTS = 3      # 요약에 넣을 리뷰 문장 수
+SUMMARY_HIGHLIGHT_MAX_CHARS = 80   # 리뷰 문장 최대 길이
+SUMMARY_SPEC_MAX_CHARS = 40        # 제공고시 항목 값 최대 길이
+SUMMARY_NAME_MAX_CHARS = 50        # 상품명 최대 길이 (앞쪽 [행사] 표기 제거 후)
+
+# CLI 실행 관련 상수
+CLI_COLD_START_BUDGET_MS = 300     # 가벼운 명령(export 등)의 콜드 스타트 허용 시간
+CLI_HEAVY_MODULES = ('selenium', 'bs4', 'requests', 'numpy', 'scipy', 'PIL')  # 가벼운 명령에서 import되면 안 되는 모듈
+
+# 프로파일링(--profile) 관련 상수
+PROFILE_DIR = 'output/profiles'    # 실행 시각별 프로파일 저장 디렉토리
+PROFILE_SAMPLE_INTERVAL = 0.005    # sample 모드의 스택 수집 간격 (초)
+PROFILE_TOP_N = 30                 # 단계별 요약에 표시할 상위 함수 수
+
+# 읽기/쓰기 동시 부하 테스트(scripts.load_test) 관련 상수
+LOAD_TEST_MODES = ('delete', 'wal', 'replace')  # 저장 방식: 롤백 저널 / WAL / 복사본 교체(publish --copy-to)
+LOAD_TEST_READERS = 8                  # 동시에 조회하는 읽기 프로세스 수
+LOAD_TEST_DURATION_SECONDS = 30        # 저장 방식별 측정 시간 (초)
+LOAD_TEST_WRITE_INTERVAL_SECONDS = 1.0 # 쓰기 주기 사이 대기 시간 (초)
+LOAD_TEST_BUSY_TIMEOUT_MS = 0          # 읽기 커넥션의 busy 대기 시간 (Node sqlite3 기본값과 같은 0)
+
 # Chrome 오プション 설정
 CHROME_OPTIONS_COMMON = [
     '--no-sandbox',
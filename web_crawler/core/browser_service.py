@@ -0,0 +1,254 @@
+"""
+상주 브라우저 서비스 모듈
+원격 디버깅 포트를 연 Chrome을 실행 간에 계속 띄워두고, SeleniumProductExtractor가
+debuggerAddress로 연결하여 프로필(쿠키, 캐시, 동의 상태)을 재사용
+(selenium 없이 동작하여 CLI의 browser 명령에서 가볍게 사용 가능)
+"""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, USER_AGENT_CHROME, CHROME_OPTIONS_COMMON, BROWSER_SERVICE_PORT, BROWSER_PROFILE_DIR,
+    BROWSER_STATE_PATH, BROWSER_START_TIMEOUT, BROWSER_MAX_RSS_MB, CHROME_BINARY_CANDIDATES
+)
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """pid와 모든 하위 프로세스(렌더러, GPU 등)의 RSS 합계를 MB 단위로 계산합니다 (ps 사용)"""
+    try:
+        output = subprocess.run(['ps', '-A', '-o', 'pid=,ppid=,rss='],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 0.0
+
+    children: Dict[int, list] = {}
+    rss: Dict[int, int] = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) != 3:
+            continue
+        child, parent, kb = (int(value) for value in parts)
+        children.setdefault(parent, []).append(child)
+        rss[child] = kb
+
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total / 1024
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    """프로세스가 살아있는지 확인합니다"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BrowserService:
+    """원격 디버깅 Chrome 프로세스를 실행/점검/재시작하는 클래스"""
+
+    def __init__(self, port: int = BROWSER_SERVICE_PORT, profile_dir: Optional[str] = None,
+                 state_path: Optional[str] = None, headless: bool = True,
+                 max_rss_mb: float = BROWSER_MAX_RSS_MB, output_dir: str = OUTPUT_DIR):
+        """
+        Args:
+            port: 원격 디버깅 포트
+            profile_dir: 실행 간 재사용할 Chrome 사용자 데이터 디렉토리 (기본값: 출력 디렉토리의 browser_profile)
+            state_path: 실행 중인 브라우저 정보를 기록할 JSON 파일 (기본값: 출력 디렉토리의 browser_service.json)
+            headless: 브라우저를 백그라운드에서 실행할지 여부
+            max_rss_mb: 재시작 기준 메모리 (MB)
+            output_dir: 프로필/상태 파일 기본 위치의 기준 디렉토리
+        """
+        self.port = port
+        self.profile_dir = (Path(profile_dir) if profile_dir
+                            else Path(output_dir) / Path(BROWSER_PROFILE_DIR).relative_to(OUTPUT_DIR))
+        self.state_path = (Path(state_path) if state_path
+                           else Path(output_dir) / Path(BROWSER_STATE_PATH).relative_to(OUTPUT_DIR))
+        self.headless = headless
+        self.max_rss_mb = max_rss_mb
+
+    @property
+    def debugger_address(self) -> str:
+        """Selenium debuggerAddress 옵션 값"""
+        return f"127.0.0.1:{self.port}"
+
+    def pid(self) -> Optional[int]:
+        """실행 중인 브라우저의 pid (기록이 없거나 이미 종료되었으면 None)"""
+        pid = self._read_state().get('pid')
+        return pid if _pid_alive(pid) else None
+
+    def rss_mb(self) -> float:
+        """브라우저 프로세스 트리의 메모리 사용량 (MB, 실행 중이 아니면 0)"""
+        pid = self.pid()
+        return process_tree_rss_mb(pid) if pid else 0.0
+
+    def _read_state(self) -> Dict[str, Any]:
+        """기록된 브라우저 상태를 읽어옵니다"""
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state: Dict[str, Any]):
+        """브라우저 상태를 기록합니다"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _find_binary() -> Optional[str]:
+        """Chrome 실행 파일을 찾습니다 (CHROME_BINARY 환경변수 우선)"""
+        if os.environ.get('CHROME_BINARY'):
+            return os.environ['CHROME_BINARY']
+        for name in CHROME_BINARY_CANDIDATES:
+            path = shutil.which(name)
+            if path:
+                return path
+        return None
+
+    def health(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """
+        /json/version 엔드포인트로 브라우저 응답 여부를 확인합니다.
+
+        Returns:
+            브라우저 버전 정보 (응답이 없으면 None)
+        """
+        try:
+            with urllib.request.urlopen(f"http://{self.debugger_address}/json/version", timeout=timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def status(self) -> Dict[str, Any]:
+        """현재 브라우저 상태 (pid, 응답 여부, 메모리 사용량)를 반환합니다"""
+        state = self._read_state()
+        pid = state.get('pid')
+        alive = _pid_alive(pid)
+        version = self.health() if alive else None
+        return {
+            'pid': pid if alive else None,
+            'healthy': version is not None,
+            'browser': version.get('Browser') if version else None,
+            'rss_mb': round(process_tree_rss_mb(pid), 1) if alive else 0.0,
+            'started_at': state.get('started_at'),
+            'debugger_address': self.debugger_address,
+            'profile_dir': str(self.profile_dir),
+        }
+
+    def start(self) -> str:
+        """
+        브라우저를 실행합니다 (이미 정상 실행 중이면 그대로 사용).
+        CLI 프로세스가 끝나도 유지되도록 별도 세션으로 실행합니다.
+
+        Returns:
+            debuggerAddress
+        """
+        if _pid_alive(self._read_state().get('pid')) and self.health():
+            return self.debugger_address
+
+        binary = self._find_binary()
+        if not binary:
+            raise RuntimeError("Chrome 실행 파일을 찾을 수 없습니다. CHROME_BINARY 환경변수를 설정해주세요.")
+
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        command = [
+            binary,
+            f'--remote-debugging-port={self.port}',
+            f'--user-data-dir={self.profile_dir.resolve()}',
+            f'--user-agent={USER_AGENT_CHROME}',
+            '--no-first-run',
+            '--no-default-browser-check',
+        ]
+        if self.headless:
+            command.append('--headless=new')
+        command.extend(CHROME_OPTIONS_COMMON)
+        command.append('about:blank')
+
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, start_new_session=True)
+
+        deadline = time.monotonic() + BROWSER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"브라우저가 바로 종료되었습니다 (exit {process.returncode})")
+            if self.health():
+                self._write_state({
+                    'pid': process.pid,
+                    'port': self.port,
+                    'binary': binary,
+                    'profile_dir': str(self.profile_dir),
+                    'started_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                })
+                print(f"✅ 브라우저 서비스 시작: pid {process.pid}, {self.debugger_address}")
+                return self.debugger_address
+            time.sleep(0.25)
+
+        process.kill()
+        raise RuntimeError(f"브라우저 헬스 체크 시간 초과 ({BROWSER_START_TIMEOUT}초)")
+
+    def stop(self):
+        """브라우저를 종료합니다 (SIGTERM 후 응답이 없으면 SIGKILL)"""
+        pid = self._read_state().get('pid')
+        if _pid_alive(pid):
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                os.kill(pid, signal.SIGTERM)
+            deadline = time.monotonic() + 10
+            while _pid_alive(pid) and time.monotonic() < deadline:
+                try:
+                    os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    pass
+                time.sleep(0.2)
+            if _pid_alive(pid):
+                os.kill(pid, signal.SIGKILL)
+            print(f"🔚 브라우저 서비스 종료: pid {pid}")
+        try:
+            self.state_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def restart(self) -> str:
+        """브라우저를 재시작합니다 (프로필은 유지)"""
+        self.stop()
+        return self.start()
+
+    def ensure(self) -> str:
+        """
+        크롤링 시작 전에 호출: 응답이 없거나 메모리가 기준을 넘으면 재시작하고, 꺼져있으면 실행합니다.
+
+        Returns:
+            debuggerAddress
+        """
+        pid = self._read_state().get('pid')
+        if not _pid_alive(pid):
+            return self.start()
+        if not self.health():
+            print("⚠️  브라우저 서비스가 응답하지 않아 재시작합니다.")
+            return self.restart()
+
+        rss_mb = process_tree_rss_mb(pid)
+        if rss_mb > self.max_rss_mb:
+            print(f"♻️  브라우저 메모리 {rss_mb:.0f}MB > {self.max_rss_mb}MB, 재시작합니다.")
+            return self.restart()
+        return self.debugger_address
@@ -0,0 +1,210 @@
+"""
+상세 정보 추출 스케줄러 모듈
+순위, 마지막 추출 이후 경과 시간, 감지된 변경을 합친 점수로 상세 정보 추출 순서를 정하고
+추출이 끝난 상품은 바로 DB에 커밋하여 실행이 중간에 끊겨도 중요한 상품부터 최신 상태를 유지
+(selenium 없이 동작)
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.data_schema import goods_no_from_url
+from storage import exporter
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, DB_FILENAME, REVIEW_CODEC_DEFAULT, ENRICH_RANK_HALF_WEIGHT, ENRICH_TARGET_AGE_HOURS,
+    ENRICH_STALENESS_CAP, ENRICH_CHANGE_BONUS
+)
+
+ENRICHMENT_STATE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS enrichment_state (
+        goods_no TEXT PRIMARY KEY,
+        fingerprint TEXT,              -- 마지막 추출 시점의 랭킹 정보(상품명, 브랜드, 가격, 이미지) 해시
+        content_hash TEXT,             -- 마지막 추출 결과(상세 정보, 리뷰) 해시
+        content_changed INTEGER DEFAULT 0,  -- 마지막 추출에서 이전 결과와 달라졌는지 여부
+        enriched_at REAL,              -- 마지막 성공 시각 (epoch 초)
+        attempts INTEGER DEFAULT 0,    -- 연속 실패 횟수
+        last_error TEXT
+    )
+'''
+
+
+def _digest(value: Any) -> str:
+    """JSON 직렬화 값의 해시"""
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def listing_fingerprint(product: Dict[str, Any]) -> str:
+    """랭킹 페이지에서 보이는 상품 정보의 해시 (바뀌면 상세 페이지도 바뀌었을 가능성이 높음)"""
+    return _digest([product.get('name'), product.get('brand'), product.get('price'), product.get('image_url')])
+
+
+class EnrichmentScheduler:
+    """상세 정보 추출 순서를 정하고 결과를 상품 단위로 커밋하는 클래스"""
+
+    def __init__(self, db_path: str = DB_FILENAME, output_dir: str = OUTPUT_DIR,
+                 review_codec: str = REVIEW_CODEC_DEFAULT):
+        """
+        Args:
+            db_path: 출력 디렉토리 기준 DB 파일명
+            output_dir: 출력 디렉토리
+            review_codec: 새 리뷰 본문의 압축 방식
+        """
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.db_filepath = Path(output_dir) / db_path
+        self.review_codec = review_codec
+        self.conn: Optional[sqlite3.Connection] = None
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self.scores: Dict[str, float] = {}
+        self.committed = 0
+        self.failed = 0
+        self.changed = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """DB에 연결하고 상태 테이블을 준비합니다"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_filepath, isolation_level=None)
+            self.conn.execute(ENRICHMENT_STATE_SCHEMA)
+        return self.conn
+
+    def _load_states(self) -> Dict[str, Dict[str, Any]]:
+        """goodsNo별 추출 상태를 읽어옵니다"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            return {row['goods_no']: dict(row) for row in conn.execute('SELECT * FROM enrichment_state')}
+        finally:
+            conn.row_factory = None
+
+    def score(self, product: Dict[str, Any], state: Optional[Dict[str, Any]], now: float) -> float:
+        """
+        상품의 추출 우선순위 점수를 계산합니다.
+
+        순위 가중치 1 / (1 + (순위 - 1) / ENRICH_RANK_HALF_WEIGHT)에
+        (경과 시간 / ENRICH_TARGET_AGE_HOURS, 최대 ENRICH_STALENESS_CAP) + 변경 가산점을 곱하고
+        연속 실패 횟수만큼 나눕니다. 추출 기록이 없는 상품은 경과 점수 상한을 받습니다.
+        """
+        rank = product.get('rank') or 1
+        rank_weight = 1.0 / (1.0 + (rank - 1) / ENRICH_RANK_HALF_WEIGHT)
+
+        if not state or not state.get('enriched_at'):
+            staleness = ENRICH_STALENESS_CAP
+        else:
+            age_hours = max(0.0, now - state['enriched_at']) / 3600
+            staleness = min(age_hours / ENRICH_TARGET_AGE_HOURS, ENRICH_STALENESS_CAP)
+
+        change = 0.0
+        if state and state.get('fingerprint') and state['fingerprint'] != listing_fingerprint(product):
+            change += ENRICH_CHANGE_BONUS
+        if state and state.get('content_changed'):
+            change += ENRICH_CHANGE_BONUS
+
+        attempts = (state.get('attempts') or 0) if state else 0
+        return rank_weight * (staleness + change) / (1 + attempts)
+
+    def plan(self, products: List[Dict[str, Any]], missing_only: bool = False,
+             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        추출할 상품을 우선순위 점수가 높은 순서로 반환합니다.
+
+        Args:
+            products: 저장된 상품 리스트
+            missing_only: 상세 정보가 없는 상품만 포함
+            limit: 최대 상품 수
+
+        Returns:
+            점수 내림차순으로 정렬된 상품 리스트 (같은 점수면 순위 순)
+        """
+        self._states = self._load_states()
+        now = time.time()
+        candidates = []
+        for product in products:
+            goods_no = goods_no_from_url(product['url'])
+            if not goods_no or (missing_only and 'detail_info' in product):
+                continue
+            self.scores[goods_no] = self.score(product, self._states.get(goods_no), now)
+            candidates.append(product)
+
+        candidates.sort(key=lambda p: (-self.scores[goods_no_from_url(p['url'])], p.get('rank') or 0))
+        return candidates[:limit] if limit is not None else candidates
+
+    def commit(self, product: Dict[str, Any]):
+        """
+        추출이 끝난 상품 하나를 바로 저장합니다 (batch_extract_details의 on_result 콜백).
+        추출에 실패했거나 결과가 비어있으면 기존 데이터는 두고 실패 횟수만 기록합니다.
+        """
+        goods_no = goods_no_from_url(product['url'])
+        if not goods_no:
+            return
+        conn = self._connect()
+        detail_info = product.get('detail_info')
+        reviews = product.get('reviews') or []
+        error = product.get('extraction_error')
+        if not error and not (isinstance(detail_info, dict) and detail_info) and not reviews:
+            error = 'empty result'
+
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            if error:
+                conn.execute('''
+                    INSERT INTO enrichment_state (goods_no, attempts, last_error) VALUES (?, 1, ?)
+                    ON CONFLICT(goods_no) DO UPDATE SET attempts = attempts + 1, last_error = excluded.last_error
+                ''', (goods_no, str(error)))
+                conn.execute('COMMIT')
+                self.failed += 1
+                return
+
+            content_hash = _digest([detail_info or {}, reviews])
+            previous = self._states.get(goods_no, {}).get('content_hash')
+            content_changed = int(previous is not None and previous != content_hash)
+
+            exporter.update_product_details(conn, goods_no, detail_info if isinstance(detail_info, dict) else None,
+                                            reviews, self.review_codec)
+
+            conn.execute('''
+                INSERT INTO enrichment_state
+                    (goods_no, fingerprint, content_hash, content_changed, enriched_at, attempts, last_error)
+                VALUES (?, ?, ?, ?, ?, 0, NULL)
+                ON CONFLICT(goods_no) DO UPDATE SET
+                    fingerprint = excluded.fingerprint, content_hash = excluded.content_hash,
+                    content_changed = excluded.content_changed, enriched_at = excluded.enriched_at,
+                    attempts = 0, last_error = NULL
+            ''', (goods_no, listing_fingerprint(product), content_hash, content_changed, time.time()))
+            conn.execute('COMMIT')
+
+            self.committed += 1
+            self.changed += content_changed
+            self._states[goods_no] = {'content_hash': content_hash}
+
+        except Exception as e:
+            # 직렬화/인코딩 오류도 트랜잭션을 닫아야 다음 상품의 BEGIN이 실패하지 않음
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            self.failed += 1
+            print(f"   ❌ 상세 정보 저장 실패 ({goods_no}): {e}")
+
+    def ensure_products_schema(self):
+        """goods_no 컬럼이 없는 이전 DB는 상품 단위 커밋 전에 현재 스키마로 다시 저장합니다"""
+        columns = {row[1] for row in self._connect().execute('PRAGMA table_info(products)')}
+        if columns and 'goods_no' not in columns:
+            print("🔄 이전 스키마의 products 테이블을 변환합니다.")
+            products = exporter.load_from_sqlite(self.db_path, output_dir=self.output_dir)
+            exporter.save_to_sqlite(products, self.db_path, review_codec=self.review_codec,
+                                    output_dir=self.output_dir, preserve_details=True)
+
+    def close(self):
+        """DB 연결을 닫습니다"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
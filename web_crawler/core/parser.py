@@ -1,10 +1,350 @@
 """
 HTML 데이터 파싱 모듈
 BeautifulSoup을 사용하여 올리브영 상품 정보를 추출하는 핵심 로직
+랭킹 페이지 파싱은 프로세스 풀에서 실행할 수 있도록 모듈 함수로 제공
+(응답 bytes를 넘기고 가벼운 튜플을 돌려받아 GIL과 soup 직렬화 비용을 피함)
 """
 
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Any, List, Dict, Optional, Tuple
+
+from storage.snapshot_archive import read_object
+# 상수 import
+from config.constants import (
+    PARSER_WORKERS_DEFAULT, PARSER_POOL_MIN_PAGES, INGREDIENTS_NOTICE_KEY, SELENIUM_MAX_JS_DEPTH
+)
+
+# 랭킹 페이지의 전체 상품 수 표기 (예: "총 1,234개")
+TOTAL_COUNT_PATTERN = re.compile(r'총\s*([\d,]+)\s*개')
+
+# 상품 상세 페이지 후보 셀렉터 (기본 우선순위, 실시간 추출 시 실제 순서는 SelectorResolver가 학습)
+DETAIL_PAGE_TYPE = 'product_detail'
+INFO_BUTTON_SELECTORS = [
+    'button.Accordion_accordion-btn__IYjKm',  # CSS 클래스 기반
+    '//*[@id="tab-panels"]/section/ul/li[1]/button'  # XPath 기반
+]
+INFO_TABLE_SELECTORS = [
+    '.Accordion_content__aIya4',
+    '//*[@id="tab-panels"]/section/ul/li[1]/div'
+]
+REVIEW_TAB_SELECTORS = [
+    'button[class*="GoodsDetailTabs_tab-item"]:nth-child(2)',
+    '//*[@id="main"]/div[2]/div/div[3]/div[2]/div[1]/div/div/button[1]',
+]
+REVIEW_CONTAINER_SELECTORS = [
+    'oy-review-review-in-product',
+]
+REVIEW_ITEM_TAG = 'oy-review-review-item'
+
+# 스냅샷 저장 시 실시간 추출에서 찾은 요소에 남기는 표시 (오프라인 재추출은 이 표시를 먼저 사용)
+SNAPSHOT_ROLE_ATTRIBUTE = 'data-oy-role'
+
+# 랭킹 페이지 상품 한 개: (상품명, 브랜드, 가격, 평점, goodsNo, 이미지 URL)
+RankingRow = Tuple[str, str, int, float, Optional[str], Optional[str]]
+# 랭킹 페이지 파싱 결과: (상품 목록, 전체 상품 수, 마지막 페이지 번호)
+RankingPage = Tuple[List[RankingRow], Optional[int], Optional[int]]
+
+
+def extract_goods_no(item_elem) -> Optional[str]:
+    """상품 요소에서 goodsNo를 추출합니다"""
+    try:
+        # 상품 상세 링크 찾기 (상품명 링크)
+        link_elem = item_elem.find('a')
+        if link_elem and 'href' in link_elem.attrs:
+            href = link_elem['href']
+            # href에서 goodsNo 파라미터 추출 (절대/상대 경로 모두)
+            if 'goodsNo=' in href:
+                goods_no_start = href.find('goodsNo=') + len('goodsNo=')
+                goods_no_end = href.find('&', goods_no_start)
+                if goods_no_end == -1:
+                    goods_no_end = len(href)
+                return href[goods_no_start:goods_no_end]
+    except Exception as e:
+        print(f"goodsNo 추출 실패: {e}")
+
+    return None  # goodsNo를 찾지 못한 경우
+
+
+def extract_image_url(item_elem) -> Optional[str]:
+    """상품 요소에서 이미지 URL을 추출합니다"""
+    try:
+        # 상품 이미지 찾기
+        img_elem = item_elem.find('img')
+        if img_elem and 'src' in img_elem.attrs:
+            src = img_elem['src']
+            # 호스트가 없는 상대경로인 경우 절대경로로 변환
+            if not src.startswith('http'):
+                if 'image.oliveyoung.co.kr' in src:
+                    src = f"https:{src}" if src.startswith('//') else f"https://image.oliveyoung.co.kr{src}"
+                else:
+                    src = f"https://image.oliveyoung.co.kr{src}"
+            return src
+    except Exception as e:
+        print(f"이미지 URL 추출 실패: {e}")
+
+    return None  # 이미지 URL을 찾지 못한 경우
+
+
+def parse_ranking_items(soup: BeautifulSoup) -> List[RankingRow]:
+    """랭킹 페이지 soup에서 상품 목록을 페이지 내 순서대로 추출합니다"""
+    rows = []
+    try:
+        # 상품 목록 컨테이너 찾기 (올리브영 구조에 맞게 조정)
+        for item in soup.find_all('div', class_='prd_info'):
+            try:
+                name_elem = item.find('p', class_='tx_name')
+                name = name_elem.get_text(strip=True) if name_elem else "Unknown"
+
+                price_elem = item.find('span', class_='tx_cur')
+                price = price_elem.get_text(strip=True).replace(',', '').replace('원', '') if price_elem else "0"
+
+                brand_elem = item.find('span', class_='tx_brand')
+                brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
+
+                rating_elem = item.find('span', class_='rating')
+                rating = rating_elem.get_text(strip=True) if rating_elem else "0.0"
+
+                rows.append((
+                    name,
+                    brand,
+                    int(price) if price.isdigit() else 0,
+                    float(rating) if rating.replace('.', '').isdigit() else 0.0,
+                    extract_goods_no(item),
+                    extract_image_url(item),
+                ))
+            except Exception as e:
+                print(f"상품 정보 추출 실패: {e}")
+                continue
+    except Exception as e:
+        print(f"상품 목록 추출 실패: {e}")
+
+    return rows
+
+
+def page_signal(soup: BeautifulSoup) -> Tuple[Optional[int], Optional[int]]:
+    """
+    랭킹 페이지에서 전체 상품 수 / 마지막 페이지 번호를 찾습니다.
+
+    Returns:
+        (전체 상품 수, 마지막 페이지 번호) — 찾지 못한 값은 None
+    """
+    total_count = None
+    match = TOTAL_COUNT_PATTERN.search(soup.get_text(' ', strip=True))
+    if match:
+        total_count = int(match.group(1).replace(',', ''))
+
+    last_page = None
+    for link in soup.select('.pageing a, .paging a, [data-page-no]'):
+        value = link.get('data-page-no') or link.get_text(strip=True)
+        if value and value.isdigit():
+            last_page = max(last_page or 0, int(value))
+    return total_count, last_page
+
+
+def parse_ranking_page(content: Optional[bytes]) -> Optional[RankingPage]:
+    """
+    랭킹 페이지 응답 본문을 파싱합니다 (프로세스 풀 작업 함수).
+
+    Args:
+        content: 응답 본문 bytes (요청 실패 시 None)
+
+    Returns:
+        (상품 튜플 목록, 전체 상품 수, 마지막 페이지 번호) — 본문이 없으면 None
+    """
+    if content is None:
+        return None
+    soup = BeautifulSoup(content, 'html.parser')
+    return (parse_ranking_items(soup),) + page_signal(soup)
+
+
+class RankingPageParser:
+    """랭킹 페이지 본문을 코어 수만큼의 프로세스에서 병렬 파싱하는 클래스"""
+
+    def __init__(self, workers: Optional[int] = PARSER_WORKERS_DEFAULT):
+        """
+        Args:
+            workers: 작업 프로세스 수 (None이면 CPU 코어 수)
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def parse_pages(self, contents: List[Optional[bytes]]) -> List[Optional[RankingPage]]:
+        """
+        여러 페이지 본문을 파싱합니다. 결과는 입력 순서(페이지 순서)와 같습니다.
+        코어가 하나이거나 페이지가 적으면 프로세스 시작 비용을 피해 현재 프로세스에서 파싱합니다.
+        """
+        pending = sum(1 for content in contents if content is not None)
+        if self.workers == 1 or pending < PARSER_POOL_MIN_PAGES:
+            return [parse_ranking_page(content) for content in contents]
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return list(self._pool.map(parse_ranking_page, contents))
+
+    def close(self):
+        """작업 프로세스를 종료합니다"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_detail_info(rows: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    상품정보 제공고시 테이블의 (th, td) 텍스트 쌍으로 상세 정보를 만듭니다.
+    실시간 추출과 스냅샷 재추출이 같은 정리/성분 분리 규칙을 사용합니다.
+
+    Returns:
+        {'full_info': 전체 상세 정보, 'ingredients': 전성분 목록}
+    """
+    table_data = {}
+    for key, value in rows:
+        # 줄바꿈/연속 공백을 공백 하나로
+        table_data[key.strip()] = ' '.join(value.split())
+
+    ingredients = []
+    if INGREDIENTS_NOTICE_KEY in table_data:
+        # ,로 구분된 성분들을 분리하고 정리
+        ingredients = [ing.strip() for ing in table_data[INGREDIENTS_NOTICE_KEY].split(',') if ing.strip()]
+    return {'full_info': table_data, 'ingredients': ingredients}
+
+
+def _find_snapshot_element(html: bytes, role: str, candidates: List[str]):
+    """
+    스냅샷에서 역할 표시가 있는 요소를 찾고, 없으면 CSS 후보 셀렉터로 찾습니다 (XPath 후보는 건너뜀).
+    표시가 있으면 해당 요소부터 잘라 그 하위 트리만 만들어 페이지 전체를 파싱하지 않습니다
+    (직렬화 시 속성 값의 '<'는 이스케이프되므로 표시 앞의 마지막 '<'가 요소 시작).
+    """
+    marker = f'{SNAPSHOT_ROLE_ATTRIBUTE}="{role}"'.encode('utf-8')
+    index = html.find(marker)
+    if index >= 0:
+        start = html.rfind(b'<', 0, index)
+        only = SoupStrainer(attrs={SNAPSHOT_ROLE_ATTRIBUTE: role})
+        subtree = BeautifulSoup(html[start:], 'html.parser', parse_only=only)
+        element = subtree.find(attrs={SNAPSHOT_ROLE_ATTRIBUTE: role})
+        if element is not None:
+            return element
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in candidates:
+        if selector.startswith('//') or selector.startswith('('):
+            continue
+        element = soup.select_one(selector)
+        if element is not None:
+            return element
+    return None
+
+
+def _child_elements(node) -> List[Any]:
+    """
+    자식 요소 목록 (선언적 섀도 루트 <template shadowrootmode>는 섀도 루트로 취급하여 포함,
+    일반 <template> 내용은 실제 DOM처럼 제외)
+    """
+    if node.name == 'template' and not node.has_attr('shadowrootmode'):
+        return []
+    return [child for child in node.children if getattr(child, 'name', None)]
+
+
+def _inner_text(element) -> str:
+    """innerText와 같은 방식으로 텍스트를 만듭니다 (공백 정리, <br>은 줄바꿈)"""
+    lines, current = [], []
+    for node in element.descendants:
+        if getattr(node, 'name', None) == 'br':
+            lines.append(current)
+            current = []
+        elif getattr(node, 'name', None) is None:
+            current.append(str(node))
+    lines.append(current)
+    return '\n'.join(' '.join(''.join(parts).split()) for parts in lines).strip()
+
+
+def table_rows_from_soup(container) -> List[Tuple[str, str]]:
+    """테이블 컨테이너의 모든 행에서 (th, td) 텍스트 쌍을 추출합니다"""
+    rows = []
+    for row in container.find_all('tr'):
+        th, td = row.find('th'), row.find('td')
+        if th is not None and td is not None:
+            rows.append((th.get_text(), td.get_text()))
+    return rows
+
+
+def parse_detail_snapshot(html: bytes) -> Optional[Dict[str, Any]]:
+    """상품정보 제공고시를 펼친 상태의 스냅샷에서 상세 정보를 추출합니다 (테이블이 없으면 None)"""
+    container = _find_snapshot_element(html, 'info_table', INFO_TABLE_SELECTORS)
+    if container is None:
+        return None
+    return build_detail_info(table_rows_from_soup(container))
+
+
+def parse_review_snapshot(html: bytes, max_reviews: int) -> Optional[List[str]]:
+    """
+    리뷰 탭 스냅샷에서 리뷰를 추출합니다 (리뷰 컨테이너가 없으면 None).
+    실시간 추출 스크립트와 같이 섀도 루트를 포함해 리뷰 항목을 BFS로 모으고, 항목마다 첫 <p>를 DFS로 찾습니다.
+    """
+    container = _find_snapshot_element(html, 'review_container', REVIEW_CONTAINER_SELECTORS)
+    if container is None:
+        return None
+
+    items = []
+    queue = [(container, 0)]
+    head = 0
+    while head < len(queue):
+        node, depth = queue[head]
+        head += 1
+        if depth > SELENIUM_MAX_JS_DEPTH:
+            continue
+        if node.name == REVIEW_ITEM_TAG:
+            items.append(node)
+            continue
+        queue.extend((child, depth + 1) for child in _child_elements(node))
+
+    def find_p(node, depth):
+        if depth > SELENIUM_MAX_JS_DEPTH:
+            return None
+        if node.name == 'p':
+            return node
+        for child in _child_elements(node):
+            found = find_p(child, depth + 1)
+            if found is not None:
+                return found
+        return None
+
+    reviews = []
+    for item in items:
+        p = find_p(item, 0)
+        if p is not None:
+            reviews.append(_inner_text(p))
+        if len(reviews) >= max_reviews:
+            break
+    return reviews
+
+
+def reextract_page(documents: Dict[str, Tuple[str, str]], max_reviews: int) -> Dict[str, Any]:
+    """
+    보관된 상품 페이지 스냅샷을 다시 파싱합니다 (프로세스 풀 작업 함수, 브라우저 불필요).
+
+    Args:
+        documents: 단계('info', 'reviews') → (압축 파일 경로, 압축 방식)
+        max_reviews: 최대 리뷰 수
+
+    Returns:
+        {'detail_info': 상세 정보 또는 None, 'reviews': 리뷰 목록 또는 None} (스냅샷이 없는 항목은 None)
+    """
+    result: Dict[str, Any] = {'detail_info': None, 'reviews': None}
+    if 'info' in documents:
+        result['detail_info'] = parse_detail_snapshot(read_object(*documents['info']))
+    if 'reviews' in documents:
+        result['reviews'] = parse_review_snapshot(read_object(*documents['reviews']), max_reviews)
+    return result
+
 
 class DataParser:
     """HTML 데이터 파싱을 담당하는 클래스"""
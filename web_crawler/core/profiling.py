@@ -0,0 +1,276 @@
+"""
+크롤링 프로파일링 모듈
+--profile 옵션으로 실행하면 단계(crawl, enrich, save, process 등)별로 실행 시간을 측정하여
+output/profiles/<실행 시각>-<pid>/ 아래에 저장
+- sample: 모든 스레드의 스택을 주기적으로 수집 (벽시계 기준, time.sleep/대기 시간 포함)
+          단계별 <단계>.collapsed와 전체 all.collapsed는 flamegraph.pl, speedscope 등의 입력 형식
+- cprofile: 메인 스레드 결정적 프로파일링, 단계별 <단계>.prof (pstats/snakeviz로 열람)
+--profile-browser를 함께 주면 주입 스크립트의 브라우저 안 실행 시간과 WebDriver 왕복 시간을 기록
+(표준 라이브러리만 사용하여 가벼운 명령에서도 import 가능)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 상수 import
+from config.constants import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_N
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+# 주입 스크립트를 감싸 브라우저 안 실행 시간(performance.now)을 함께 반환
+# ({script}는 str.replace로 채움 — 스크립트 안의 '%'나 중괄호가 서식 문자로 해석되지 않도록)
+BROWSER_TIMING_WRAPPER = """
+const __oyStart = performance.now();
+const __oyResult = (function() {
+{script}
+}).apply(this, arguments);
+return [__oyResult, performance.now() - __oyStart];
+"""
+
+
+def _frame_label(code, module: str) -> str:
+    """collapsed 스택의 프레임 이름 (모듈:함수)"""
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """별도 스레드에서 모든 스레드의 호출 스택을 주기적으로 수집하는 클래스"""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        """
+        Args:
+            interval: 수집 간격 (초)
+        """
+        self.interval = interval
+        self.stage: Optional[str] = None
+        self.samples: Dict[str, Counter] = defaultdict(Counter)
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """수집 스레드를 시작합니다"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """수집 스레드를 종료합니다"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _stack(self, frame) -> Tuple[str, ...]:
+        """프레임에서 바깥쪽부터의 호출 스택을 만듭니다"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _frame_label(code, frame.f_globals.get('__name__', '?'))
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _run(self):
+        """수집 루프 (단계 밖에서는 수집하지 않음)"""
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            stage = self.stage
+            if stage is None:
+                continue
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            counter = self.samples[stage]
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    counter[(names.get(ident, str(ident)),) + self._stack(frame)] += 1
+
+
+class Profiler:
+    """단계별 프로파일링과 브라우저 스크립트 시간 측정을 관리하는 클래스 (mode가 None이면 아무것도 하지 않음)"""
+
+    def __init__(self, mode: Optional[str] = None, output_dir: str = PROFILE_DIR,
+                 browser_timing: bool = False, interval: float = PROFILE_SAMPLE_INTERVAL):
+        """
+        Args:
+            mode: 'sample', 'cprofile' 또는 None (비활성화)
+            output_dir: 프로파일 저장 디렉토리 (실행 시각별 하위 디렉토리 생성)
+            browser_timing: 주입 스크립트의 브라우저 안 실행 시간 측정 여부
+            interval: sample 모드의 수집 간격 (초)
+        """
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일링 방식: {mode}")
+        self.mode = mode
+        self.output_dir = Path(output_dir) / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.browser_timing = browser_timing and mode is not None
+        self.stage_times: Dict[str, List[float]] = defaultdict(list)
+        self.script_times: Dict[str, List[Tuple[float, Optional[float]]]] = defaultdict(list)
+        self._stages: List[str] = []
+        self._sampler = StackSampler(interval) if mode == 'sample' else None
+        self._profiles: Dict[str, Any] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """프로파일링 활성화 여부"""
+        return self.mode is not None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        단계를 측정합니다. 단계 안에서 다시 호출하면 '바깥/안쪽' 이름의 하위 단계가 됩니다.
+        같은 이름의 단계를 여러 번 실행하면 결과를 합칩니다.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        path = '/'.join(self._stages + [name])
+        outer = self._stages[-1] if self._stages else None
+        self._stages.append(path)
+        if self._sampler is not None:
+            self._sampler.stage = path
+            self._sampler.start()
+        else:
+            # cProfile은 동시에 하나만 활성화할 수 있으므로 바깥 단계를 잠시 멈춤
+            import cProfile
+            if outer is not None:
+                self._profiles[outer].disable()
+            self._profiles.setdefault(path, cProfile.Profile()).enable()
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[path].append(time.perf_counter() - started)
+            self._stages.pop()
+            if self._sampler is not None:
+                self._sampler.stage = outer
+            else:
+                self._profiles[path].disable()
+                if outer is not None:
+                    self._profiles[outer].enable()
+
+    def execute_script(self, driver, name: str, script: str, *args) -> Any:
+        """
+        WebDriver 스크립트를 실행하며 왕복 시간을 기록합니다.
+        browser_timing이 켜져 있으면 브라우저 안 실행 시간도 기록합니다 (차이가 WebDriver 통신 비용).
+        """
+        if not self.enabled:
+            return driver.execute_script(script, *args)
+
+        started = time.perf_counter()
+        if not self.browser_timing:
+            result = driver.execute_script(script, *args)
+            self.script_times[name].append(((time.perf_counter() - started) * 1000, None))
+            return result
+
+        result, browser_ms = driver.execute_script(BROWSER_TIMING_WRAPPER.replace('{script}', script), *args)
+        self.script_times[name].append(((time.perf_counter() - started) * 1000, browser_ms))
+        return result
+
+    @staticmethod
+    def _file_name(stage: str) -> str:
+        """단계 이름을 파일명으로 변환합니다"""
+        return stage.replace('/', '.')
+
+    def _write_samples(self):
+        """sample 모드 결과를 저장합니다 (단계별 collapsed/요약, 전체 all.collapsed)"""
+        lines_all = []
+        for stage, counter in sorted(self._sampler.samples.items()):
+            base = self.output_dir / self._file_name(stage)
+            collapsed = [f"{';'.join(stack)} {count}" for stack, count in counter.most_common()]
+            Path(f"{base}.collapsed").write_text('\n'.join(collapsed) + '\n', encoding='utf-8')
+            lines_all.extend(f"{stage.replace('/', ';')};{line}" for line in collapsed)
+
+            # 요약: 자체 시간(스택 맨 위)과 누적 시간(스택에 포함) 상위 프레임
+            total = sum(counter.values())
+            own, inclusive = Counter(), Counter()
+            for stack, count in counter.items():
+                own[stack[-1]] += count
+                for label in set(stack[1:]):
+                    inclusive[label] += count
+            report = [f"{stage}: 샘플 {total}개 (간격 {self._sampler.interval * 1000:.0f}ms, 스레드별 합계)", '',
+                      '[자체 시간 상위]']
+            report += [f"{count / total:7.1%}  {label}" for label, count in own.most_common(PROFILE_TOP_N)]
+            report += ['', '[누적 시간 상위]']
+            report += [f"{count / total:7.1%}  {label}" for label, count in inclusive.most_common(PROFILE_TOP_N)]
+            Path(f"{base}.txt").write_text('\n'.join(report) + '\n', encoding='utf-8')
+        if lines_all:
+            (self.output_dir / 'all.collapsed').write_text('\n'.join(lines_all) + '\n', encoding='utf-8')
+
+    def _write_cprofile(self):
+        """cprofile 모드 결과를 저장합니다 (단계별 .prof와 누적 시간 기준 요약)"""
+        import io
+        import pstats
+
+        for stage, profile in self._profiles.items():
+            profile.dump_stats(str(self.output_dir / f"{self._file_name(stage)}.prof"))
+            buffer = io.StringIO()
+            pstats.Stats(profile, stream=buffer).sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+            (self.output_dir / f"{self._file_name(stage)}.txt").write_text(buffer.getvalue(), encoding='utf-8')
+
+    def _script_summary(self) -> Dict[str, Dict[str, Any]]:
+        """주입 스크립트별 호출 수와 왕복/브라우저 안 실행 시간 (ms)"""
+        import statistics
+
+        summary = {}
+        for name, timings in sorted(self.script_times.items()):
+            roundtrip = [total for total, _ in timings]
+            browser = [inner for _, inner in timings if inner is not None]
+            entry = {
+                'calls': len(timings),
+                'roundtrip_ms_total': round(sum(roundtrip), 1),
+                'roundtrip_ms_p50': round(statistics.median(roundtrip), 2),
+                'roundtrip_ms_max': round(max(roundtrip), 2),
+            }
+            if browser:
+                entry['browser_ms_total'] = round(sum(browser), 1)
+                entry['browser_ms_p50'] = round(statistics.median(browser), 2)
+                entry['webdriver_overhead_ms_total'] = round(sum(roundtrip) - sum(browser), 1)
+            summary[name] = entry
+        return summary
+
+    def finish(self) -> Optional[Path]:
+        """
+        수집을 마치고 결과를 저장합니다.
+
+        Returns:
+            프로파일 디렉토리 (비활성화 상태이거나 측정한 단계가 없으면 None)
+        """
+        if not self.enabled:
+            return None
+        if self._sampler is not None:
+            self._sampler.stop()
+        if not self.stage_times:
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self._sampler is not None:
+            self._write_samples()
+        else:
+            self._write_cprofile()
+        summary = {
+            'mode': self.mode,
+            'stages': {stage: {'runs': len(times), 'seconds': round(sum(times), 3)}
+                       for stage, times in self.stage_times.items()},
+            'browser_scripts': self._script_summary(),
+        }
+        (self.output_dir / 'summary.json').write_text(json.dumps(summary, ensure_ascii=False, indent=2),
+                                                      encoding='utf-8')
+
+        print(f"\n🔬 프로파일 저장: {self.output_dir} ({self.mode}, 단계 {len(self.stage_times)}개)")
+        for stage, entry in summary['stages'].items():
+            print(f"   - {stage:<20} {entry['seconds']:8.2f}초")
+        for name, entry in summary['browser_scripts'].items():
+            detail = f", 브라우저 안 {entry['browser_ms_total']:.0f}ms" if 'browser_ms_total' in entry else ''
+            print(f"   - 스크립트 {name:<14} {entry['calls']}회, 왕복 {entry['roundtrip_ms_total']:.0f}ms{detail}")
+        return self.output_dir
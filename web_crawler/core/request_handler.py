@@ -1,62 +1,80 @@
 """
 HTTP 요청 처리 모듈
 세션 관리, 재시도 로직, 요청 제한 등을 담당
+(실제 HTTP 클라이언트는 core.transport의 전송 계층을 사용)
 """
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import threading
 import time
 from typing import Optional, Dict, Any
 
+from .transport import create_transport
 # 상수 import
-from config.constants import HTTP_HEADERS
+from config.constants import HTTP_TRANSPORT_DEFAULT, HTTP_CONCURRENCY_DEFAULT
 
 class RequestHandler:
     """HTTP 요청을 처리하는 클래스"""
 
-    def __init__(self, rate_limit: float = 1.0, max_retries: int = 3):
+    def __init__(self, rate_limit: float = 1.0, max_retries: int = 3,
+                 transport: str = HTTP_TRANSPORT_DEFAULT, concurrency: int = HTTP_CONCURRENCY_DEFAULT):
         """
         Args:
             rate_limit: 요청 간 최소 간격 (초)
             max_retries: 최대 재시도 횟수
+            transport: 전송 계층 ('auto', 'requests', 'httpx')
+            concurrency: 동시 요청 수 (커넥션 풀 크기)
         """
         self.rate_limit = rate_limit
         self.max_retries = max_retries
         self.last_request_time = 0
+        # 여러 스레드가 동시에 요청해도 요청 간격과 통계가 유지되도록 보호
+        self._lock = threading.Lock()
 
-        # 세션 생성 및 재시도 전략 설정
-        self.session = requests.Session()
+        # 전송 계층 생성 (재시도 전략, 커넥션 풀, 브라우저와 같은 헤더 포함)
+        self.transport = create_transport(transport, pool_size=max(concurrency, 1), max_retries=max_retries)
 
-        # 재시도 전략
-        retry_strategy = Retry(
-            total=max_retries,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1
-        )
+        # 요청 통계
+        self._stats = {'requests': 0, 'failures': 0, 'elapsed': 0.0, 'wire_bytes': 0, 'versions': {}}
 
-        # HTTPAdapter에 재시도 전략 적용
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+    def _wait_for_rate_limit(self):
+        """요청 간격을 유지하기 위해 대기 (스레드별로 다음 요청 시각을 예약한 뒤 잠금 밖에서 대기)"""
+        with self._lock:
+            current_time = time.time()
+            request_time = max(current_time, self.last_request_time + self.rate_limit)
+            self.last_request_time = request_time
+
+        wait_time = request_time - current_time
+        if wait_time > 0:
+            time.sleep(wait_time)
 
-        # 실제 브라우저처럼 헤더 설정 (올리브영 크롤링용)
-        self.session.headers.update(HTTP_HEADERS)
+    def _request(self, method: str, url: str, timeout: int, rate_limited: bool, **kwargs) -> Optional[Any]:
+        """요청 공통 처리 (요청 제한, 상태 코드 확인, 통계 기록)"""
+        try:
+            if rate_limited:
+                self._wait_for_rate_limit()
 
-    def _wait_for_rate_limit(self):
-        """요청 간격을 유지하기 위해 대기"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+            start = time.perf_counter()
+            response = self.transport.request(method, url, timeout=timeout, **kwargs)
+            response.raise_for_status()
 
-        if time_since_last_request < self.rate_limit:
-            wait_time = self.rate_limit - time_since_last_request
-            time.sleep(wait_time)
+            elapsed = time.perf_counter() - start
+            wire_bytes = self.transport.wire_bytes(response)
+            version = self.transport.http_version(response)
+            with self._lock:
+                self._stats['requests'] += 1
+                self._stats['elapsed'] += elapsed
+                self._stats['wire_bytes'] += wire_bytes
+                self._stats['versions'][version] = self._stats['versions'].get(version, 0) + 1
+            return response
 
-        self.last_request_time = time.time()
+        except self.transport.errors as e:
+            with self._lock:
+                self._stats['failures'] += 1
+            print(f"{method} 요청 실패: {e}")
+            return None
 
     def get(self, url: str, params: Optional[Dict[str, Any]] = None,
-            timeout: int = 30) -> Optional[requests.Response]:
+            timeout: int = 30, rate_limited: bool = True) -> Optional[Any]:
         """
         GET 요청을 수행합니다.
 
@@ -64,30 +82,16 @@ class RequestHandler:
             url: 요청할 URL
             params: 쿼리 파라미터
             timeout: 타임아웃 시간 (초)
+            rate_limited: 요청 간격 제한 적용 여부 (이미지 CDN 요청은 False)
 
         Returns:
             성공 시 Response 객체, 실패 시 None
         """
-        try:
-            self._wait_for_rate_limit()
-
-            response = self.session.get(
-                url,
-                params=params,
-                timeout=timeout,
-                allow_redirects=True
-            )
-
-            response.raise_for_status()
-            return response
-
-        except requests.RequestException as e:
-            print(f"GET 요청 실패: {e}")
-            return None
+        return self._request('GET', url, timeout, rate_limited, params=params)
 
     def post(self, url: str, data: Optional[Dict[str, Any]] = None,
              json_data: Optional[Dict[str, Any]] = None,
-             timeout: int = 30) -> Optional[requests.Response]:
+             timeout: int = 30) -> Optional[Any]:
         """
         POST 요청을 수행합니다.
 
@@ -100,27 +104,23 @@ class RequestHandler:
         Returns:
             성공 시 Response 객체, 실패 시 None
         """
-        try:
-            self._wait_for_rate_limit()
-
-            response = self.session.post(
-                url,
-                data=data,
-                json=json_data,
-                timeout=timeout,
-                allow_redirects=True
-            )
-
-            response.raise_for_status()
-            return response
-
-        except requests.RequestException as e:
-            print(f"POST 요청 실패: {e}")
-            return None
+        return self._request('POST', url, timeout, True, data=data, json=json_data)
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 수, 평균 지연 시간, 수신 바이트(압축 상태 기준), HTTP 버전별 요청 수를 반환합니다"""
+        count = self._stats['requests']
+        return {
+            'transport': self.transport.name,
+            'requests': count,
+            'failures': self._stats['failures'],
+            'avg_latency_ms': round(self._stats['elapsed'] / count * 1000, 1) if count else 0.0,
+            'wire_bytes': self._stats['wire_bytes'],
+            'versions': dict(self._stats['versions']),
+        }
 
     def close(self):
         """세션을 종료합니다."""
-        self.session.close()
+        self.transport.close()
 
     def __enter__(self):
         return self
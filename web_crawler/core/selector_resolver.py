@@ -0,0 +1,174 @@
+"""
+Selenium 셀렉터 해석 모듈
+여러 후보 셀렉터(CSS/XPath)를 한 번의 페이지 내 스크립트 호출로 동시에 확인하고,
+성공한 셀렉터를 페이지 유형별로 기억하여 다음 페이지에서 먼저 시도
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 상수 import
+from config.constants import SELECTOR_CACHE_PATH, SELECTOR_PROBE_TIMEOUT, SELECTOR_POLL_INTERVAL
+
+# 후보 셀렉터를 순서대로 모두 확인하여 [첫 일치 index, 요소, 후보별 일치 여부]를 반환
+PROBE_SCRIPT = """
+const candidates = arguments[0];
+const clickable = arguments[1];
+const hits = [];
+let index = -1;
+let found = null;
+
+for (let i = 0; i < candidates.length; i++) {
+    const selector = candidates[i];
+    let element = null;
+    try {
+        if (selector.startsWith('//') || selector.startsWith('(')) {
+            element = document.evaluate(
+                selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        } else {
+            element = document.querySelector(selector);
+        }
+    } catch (e) {
+        element = null;
+    }
+
+    let ok = !!element;
+    if (ok && clickable) {
+        ok = element.getClientRects().length > 0 && !element.disabled;
+    }
+    hits.push(ok);
+    if (ok && index < 0) {
+        index = i;
+        found = element;
+    }
+}
+return [index, found, hits];
+"""
+
+
+class SelectorResolver:
+    """후보 셀렉터 중 현재 페이지에서 동작하는 것을 찾고 우선순위를 학습하는 클래스"""
+
+    def __init__(self, driver, cache_path: str = SELECTOR_CACHE_PATH, profiler=None):
+        """
+        Args:
+            driver: Selenium WebDriver
+            cache_path: 학습한 우선순위를 저장할 JSON 파일 경로
+            profiler: 탐색 스크립트 실행 시간을 기록할 core.profiling.Profiler (None이면 기록하지 않음)
+        """
+        self.driver = driver
+        self.profiler = profiler
+        self.cache_path = Path(cache_path)
+        self._cache: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """저장된 우선순위를 읽어옵니다 (없거나 깨졌으면 빈 캐시)"""
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """우선순위를 파일에 저장합니다 (임시 파일 작성 후 교체)"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"⚠️  셀렉터 캐시 저장 실패: {e}")
+
+    def _entry(self, page_type: str, role: str) -> Dict[str, Any]:
+        """페이지 유형/역할별 캐시 항목을 가져옵니다"""
+        page = self._cache.setdefault(page_type, {})
+        return page.setdefault(role, {'order': [], 'stats': {}})
+
+    def ordered(self, page_type: str, role: str, candidates: List[str]) -> List[str]:
+        """
+        학습된 순서로 후보를 정렬합니다.
+        학습된 순서에 없는 후보(새로 추가된 셀렉터)는 기본 순서대로 뒤에 붙습니다.
+        """
+        learned = [s for s in self._entry(page_type, role)['order'] if s in candidates]
+        return learned + [s for s in candidates if s not in learned]
+
+    def _record(self, page_type: str, role: str, order: List[str], index: int, hits: List[bool]):
+        """확인 결과를 반영하여 우선순위를 갱신합니다"""
+        entry = self._entry(page_type, role)
+        for selector, hit in zip(order, hits):
+            stats = entry['stats'].setdefault(selector, {'hits': 0, 'misses': 0})
+            stats['hits' if hit else 'misses'] += 1
+        self._dirty = True
+
+        if index < 0:
+            # 아무것도 없으면 해당 영역이 없는 페이지일 수 있으므로 순서는 유지
+            entry['order'] = order
+            return
+
+        # 성공한 셀렉터를 맨 앞으로, 실패한 셀렉터는 성공한 셀렉터 뒤로
+        winner = order[index]
+        new_order = [winner] + [s for s, hit in zip(order, hits) if hit and s != winner] \
+            + [s for s, hit in zip(order, hits) if not hit]
+        if new_order != entry['order']:
+            if entry['order'] and entry['order'][0] != winner:
+                print(f"🔁 셀렉터 우선순위 변경 ({page_type}/{role}): {winner}")
+            entry['order'] = new_order
+            self._save()
+
+    def find(self, page_type: str, role: str, candidates: List[str], clickable: bool = False,
+             timeout: float = SELECTOR_PROBE_TIMEOUT) -> Optional[Any]:
+        """
+        후보 셀렉터 중 현재 페이지에서 일치하는 요소를 찾습니다.
+        모든 후보를 한 번의 execute_script로 확인하므로 대기 시간은 후보 수와 무관하게 최대 timeout입니다.
+
+        Args:
+            page_type: 페이지 유형 (예: 'product_detail')
+            role: 요소 역할 (예: 'info_button')
+            candidates: 기본 우선순위의 CSS/XPath 셀렉터 목록 ('//'로 시작하면 XPath)
+            clickable: 화면에 표시되고 비활성화되지 않은 요소만 허용할지 여부
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            일치한 WebElement (없으면 None)
+        """
+        order = self.ordered(page_type, role, candidates)
+        deadline = time.monotonic() + timeout
+        index, element, hits = -1, None, [False] * len(order)
+
+        while True:
+            try:
+                if self.profiler is None:
+                    index, element, hits = self.driver.execute_script(PROBE_SCRIPT, order, clickable)
+                else:
+                    index, element, hits = self.profiler.execute_script(
+                        self.driver, 'selector_probe', PROBE_SCRIPT, order, clickable
+                    )
+            except Exception as e:
+                print(f"셀렉터 확인 실패 ({role}): {e}")
+            if index >= 0 or time.monotonic() >= deadline:
+                break
+            time.sleep(SELECTOR_POLL_INTERVAL)
+
+        self._record(page_type, role, order, index, hits)
+        return element if index >= 0 else None
+
+    def flush(self):
+        """저장되지 않은 성공/실패 횟수를 파일에 기록합니다"""
+        if self._dirty:
+            self._save()
+
+    def stats(self) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        """페이지 유형/역할별 셀렉터 (성공, 실패) 횟수를 반환합니다"""
+        return {
+            f"{page_type}/{role}": {s: (v['hits'], v['misses']) for s, v in entry['stats'].items()}
+            for page_type, roles in self._cache.items()
+            for role, entry in roles.items()
+        }
@@ -4,35 +4,115 @@ Selenium을 사용한 상품 상세 정보 추출 모듈
 """
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
 import time
 import json
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, List, Dict, Optional
 
 # 상수 import
-from config.constants import USER_AGENT_CHROME, CHROME_OPTIONS_COMMON, SELENIUM_WINDOW_SIZE
+from config.constants import (
+    USER_AGENT_CHROME, CHROME_OPTIONS_COMMON, SELENIUM_WINDOW_SIZE, INGREDIENTS_NOTICE_KEY,
+    SELENIUM_MAX_JS_DEPTH, SELENIUM_TABS_DEFAULT, SELENIUM_TAB_MEMORY_BUDGET_MB, SELENIUM_PAGE_SETTLE_SECONDS,
+    SELENIUM_PAGE_LOAD_TIMEOUT, SELENIUM_NAVIGATION_INTERVAL, BROWSER_MAX_RSS_MB, OUTPUT_DIR, SELECTOR_CACHE_PATH
+)
+from .browser_service import process_tree_rss_mb
+from .parser import (
+    DETAIL_PAGE_TYPE, INFO_BUTTON_SELECTORS, INFO_TABLE_SELECTORS, REVIEW_TAB_SELECTORS, REVIEW_CONTAINER_SELECTORS,
+    REVIEW_ITEM_TAG, SNAPSHOT_ROLE_ATTRIBUTE, build_detail_info
+)
+from .selector_resolver import SelectorResolver
+from models.data_schema import goods_no_from_url
+
+# 렌더링된 DOM을 섀도 루트까지 HTML로 직렬화 (섀도 루트는 선언적 <template shadowrootmode>로 기록)
+# arguments[0]에 역할 표시(data-oy-role)를 남겨 오프라인 재추출이 같은 요소를 찾을 수 있게 함
+SNAPSHOT_SCRIPT = """
+const VOID_TAGS = new Set(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                           'source', 'track', 'wbr']);
+const RAW_TEXT_TAGS = new Set(['style', 'textarea', 'title']);
+const marked = arguments[0];
+if (marked) marked.setAttribute(arguments[1], arguments[2]);
+
+function escapeText(text) {
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+function escapeAttribute(value) {
+    return value.replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/</g, '&lt;');
+}
+function serializeChildren(node, out) {
+    for (const child of node.childNodes) serialize(child, out);
+}
+function serialize(node, out) {
+    if (node.nodeType === Node.TEXT_NODE) {
+        const parent = node.parentNode;
+        const raw = parent && parent.localName && RAW_TEXT_TAGS.has(parent.localName);
+        out.push(raw ? node.data : escapeText(node.data));
+        return;
+    }
+    if (node.nodeType !== Node.ELEMENT_NODE) return;
+    const tag = node.localName;
+    if (tag === 'script' || tag === 'noscript') return;
+
+    out.push('<' + tag);
+    for (const attr of node.attributes) out.push(' ' + attr.name + '="' + escapeAttribute(attr.value) + '"');
+    out.push('>');
+    if (VOID_TAGS.has(tag)) return;
+    if (node.shadowRoot) {
+        out.push('<template shadowrootmode="' + node.shadowRoot.mode + '">');
+        serializeChildren(node.shadowRoot, out);
+        out.push('</template>');
+    }
+    serializeChildren(node, out);
+    out.push('</' + tag + '>');
+}
+
+const out = ['<!DOCTYPE html>'];
+serialize(document.documentElement, out);
+return out.join('');
+"""
 
 class SeleniumProductExtractor:
     """Selenium을 사용한 상품 상세 정보 추출 클래스"""
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, debugger_address: Optional[str] = None,
+                 snapshot_archive=None, profiler=None, output_dir: str = OUTPUT_DIR, browser_service=None):
         """
         Args:
             headless: 브라우저를 백그라운드에서 실행할지 여부
+            debugger_address: 상주 브라우저 서비스 주소 ("host:port", 지정 시 새 Chrome을 띄우지 않고 연결)
+            snapshot_archive: 렌더링된 페이지를 보관할 SnapshotArchive (None이면 보관하지 않음)
+            profiler: 주입 스크립트 실행 시간을 기록할 core.profiling.Profiler (None이면 기록하지 않음)
+            output_dir: 출력 디렉토리 (학습한 셀렉터 우선순위를 이 아래에 저장)
+            browser_service: 연결할 상주 브라우저 서비스 (core.browser_service.BrowserService)
+                             지정하면 시작 전에 ensure()로 점검하고, 실행 중 메모리 측정/재시작에도 사용
         """
         self.headless = headless
+        self.browser_service = browser_service
+        if browser_service is not None and debugger_address is None:
+            debugger_address = browser_service.ensure()
+        self.debugger_address = debugger_address
+        self.snapshot_archive = snapshot_archive
+        self.profiler = profiler
+        self._snapshot: Optional[Dict[str, Dict[str, Any]]] = None
         self.driver = None
+        self.selector_resolver = None
         self._setup_driver()
+        cache_path = Path(output_dir) / Path(SELECTOR_CACHE_PATH).relative_to(OUTPUT_DIR)
+        self.selector_resolver = SelectorResolver(self.driver, cache_path=str(cache_path), profiler=profiler)
 
     def _setup_driver(self):
         """Chrome WebDriver 설정"""
         try:
             chrome_options = Options()
+            if self.debugger_address:
+                # 이미 실행 중인 원격 디버깅 Chrome에 연결 (실행 옵션은 BrowserService가 적용)
+                chrome_options.add_experimental_option('debuggerAddress', self.debugger_address)
+                self.driver = webdriver.Chrome(options=chrome_options)
+                print(f"✅ 브라우저 서비스 연결 완료: {self.debugger_address}")
+                return
+
             if self.headless:
                 chrome_options.add_argument('--headless')  # 백그라운드 실행
 
@@ -74,8 +154,25 @@ class SeleniumProductExtractor:
 
         try:
             self.driver.get(product_url)
-            time.sleep(2)  # 페이지 로드 대기
+            time.sleep(SELENIUM_PAGE_SETTLE_SECONDS)  # 페이지 로드 대기
+
+        except Exception as e:
+            print(f"❌ 상품 정보 추출 실패 ({product_url}): {e}")
+            details['extraction_error'] = str(e)
+            return details
+
+        return self._extract_loaded_page(product_url, max_reviews)
+
+    def _extract_loaded_page(self, product_url: str, max_reviews: int) -> Dict:
+        """현재 탭에 로드된 상품 상세 페이지에서 성분과 리뷰 정보를 추출합니다"""
+        details: Dict[str, Any] = {
+            'detail_info': {},
+            'reviews': []
+        }
+        if self.snapshot_archive is not None:
+            self._snapshot = {'documents': {}, 'payload': {'max_reviews': max_reviews}}
 
+        try:
             # # 성분 정보 추출
             details['detail_info'] = self._extract_detail_info()
 
@@ -86,8 +183,38 @@ class SeleniumProductExtractor:
             print(f"❌ 상품 정보 추출 실패 ({product_url}): {e}")
             details['extraction_error'] = str(e)
 
+        self._save_snapshot(product_url)
         return details
 
+    def _execute_script(self, name: str, script: str, *args) -> Any:
+        """주입 스크립트를 실행합니다 (프로파일러가 있으면 스크립트 이름별로 실행 시간 기록)"""
+        if self.profiler is None:
+            return self.driver.execute_script(script, *args)
+        return self.profiler.execute_script(self.driver, name, script, *args)
+
+    def _capture_snapshot(self, stage: str, element, role: str, payload_key: str, payload: Any):
+        """스냅샷 보관 모드이면 현재 DOM과 실시간 추출 결과를 기록합니다"""
+        if self._snapshot is None:
+            return
+        try:
+            self._snapshot['documents'][stage] = self._execute_script(
+                'snapshot', SNAPSHOT_SCRIPT, element, SNAPSHOT_ROLE_ATTRIBUTE, role
+            )
+            self._snapshot['payload'][payload_key] = payload
+        except Exception as e:
+            print(f"⚠️  페이지 스냅샷 실패 ({stage}): {e}")
+
+    def _save_snapshot(self, product_url: str):
+        """기록한 스냅샷을 보관소에 저장합니다"""
+        snapshot, self._snapshot = self._snapshot, None
+        goods_no = goods_no_from_url(product_url)
+        if not snapshot or not snapshot['documents'] or not goods_no:
+            return
+        try:
+            self.snapshot_archive.put(goods_no, product_url, snapshot['documents'], snapshot['payload'])
+        except Exception as e:
+            print(f"⚠️  페이지 스냅샷 저장 실패: {e}")
+
     def _extract_detail_info(self) -> Dict[str, Any]:
         """
         상품정보 제공고시 테이블에서 상세 정보를 추출
@@ -97,105 +224,57 @@ class SeleniumProductExtractor:
         """
         try:
             # 1. "상품정보 제공고시" 버튼 찾기 및 클릭
-            button_selectors = [
-                'button.Accordion_accordion-btn__IYjKm',  # CSS 클래스 기반
-                '//*[@id="tab-panels"]/section/ul/li[1]/button'  # XPath 기반
-            ]
-
-            button_clicked = False
-            for selector in button_selectors:
-                try:
-                    if selector.startswith('//'):
-                        info_button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                    else:
-                        info_button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-
-                    info_button.click()
-                    time.sleep(2)  # 동적 콘텐츠 로딩 대기
-                    button_clicked = True
-                    print("✅ 상품정보 제공고시 버튼 클릭 성공")
-                    break
-
-                except Exception as e:
-                    print(f"버튼 클릭 시도 실패 ({selector}): {e}")
-                    continue
-
-            if not button_clicked:
+            info_button = self.selector_resolver.find(
+                DETAIL_PAGE_TYPE, 'info_button', INFO_BUTTON_SELECTORS, clickable=True
+            )
+            if info_button is None:
                 print("⚠️  상품정보 제공고시 버튼을 찾을 수 없음")
                 return {}
 
+            try:
+                info_button.click()
+                time.sleep(2)  # 동적 콘텐츠 로딩 대기
+                print("✅ 상품정보 제공고시 버튼 클릭 성공")
+            except Exception as e:
+                print(f"⚠️  상품정보 제공고시 버튼 클릭 실패: {e}")
+                return {}
+
             # 2. 동적으로 로드된 테이블 데이터 추출
             try:
                 # 테이블 컨테이너 찾기
-                table_container_selectors = [
-                    '.Accordion_content__aIya4',
-                    '//*[@id="tab-panels"]/section/ul/li[1]/div'
-                ]
-
-                table_container = None
-                for selector in table_container_selectors:
-                    try:
-                        if selector.startswith('//'):
-                            table_container = WebDriverWait(self.driver, 5).until(
-                                EC.presence_of_element_located((By.XPATH, selector))
-                            )
-                        else:
-                            table_container = WebDriverWait(self.driver, 5).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                            )
-                        break
-                    except:
-                        continue
-
-                if not table_container:
+                table_container = self.selector_resolver.find(
+                    DETAIL_PAGE_TYPE, 'info_table', INFO_TABLE_SELECTORS
+                )
+                if table_container is None:
                     print("⚠️  테이블 컨테이너를 찾을 수 없음")
                     return {}
 
-                # 테이블에서 모든 th/td 쌍 추출 (JavaScript 사용)
-                table_data = self.driver.execute_script("""
-                    const container = arguments[0];
-                    const rows = container.querySelectorAll('tr');
-                    const data = {};
+                # 테이블에서 모든 th/td 텍스트 쌍 추출 (JavaScript 사용, 정리는 스냅샷 재추출과 같은 build_detail_info에서)
+                table_rows = self._execute_script('info_table', """
+                    const rows = arguments[0].querySelectorAll('tr');
+                    const pairs = [];
 
                     rows.forEach(row => {
                         const th = row.querySelector('th');
                         const td = row.querySelector('td');
-
                         if (th && td) {
-                            const key = th.textContent.trim();
-                            let value = td.textContent.trim();
-
-                            // 줄바꿈 문자를 공백으로 변환
-                            value = value.replace(/\\n/g, ' ').replace(/\\s+/g, ' ');
-
-                            data[key] = value;
+                            pairs.push([th.textContent, td.textContent]);
                         }
                     });
 
-                    return data;
+                    return pairs;
                 """, table_container)
+                self._capture_snapshot('info', table_container, 'info_table', 'table_rows', table_rows)
 
-                print(f"✅ 상세 정보 테이블 추출 완료: {len(table_data)}개 항목")
-
-                # 3. 화장품법에 따른 모든 성분 정보 추출 (사용자가 요청한 핵심 정보)
-                ingredients_key = '화장품법에 따라 기재해야 하는 모든 성분'
-                if ingredients_key in table_data:
-                    ingredients_text = table_data[ingredients_key]
-                    # ,로 구분된 성분들을 분리하고 정리
-                    ingredients_list = [ing.strip() for ing in ingredients_text.split(',') if ing.strip()]
-                    print(f"✅ 성분 정보 추출: {len(ingredients_list)}개 성분")
+                detail_info = build_detail_info(table_rows)
+                print(f"✅ 상세 정보 테이블 추출 완료: {len(detail_info['full_info'])}개 항목")
 
-                    return {
-                        'full_info': table_data,  # 전체 상세 정보
-                        'ingredients': ingredients_list  # 주요 성분 정보만 별도 추출
-                    }
+                # 3. 화장품법에 따른 모든 성분 정보 (사용자가 요청한 핵심 정보)
+                if INGREDIENTS_NOTICE_KEY in detail_info['full_info']:
+                    print(f"✅ 성분 정보 추출: {len(detail_info['ingredients'])}개 성분")
                 else:
                     print("⚠️  성분 정보 키를 찾을 수 없음")
-                    return {'full_info': table_data, 'ingredients': []}
+                return detail_info
 
             except Exception as e:
                 print(f"테이블 데이터 추출 실패: {e}")
@@ -207,52 +286,38 @@ class SeleniumProductExtractor:
 
     def _extract_reviews(self, max_reviews: int = 10) -> List[str]:
         # 1️⃣ 리뷰 탭 클릭
-        review_selectors_priority = [
-            'button[class*="GoodsDetailTabs_tab-item"]:nth-child(2)',
-            '//*[@id="main"]/div[2]/div/div[3]/div[2]/div[1]/div/div/button[1]',
-        ]
-        clicked = False
-        for selector in review_selectors_priority:
-            try:
-                if selector.startswith('//'):
-                    review_tab = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                else:
-                    review_tab = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                review_tab.click()
-                time.sleep(2)
-                clicked = True
-                break
-            except:
-                continue
-        if not clicked:
+        review_tab = self.selector_resolver.find(
+            DETAIL_PAGE_TYPE, 'review_tab', REVIEW_TAB_SELECTORS, clickable=True
+        )
+        if review_tab is None:
             return []
-
-        # 2️⃣ 리뷰 컨테이너
         try:
-            container = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'oy-review-review-in-product'))
-            )
-        except:
+            review_tab.click()
+            time.sleep(2)
+        except Exception:
             return []
 
+        # 2️⃣ 리뷰 컨테이너
+        container = self.selector_resolver.find(
+            DETAIL_PAGE_TYPE, 'review_container', REVIEW_CONTAINER_SELECTORS
+        )
+        if container is None:
+            return []
 
         # 3️⃣ 전체 윈도우 스크롤로 리뷰 로드
-        prev_height = self.driver.execute_script("return document.body.scrollHeight")
+        prev_height = self._execute_script('scroll_height', "return document.body.scrollHeight")
         for _ in range(20):  # 최대 10번 반복
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self._execute_script('scroll', "window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(1)  # 로딩 대기
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            new_height = self._execute_script('scroll_height', "return document.body.scrollHeight")
             if new_height == prev_height:
                 break  # 더 이상 새 리뷰 없음
             prev_height = new_height
 
         # 4️⃣ Shadow DOM 포함 모든 리뷰 수집 + p 태그 추출
         script = """
-        const MAX_DEPTH = 300;
+        const MAX_DEPTH = arguments[2];
+        const ITEM_TAG = arguments[3];
 
         // BFS로 oy-review-review-item 수집
         function bfsCollectItems(root) {
@@ -262,7 +327,7 @@ class SeleniumProductExtractor:
                 const {node, depth} = queue.shift();
                 if (!node || depth > MAX_DEPTH) continue;
 
-                if (node.tagName && node.tagName.toLowerCase() === 'oy-review-review-item') {
+                if (node.tagName && node.tagName.toLowerCase() === ITEM_TAG) {
                     items.push(node);
                     continue;
                 }
@@ -305,26 +370,52 @@ class SeleniumProductExtractor:
         return resultTexts;
         """
 
-        reviews = self.driver.execute_script(script, container, max_reviews)
+        reviews = self._execute_script('reviews', script, container, max_reviews, SELENIUM_MAX_JS_DEPTH, REVIEW_ITEM_TAG)
+        self._capture_snapshot('reviews', container, 'review_container', 'reviews', reviews)
 
         print(f"리뷰 데이터: {reviews}")
         return reviews
 
-    def batch_extract_details(self, products: List[Dict], max_reviews: int = 5) -> List[Dict]:
+    def batch_extract_details(self, products: List[Dict], max_reviews: int = 5,
+                              tabs: int = SELENIUM_TABS_DEFAULT,
+                              memory_budget_mb: float = SELENIUM_TAB_MEMORY_BUDGET_MB,
+                              on_result: Optional[Callable[[Dict], None]] = None,
+                              deadline: Optional[float] = None) -> List[Dict]:
         """
         여러 상품에 대해 상세 정보 batch 추출
 
         Args:
             products: 상품 기본 정보 리스트
             max_reviews: 상품당 최대 리뷰 수
+            tabs: 한 브라우저에서 동시에 사용할 탭 수 (2 이상이면 멀티 탭 모드)
+            memory_budget_mb: 멀티 탭 모드의 브라우저 메모리 상한 (MB)
+            on_result: 상품 하나의 추출이 끝날 때마다 호출할 함수 (결과를 바로 저장할 때)
+            deadline: time.monotonic() 기준 마감 시각 (이후에는 새 상품을 시작하지 않음)
 
         Returns:
-            상세 정보가 추가된 상품 리스트
+            상세 정보가 추가된 상품 리스트 (마감으로 처리하지 못한 상품은 기본 정보 그대로)
         """
+        if tabs > 1 and len(products) > 1:
+            return self._batch_extract_multi_tab(products, max_reviews, tabs, memory_budget_mb, on_result, deadline)
+
         enriched_products = []
         total_products = len(products)
 
         for i, product in enumerate(products, 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"⏱️  시간 예산 소진: 남은 {total_products - i + 1}개 상품은 다음 실행으로 넘깁니다.")
+                enriched_products.extend(products[i - 1:])
+                break
+
+            # 상품 사이마다 브라우저 메모리 확인 (긴 실행 중 누적된 메모리는 재시작으로 회수)
+            if i > 1:
+                try:
+                    self._recycle_browser_if_needed(self._browser_rss_mb())
+                except Exception as e:
+                    print(f"   ❌ 브라우저 재시작 실패: {e}")
+                    enriched_products.extend(products[i - 1:])
+                    break
+
             print(f"📦 상품 {i}/{total_products} 상세 정보 추출 중...")
 
             try:
@@ -335,6 +426,8 @@ class SeleniumProductExtractor:
                 enriched_product = product.copy()
                 enriched_product.update(details)
                 enriched_products.append(enriched_product)
+                if on_result:
+                    on_result(enriched_product)
 
                 print(f"   ✅ 상세 정보: {len(details.get('detail_info', []))}개, 리뷰: {len(details.get('reviews', []))}개")
                 print(f"   ✅ 상세 정보 키: {list(details.keys())}")
@@ -348,11 +441,197 @@ class SeleniumProductExtractor:
 
         return enriched_products
 
+    def _browser_rss_mb(self) -> float:
+        """현재 브라우저 프로세스 트리의 메모리(MB)를 측정합니다 (측정할 수 없으면 0)"""
+        if self.browser_service is not None:
+            return self.browser_service.rss_mb()
+        if self.debugger_address:
+            # 서비스 없이 주소만 받은 브라우저는 pid를 알 수 없어 측정/재시작하지 않음
+            pid = None
+        else:
+            service = getattr(self.driver, 'service', None)
+            process = getattr(service, 'process', None)
+            pid = process.pid if process else None
+        return process_tree_rss_mb(pid) if pid else 0.0
+
+    def _recycle_browser_if_needed(self, rss_mb: float) -> bool:
+        """
+        브라우저 메모리가 BROWSER_MAX_RSS_MB를 넘으면 브라우저를 재시작합니다.
+        BrowserService.ensure()는 실행 시작 때만 메모리를 확인하므로 실행 도중에는 여기서 확인합니다.
+
+        Returns:
+            재시작했으면 True
+        """
+        if rss_mb <= BROWSER_MAX_RSS_MB:
+            return False
+
+        print(f"   ♻️  브라우저 메모리 {rss_mb:.0f}MB > {BROWSER_MAX_RSS_MB}MB, 브라우저를 재시작합니다.")
+        try:
+            # 연결 모드에서는 세션만 끝나므로 브라우저 서비스를 따로 재시작
+            self.driver.quit()
+        except Exception:
+            pass
+        if self.browser_service is not None:
+            self.debugger_address = self.browser_service.restart()
+        self._setup_driver()
+        self.selector_resolver.driver = self.driver
+        return True
+
+    def _batch_extract_multi_tab(self, products: List[Dict], max_reviews: int,
+                                 tabs: int, memory_budget_mb: float,
+                                 on_result: Optional[Callable[[Dict], None]] = None,
+                                 deadline: Optional[float] = None) -> List[Dict]:
+        """
+        한 브라우저의 여러 탭을 번갈아 사용하여 상세 정보를 추출합니다.
+        탭마다 JavaScript로 이동을 시작해두고(응답을 기다리지 않음), 로드가 끝난 탭부터 추출하므로
+        한 탭에서 추출하는 동안 다른 탭의 네트워크 로딩이 진행됩니다.
+        브라우저 메모리가 memory_budget_mb를 넘으면 탭 수를 줄이고, 여유가 생기면 다시 늘립니다.
+        탭 하나만 남은 상태에서도 BROWSER_MAX_RSS_MB를 넘으면 진행 중인 탭이 없을 때 브라우저를 재시작합니다.
+        deadline이 지나면 새 상품은 시작하지 않고 로딩 중인 탭만 마무리합니다.
+        """
+        total_products = len(products)
+        results: List[Optional[Dict]] = [None] * total_products
+        pending = list(range(total_products))
+        pending.reverse()
+
+        main_handle = self.driver.current_window_handle
+        handles = [main_handle]
+        # 탭별 진행 상태: handle → (상품 index, 이동 시작 시각, 로드 완료 시각)
+        slots: Dict[str, Optional[tuple]] = {main_handle: None}
+        max_tabs = tabs
+        last_navigation = 0.0
+        last_memory_check = 0.0
+        done = 0
+
+        print(f"🗂️  멀티 탭 모드: 최대 {tabs}개 탭, 메모리 상한 {memory_budget_mb:.0f}MB")
+
+        try:
+            while pending or any(slots.values()):
+                if pending and deadline is not None and time.monotonic() >= deadline:
+                    print(f"⏱️  시간 예산 소진: 남은 {len(pending)}개 상품은 다음 실행으로 넘깁니다.")
+                    pending.clear()
+
+                # 메모리 확인 후 사용할 탭 수 조정 (1초에 한 번)
+                now = time.monotonic()
+                if now - last_memory_check >= 1.0:
+                    last_memory_check = now
+                    rss_mb = self._browser_rss_mb()
+                    if rss_mb > memory_budget_mb and max_tabs > 1:
+                        max_tabs -= 1
+                        print(f"   ♻️  브라우저 메모리 {rss_mb:.0f}MB, 탭 수를 {max_tabs}개로 줄입니다.")
+                    elif 0 < rss_mb < memory_budget_mb * 0.8 and max_tabs < tabs:
+                        max_tabs += 1
+                    elif pending and len(handles) == 1 and not any(slots.values()) \
+                            and self._recycle_browser_if_needed(rss_mb):
+                        main_handle = self.driver.current_window_handle
+                        handles = [main_handle]
+                        slots = {main_handle: None}
+
+                # 남은 상품이 있으면 탭을 추가로 열기
+                if pending and len(handles) < max_tabs and all(slots.values()):
+                    self.driver.switch_to.new_window('tab')
+                    handle = self.driver.current_window_handle
+                    handles.append(handle)
+                    slots[handle] = None
+
+                # 한도를 넘는 유휴 탭 닫기 (메인 탭은 유지)
+                for handle in list(handles[1:]):
+                    if len(handles) <= max_tabs:
+                        break
+                    if slots[handle] is None:
+                        self.driver.switch_to.window(handle)
+                        self.driver.close()
+                        handles.remove(handle)
+                        del slots[handle]
+
+                progressed = False
+                for handle in list(handles):
+                    self.driver.switch_to.window(handle)
+                    slot = slots[handle]
+
+                    if slot is None:
+                        if not pending:
+                            continue
+                        if time.monotonic() - last_navigation < SELENIUM_NAVIGATION_INTERVAL:
+                            continue
+                        index = pending.pop()
+                        # 이전 문서에 표시를 남기고 이동 (새 문서에는 표시가 없으므로 리다이렉트되어도 로드 완료 판별 가능)
+                        self._execute_script(
+                            'navigate', "window.__oyNavigating = true; window.location.href = arguments[0];",
+                            products[index]['url']
+                        )
+                        last_navigation = time.monotonic()
+                        slots[handle] = (index, last_navigation, None)
+                        progressed = True
+                        continue
+
+                    index, started, loaded = slot
+                    url = products[index]['url']
+                    now = time.monotonic()
+                    if loaded is None:
+                        try:
+                            ready = self._execute_script(
+                                'ready_state', "return document.readyState === 'complete' && !window.__oyNavigating;"
+                            )
+                        except Exception:
+                            ready = False
+                        if ready:
+                            slots[handle] = (index, started, now)
+                        elif now - started > SELENIUM_PAGE_LOAD_TIMEOUT:
+                            print(f"   ❌ 페이지 로드 시간 초과: {url}")
+                            results[index] = dict(products[index], extraction_error='page load timeout')
+                            if on_result:
+                                on_result(results[index])
+                            slots[handle] = None
+                            done += 1
+                        continue
+
+                    if now - loaded < SELENIUM_PAGE_SETTLE_SECONDS:
+                        continue
+
+                    # 로드가 끝난 탭에서 추출 (그동안 다른 탭은 계속 로딩)
+                    done += 1
+                    print(f"📦 상품 {done}/{total_products} 상세 정보 추출 중... (탭 {handles.index(handle) + 1}/{len(handles)})")
+                    details = self._extract_loaded_page(url, max_reviews)
+                    enriched_product = products[index].copy()
+                    enriched_product.update(details)
+                    results[index] = enriched_product
+                    if on_result:
+                        on_result(enriched_product)
+                    print(f"   ✅ 상세 정보: {len(details.get('detail_info', []))}개, 리뷰: {len(details.get('reviews', []))}개")
+                    slots[handle] = None
+                    progressed = True
+
+                if not progressed:
+                    time.sleep(0.1)
+
+        except Exception as e:
+            print(f"   ❌ 멀티 탭 추출 중단: {e}")
+
+        finally:
+            # 추가로 연 탭 정리
+            for handle in handles[1:]:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception:
+                    pass
+            try:
+                self.driver.switch_to.window(main_handle)
+            except Exception:
+                pass
+
+        # 실패하거나 처리하지 못한 상품은 기본 정보만 넣기
+        return [result if result is not None else product for result, product in zip(results, products)]
+
     def close(self):
         """브라우저 종료"""
+        if self.selector_resolver:
+            self.selector_resolver.flush()
         if self.driver:
+            # 연결 모드에서는 ChromeDriver 세션만 끝나고 브라우저는 다음 실행을 위해 유지됨
             self.driver.quit()
-            print("🔚 브라우저 종료 완료")
+            print("🔌 브라우저 서비스 연결 해제" if self.debugger_address else "🔚 브라우저 종료 완료")
 
     def __enter__(self):
         return self
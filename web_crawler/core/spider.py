@@ -2,43 +2,60 @@
 웹 페이지 탐색 및 데이터 추출 모듈
 """
 
-import csv
-import sqlite3
-import os
-import json
-import requests
+import math
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+from .parser import RankingPageParser, parse_ranking_items, parse_ranking_page
 from .request_handler import RequestHandler
+from models.data_schema import goods_no_from_url
+from storage import exporter
+from storage.image_store import ImageStore
 # 상수 import
-from config.constants import OLIVEYOUNG_BASE_URL, OLIVEYOUNG_SKINCARE_URL, OLIVEYOUNG_PARAMS_DEFAULT, IMAGES_DIR
+from config.constants import (
+    OLIVEYOUNG_BASE_URL, OLIVEYOUNG_SKINCARE_URL, OLIVEYOUNG_PARAMS_DEFAULT, OUTPUT_DIR, IMAGES_DIR,
+    CSV_FILENAME, DB_FILENAME, REVIEW_CODEC_DEFAULT, HTTP_TRANSPORT_DEFAULT, HTTP_CONCURRENCY_DEFAULT,
+    RANKING_PAGE_SIZE_CANDIDATES
+)
+
+# max_pages는 예전 기본 페이지 크기(rowsPerPage=8) 기준의 페이지 수 → 상품 수 상한으로 환산
+LEGACY_ROWS_PER_PAGE = int(OLIVEYOUNG_PARAMS_DEFAULT['rowsPerPage'])
+
 
 class WebSpider:
     """웹 크롤링을 위한 스파이더 클래스"""
 
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, transport=HTTP_TRANSPORT_DEFAULT, output_dir=OUTPUT_DIR):
         self.base_url = base_url or OLIVEYOUNG_BASE_URL
-        self.request_handler = RequestHandler()
+        self.output_dir = output_dir
+        # 랭킹 페이지와 이미지 다운로드가 같은 커넥션 풀(keep-alive)을 공유
+        self.request_handler = RequestHandler(transport=transport)
 
-        # 이미지 저장 디렉토리 생성
-        self.images_dir = Path(IMAGES_DIR)
+        # 이미지 저장 디렉토리 생성 (출력 디렉토리 기준)
+        self.images_dir = Path(output_dir) / Path(IMAGES_DIR).relative_to(OUTPUT_DIR)
         self.images_dir.mkdir(parents=True, exist_ok=True)
+        self.image_store = ImageStore(str(Path(output_dir) / DB_FILENAME))
 
         # 올리브영 스킨케어 랭킹 페이지 URL
         self.target_url = OLIVEYOUNG_SKINCARE_URL
         self.params = OLIVEYOUNG_PARAMS_DEFAULT.copy()
 
-    def fetch_page(self, page=1):
-        """지정된 페이지의 상품 데이터를 가져옵니다"""
+    def _page_params(self, page, rows_per_page=None):
+        """페이지 요청 파라미터를 만듭니다 (병렬 요청을 위해 self.params는 변경하지 않음)"""
+        params = self.params.copy()
+        params['pageIdx'] = str(page)
+        if rows_per_page:
+            params['rowsPerPage'] = str(rows_per_page)
+        return params
+
+    def fetch_page_content(self, page=1, rows_per_page=None):
+        """지정된 페이지의 응답 본문(bytes)을 가져옵니다 (파싱은 RankingPageParser에서)"""
         try:
-            self.params['pageIdx'] = str(page)
-            response = self.request_handler.get(self.target_url, params=self.params)
+            response = self.request_handler.get(self.target_url, params=self._page_params(page, rows_per_page))
 
             if response:
-                # BeautifulSoup으로 파싱
-                soup = BeautifulSoup(response.content, 'html.parser')
-                return soup
+                return response.content
             else:
                 print(f"페이지 {page} 요청 실패")
                 return None
@@ -46,282 +63,226 @@ class WebSpider:
             print(f"페이지 {page} 요청 실패: {e}")
             return None
 
-    def extract_products(self, soup):
-        """HTML에서 상품 정보를 추출합니다"""
+    def fetch_page(self, page=1, rows_per_page=None):
+        """지정된 페이지의 상품 데이터를 가져옵니다"""
+        content = self.fetch_page_content(page, rows_per_page)
+        # BeautifulSoup으로 파싱
+        return BeautifulSoup(content, 'html.parser') if content is not None else None
+
+    def extract_products(self, soup, rank_offset=0):
+        """
+        HTML에서 상품 정보를 추출합니다.
+
+        Args:
+            soup: 랭킹 페이지 BeautifulSoup 객체
+            rank_offset: 이전 페이지까지의 상품 수 (전체 랭킹 = rank_offset + 페이지 내 순서)
+        """
+        return self._build_products(parse_ranking_items(soup), rank_offset)
+
+    def _build_products(self, rows, rank_offset=0):
+        """
+        파싱된 상품 튜플을 상품 딕셔너리로 만들고 이미지를 내려받습니다.
+        (이미지 저장소는 메인 프로세스에서만 사용)
+
+        Args:
+            rows: parse_ranking_items가 반환한 (상품명, 브랜드, 가격, 평점, goodsNo, 이미지 URL) 목록
+            rank_offset: 이전 페이지까지의 상품 수
+        """
         products = []
-
-        try:
-            # 상품 목록 컨테이너 찾기 (올리브영 구조에 맞게 조정)
-            product_items = soup.find_all('div', class_='prd_info')
-
-            for rank, item in enumerate(product_items, 1):  # rank 1부터 시작
-                try:
-                    # 상품명 추출
-                    product_name_elem = item.find('p', class_='tx_name')
-                    product_name = product_name_elem.get_text(strip=True) if product_name_elem else "Unknown"
-
-                    # 가격 추출
-                    price_elem = item.find('span', class_='tx_cur')
-                    price = price_elem.get_text(strip=True).replace(',', '').replace('원', '') if price_elem else "0"
-
-                    # 브랜드 추출
-                    brand_elem = item.find('span', class_='tx_brand')
-                    brand = brand_elem.get_text(strip=True) if brand_elem else "Unknown"
-
-                    # 평점 추출
-                    rating_elem = item.find('span', class_='rating')
-                    rating = rating_elem.get_text(strip=True) if rating_elem else "0.0"
-
-                    # 상품 URL 추출 (goodsNo 파라미터 찾기)
-                    goods_no = self._extract_goods_no(item)
-                    if goods_no:
-                        url = f"{self.base_url}/store/goods/getGoodsDetail.do?goodsNo={goods_no}"
-                    else:
-                        url = f"{self.base_url}/store/goods/getGoodsDetail.do?goodsNo=UNKNOWN"
-
-                    # 상품 이미지 추출
-                    image_url = self._extract_image_url(item)
-                    image_path = None
-                    if image_url and goods_no:
-                        image_path = self._download_image(image_url, goods_no)
-
-                    product = {
-                        'rank': rank,  # 랭킹 정보 추가
-                        'name': product_name,
-                        'brand': brand,
-                        'price': int(price) if price.isdigit() else 0,
-                        'rating': float(rating) if rating.replace('.', '').isdigit() else 0.0,
-                        'category': '스킨케어',
-                        'url': url,  # 실제 goodsNo를 포함한 URL
-                        'image_url': image_url,  # 원본 이미지 URL
-                        'image_path': image_path  # 로컬에 저장된 이미지 경로
-                    }
-
-                    products.append(product)
-
-                except Exception as e:
-                    print(f"상품 정보 추출 실패: {e}")
-                    continue
-
-        except Exception as e:
-            print(f"상품 목록 추출 실패: {e}")
-
+        for rank, (name, brand, price, rating, goods_no, image_url) in enumerate(rows, rank_offset + 1):
+            # 상품 URL (goodsNo 파라미터)
+            url = f"{self.base_url}/store/goods/getGoodsDetail.do?goodsNo={goods_no or 'UNKNOWN'}"
+
+            image_path = None
+            if image_url and goods_no:
+                image_path = self._download_image(image_url, goods_no)
+
+            products.append({
+                'rank': rank,  # 랭킹 정보 추가
+                'name': name,
+                'brand': brand,
+                'price': price,
+                'rating': rating,
+                'category': '스킨케어',
+                'url': url,  # 실제 goodsNo를 포함한 URL
+                'image_url': image_url,  # 원본 이미지 URL
+                'image_path': image_path  # 로컬에 저장된 이미지 경로
+            })
         return products
 
-    def _extract_goods_no(self, item_elem):
-        """상품 요소에서 goodsNo를 추출합니다"""
-        try:
-            # 상품 상세 링크 찾기 (상품명 링크)
-            link_elem = item_elem.find('a')
-            if link_elem and 'href' in link_elem.attrs:
-                href = link_elem['href']
-                # href에서 goodsNo 파라미터 추출
-                if 'goodsNo=' in href:
-                    # URL에서 goodsNo 값 추출
-                    goods_no_start = href.find('goodsNo=') + len('goodsNo=')
-                    goods_no_end = href.find('&', goods_no_start)
-                    if goods_no_end == -1:
-                        goods_no_end = len(href)
-                    goods_no = href[goods_no_start:goods_no_end]
-                    return goods_no
-                elif href.startswith('/store/goods/getGoodsDetail.do'):
-                    # 상대 경로에서도 파싱
-                    goods_no_start = href.find('goodsNo=') + len('goodsNo=')
-                    if goods_no_start > len('goodsNo='):
-                        goods_no_end = href.find('&', goods_no_start)
-                        if goods_no_end == -1:
-                            goods_no_end = len(href)
-                        goods_no = href[goods_no_start:goods_no_end]
-                        return goods_no
-        except Exception as e:
-            print(f"goodsNo 추출 실패: {e}")
-
-        return None  # goodsNo를 찾지 못한 경우
-
-    def _extract_image_url(self, item_elem):
-        """상품 요소에서 이미지 URL을 추출합니다"""
-        try:
-            # 상품 이미지 찾기
-            img_elem = item_elem.find('img')
-            if img_elem and 'src' in img_elem.attrs:
-                src = img_elem['src']
-                # 호스트가 없는 상대경로인 경우 절대경로로 변환
-                if not src.startswith('http'):
-                    # 이미 AUHOST가 설정되어 있다면 사용, 아니면 기본으로
-                    if 'image.oliveyoung.co.kr' in src:
-                        src = f"https:{src}" if src.startswith('//') else f"https://image.oliveyoung.co.kr{src}"
-                    else:
-                        # 기본 케이스
-                        src = f"https://image.oliveyoung.co.kr{src}"
-                return src
-        except Exception as e:
-            print(f"이미지 URL 추출 실패: {e}")
-
-        return None  # 이미지 URL을 찾지 못한 경우
-
     def _download_image(self, image_url, goods_no):
-        """상품 이미지를 다운로드하여 로컬에 저장합니다"""
+        """상품 이미지를 다운로드하여 콘텐츠 주소 기반 저장소에 저장합니다"""
         try:
-            # 파일명 생성 (goods_no로 고유하게)
-            filename = f"{goods_no}.jpg"
-            filepath = self.images_dir / filename
-
-            # 이미 존재한다면 건너뛰기
-            if filepath.exists():
-                print(f"이미지 이미 존재: {filepath}")
-                try:
-                    return str(filepath.relative_to(Path.cwd()))
-                except ValueError:
-                    return str(filepath)
-
-            # 다운로드
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-
-            # 파일 저장
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-
-            print(f"이미지 다운로드 완료: {filepath}")
-            try:
-                return str(filepath.relative_to(Path.cwd()))
-            except ValueError:
-                # 상대 경로 계산 실패시 절대 경로 사용
-                return str(filepath)
+            # 같은 URL의 이미지가 이미 저장되어 있다면 건너뛰기
+            cached_path = self.image_store.lookup(goods_no, image_url)
+            if cached_path:
+                print(f"이미지 이미 존재: {cached_path}")
+                return cached_path
+
+            # 이전 방식({goodsNo}.jpg)으로 받아둔 파일은 저장소에 매핑이 없는 상품에만 한 번 옮겨 옴
+            # (매핑이 있는데 URL이 바뀌었다면 예전 파일은 낡은 이미지이므로 새로 받음)
+            legacy_path = self.images_dir / f"{goods_no}.jpg"
+            if legacy_path.exists() and not self.image_store.has_image(goods_no):
+                filepath = self.image_store.put(goods_no, legacy_path.read_bytes(), image_url)
+                # 다음 실행에서 다시 가져오지 않도록 옮긴 파일은 이름을 바꿔 둠
+                legacy_path.rename(legacy_path.with_name(f"{legacy_path.name}.imported"))
+                print(f"기존 이미지 이전 완료: {filepath}")
+                return filepath
+
+            # 이미지 CDN 요청은 랭킹 페이지 요청 간격 제한을 적용하지 않음
+            response = self.request_handler.get(image_url, timeout=10, rate_limited=False)
+            if response is None:
+                return None
+
+            filepath = self.image_store.put(goods_no, response.content, image_url)
+            print(f"이미지 저장 완료: {filepath}")
+            return filepath
 
         except Exception as e:
             print(f"이미지 다운로드 실패 ({image_url}): {e}")
             return None
 
-    def crawl_products(self, max_pages=5):
-        """여러 페이지에 걸쳐 상품을 크롤링합니다"""
-        all_products = []
-
-        for page in range(1, max_pages + 1):
-            print(f"페이지 {page} 크롤링 중...")
-
-            soup = self.fetch_page(page)
-            if soup is None:
-                break
-
-            products = self.extract_products(soup)
-            print(f"페이지 {page}: {len(products)}개 상품 발견")
+    def _probe_first_page(self):
+        """
+        가장 큰 페이지 크기부터 1페이지를 요청하여 엔드포인트가 받아들이는 크기를 찾습니다.
+        첫 요청이 곧 1페이지 데이터이므로 추가 요청은 큰 크기가 거부될 때만 발생합니다.
+
+        Returns:
+            (요청한 페이지 크기, 1페이지 파싱 결과) — 모두 실패하면 (None, None)
+        """
+        for rows_per_page in RANKING_PAGE_SIZE_CANDIDATES:
+            parsed = parse_ranking_page(self.fetch_page_content(1, rows_per_page))
+            if parsed is not None and parsed[0]:
+                return rows_per_page, parsed
+            print(f"페이지 크기 {rows_per_page} 응답 없음, 더 작은 크기로 재시도")
+        return None, None
+
+    def _plan_pages(self, total_count, last_page, page_size, max_products):
+        """
+        1페이지의 전체 상품 수 / 마지막 페이지 번호로 요청할 페이지 목록을 정합니다.
+        상품 수 상한(max_products)을 채우는 데 필요한 페이지까지만 요청합니다.
+
+        Args:
+            total_count: 1페이지에 표시된 전체 상품 수 (없으면 None)
+            last_page: 페이지 이동 영역의 마지막 페이지 번호 (없으면 None)
+            page_size: 1페이지에서 받은 상품 수 (확인된 페이지 크기)
+            max_products: 수집할 최대 상품 수
+
+        Returns:
+            요청할 마지막 페이지 번호 (알 수 없으면 None → 빈 페이지가 나올 때까지 순차 요청)
+        """
+        if total_count is not None and total_count < page_size:
+            total_count = None  # 다른 영역의 숫자를 잘못 읽은 경우
+        if total_count is not None and page_size:
+            pages = math.ceil(total_count / page_size)
+        elif last_page is not None:
+            pages = last_page
+        else:
+            # 요청한 크기보다 적게 왔어도 서버가 크기를 제한했을 수 있으므로 순차 요청으로 확인
+            return None
+        pages = min(pages, math.ceil(max_products / page_size))
+        print(f"📄 페이지 크기 {page_size}, 전체 {total_count if total_count is not None else '?'}개 "
+              f"→ 최대 {max_products}개, {pages}페이지")
+        return pages
 
-            if not products:
-                break
+    def crawl_products(self, max_pages=5):
+        """
+        여러 페이지에 걸쳐 상품을 크롤링합니다.
+        1페이지로 페이지 크기와 전체 페이지 수를 확인한 뒤 나머지 페이지를 병렬로 요청합니다.
 
-            all_products.extend(products)
+        Args:
+            max_pages: 예전 페이지 크기(8개) 기준 페이지 수 — 페이지 크기와 관계없이 최대 max_pages * 8개 상품 수집
+        """
+        all_products = []
+        seen = set()
+        max_products = max_pages * LEGACY_ROWS_PER_PAGE
 
-            # request_handler의 rate limiting으로 대체됨
+        def build_products(rows):
+            """상한을 넘는 상품은 이미지를 받기 전에 잘라냄"""
+            return self._build_products(rows[:max_products - len(all_products)], len(all_products))
 
+        def add_products(products):
+            """페이지 사이에 순위가 바뀌어 중복된 상품은 앞 페이지 것을 유지 (추가된 상품 수 반환)"""
+            added = 0
+            for product in products:
+                key = product['url']
+                if key not in seen:
+                    seen.add(key)
+                    product['rank'] = len(all_products) + 1
+                    all_products.append(product)
+                    added += 1
+            return added
+
+        print("페이지 1 크롤링 중...")
+        rows_per_page, first_page = self._probe_first_page()
+        if first_page is not None:
+            rows, total_count, last_page = first_page
+            page_size = len(rows)
+            products = build_products(rows)
+            print(f"페이지 1: {len(products)}개 상품 발견")
+            add_products(products)
+            last_page = self._plan_pages(total_count, last_page, page_size, max_products)
+
+            if last_page is not None and last_page > 1:
+                # 남은 페이지를 한 번에 병렬 요청 (요청 간격은 request_handler가 유지)
+                pages = list(range(2, last_page + 1))
+                with ThreadPoolExecutor(max_workers=min(len(pages), HTTP_CONCURRENCY_DEFAULT)) as executor:
+                    contents = list(executor.map(lambda page: self.fetch_page_content(page, rows_per_page), pages))
+
+                # 파싱은 프로세스 풀에서 (결과는 페이지 순서 유지 → rank 계산이 요청 완료 순서와 무관)
+                with RankingPageParser() as page_parser:
+                    parsed_pages = page_parser.parse_pages(contents)
+
+                for page, parsed in zip(pages, parsed_pages):
+                    if parsed is None:
+                        print(f"페이지 {page} 요청 실패, 이후 페이지 생략")
+                        break
+                    if len(all_products) >= max_products:
+                        break
+                    products = build_products(parsed[0])
+                    print(f"페이지 {page}: {len(products)}개 상품 발견")
+                    add_products(products)
+
+            elif last_page is None:
+                # 전체 페이지 수를 알 수 없으면 빈 페이지가 나올 때까지 순차 요청
+                page = 1
+                while len(all_products) < max_products:
+                    page += 1
+                    print(f"페이지 {page} 크롤링 중...")
+                    parsed = parse_ranking_page(self.fetch_page_content(page, rows_per_page))
+                    if parsed is None:
+                        break
+                    products = build_products(parsed[0])
+                    print(f"페이지 {page}: {len(products)}개 상품 발견")
+                    # 빈 페이지, 이미 받은 상품만 있는 페이지(pageIdx 무시), 1페이지보다 짧은 페이지는 마지막
+                    if not products or not add_products(products) or len(parsed[0]) < page_size:
+                        break
+
+        # 상품 카드용 썸네일/WebP 변환본 생성 (새 이미지만)
+        if all_products:
+            self.image_store.build_variants()
+            for product in all_products:
+                goods_no = goods_no_from_url(product['url'])
+                product['thumbnail_path'] = self.image_store.thumbnail_path(goods_no) if goods_no else None
+
+        stats = self.request_handler.stats()
+        print(f"📶 HTTP 요청 {stats['requests']}회 ({stats['transport']}, {stats['versions']}), "
+              f"평균 {stats['avg_latency_ms']}ms, 수신 {stats['wire_bytes'] / 1024:.1f}KB")
 
         return all_products
 
-    def save_to_csv(self, products, filename="products.csv"):
+    def save_to_csv(self, products, filename=CSV_FILENAME):
         """상품 데이터를 CSV 파일로 저장합니다"""
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-        filepath = output_dir / filename
-
-        if not products:
-            print("저장할 상품 데이터가 없습니다.")
-            return
-
-        try:
-            # 동적으로 필드명 결정 (모든 상품의 키를 수집)
-            fieldnames = set()
-            for product in products:
-                fieldnames.update(product.keys())
-
-            # 기본 필드 순서 보장
-            ordered_fields = ['rank', 'name', 'brand', 'price', 'rating', 'category', 'url', 'ingredients', 'reviews']
-            additional_fields = sorted(fieldnames - set(ordered_fields))
-            final_fieldnames = ordered_fields + additional_fields
-
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=final_fieldnames)
-
-                writer.writeheader()
-                for product in products:
-                    writer.writerow(product)
-
-            print(f"CSV 파일로 {len(products)}개 상품 저장 완료: {filepath}")
-
-        except Exception as e:
-            print(f"CSV 저장 실패: {e}")
-
-    def save_to_sqlite(self, products, db_path="products.db"):
-        """상품 데이터를 SQLite 데이터베이스로 저장합니다"""
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-        db_filepath = output_dir / db_path
-
-        try:
-            conn = sqlite3.connect(db_filepath)
-            cursor = conn.cursor()
-
-            # 기존 테이블 삭제 후 새로 생성 (스키마 변경을 위해)
-            cursor.execute('DROP TABLE IF EXISTS products')
-
-            # 테이블 생성
-            cursor.execute('''
-                CREATE TABLE products (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    rank INTEGER,
-                    name TEXT NOT NULL,
-                    brand TEXT,
-                    price INTEGER,
-                    rating REAL,
-                    category TEXT,
-                    url TEXT,
-                    image_url TEXT,          -- Original image URL
-                    image_path TEXT,         -- Local image path
-                    ingredients TEXT,        -- JSON array of ingredients
-                    additional_info TEXT,    -- JSON object of detailed info (full_info)
-                    reviews TEXT,            -- JSON array of reviews
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            # 데이터 삽입
-            for product in products:
-                # 상세 정보에서 데이터를 추출
-                detail_info = product.get('detail_info', {})
-                ingredients = detail_info.get('ingredients', []) if isinstance(detail_info, dict) else []
-                additional_info = detail_info.get('full_info', {}) if isinstance(detail_info, dict) else {}
-                reviews = product.get('reviews', [])
-
-                # JSON 형태로 저장
-                ingredients_json = json.dumps(ingredients)
-                additional_info_json = json.dumps(additional_info)
-                reviews_json = json.dumps(reviews)
-
-                cursor.execute('''
-                    INSERT INTO products (rank, name, brand, price, rating, category, url,
-                                         image_url, image_path, ingredients, additional_info, reviews)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    product['rank'],
-                    product['name'],
-                    product['brand'],
-                    product['price'],
-                    product['rating'],
-                    product['category'],
-                    product['url'],
-                    product.get('image_url'),
-                    product.get('image_path'),
-                    ingredients_json,
-                    additional_info_json,
-                    reviews_json
-                ))
-
-            conn.commit()
-            conn.close()
-
-            print(f"SQLite 데이터베이스로 {len(products)}개 상품 저장 완료: {db_filepath}")
-
-        except Exception as e:
-            print(f"SQLite 저장 실패: {e}")
+        return exporter.save_to_csv(products, filename, output_dir=self.output_dir)
+
+    def save_to_sqlite(self, products, db_path=DB_FILENAME, review_codec=REVIEW_CODEC_DEFAULT,
+                       preserve_details=False):
+        """
+        상품 데이터를 SQLite 데이터베이스로 저장합니다.
+        리뷰는 products 행이 아닌 reviews/product_reviews 테이블에 본문 해시 기준으로 저장합니다.
+        """
+        return exporter.save_to_sqlite(products, db_path, review_codec, output_dir=self.output_dir,
+                                       preserve_details=preserve_details)
 
     def crawl_and_save(self, max_pages=2):
         """크롤링 후 CSV와 SQLite에 모두 저장합니다"""
@@ -0,0 +1,170 @@
+"""
+HTTP 전송 계층 모듈
+RequestHandler가 사용하는 HTTP 클라이언트를 교체 가능하게 분리
+- requests: 기본 클라이언트 (HTTP/1.1, 동시 실행 수에 맞춘 커넥션 풀)
+- httpx: HTTP/2 지원 클라이언트 (h2 패키지가 있으면 HTTP/2 사용)
+Brotli 디코더(brotli/brotlicffi)가 설치된 경우에만 Accept-Encoding에 br을 포함
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # httpx 전송 계층을 사용하지 않으면 필요 없음
+    httpx = None
+
+# 상수 import
+from config.constants import HTTP_HEADERS, HTTP_POOL_HOSTS, HTTP_RETRY_STATUS
+
+TRANSPORTS = ('auto', 'requests', 'httpx')
+
+
+def _module_available(name: str) -> bool:
+    """모듈을 import할 수 있는지 확인합니다"""
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def brotli_available() -> bool:
+    """urllib3/httpx가 사용할 수 있는 Brotli 디코더가 설치되어 있는지 확인합니다"""
+    return _module_available('brotli') or _module_available('brotlicffi')
+
+
+def http2_available() -> bool:
+    """httpx HTTP/2 사용 가능 여부 (httpx와 h2 패키지 필요)"""
+    return httpx is not None and _module_available('h2')
+
+
+def default_headers() -> Dict[str, str]:
+    """실제로 디코딩할 수 있는 압축 방식만 Accept-Encoding에 넣은 기본 헤더"""
+    headers = dict(HTTP_HEADERS)
+    headers['Accept-Encoding'] = 'gzip, deflate, br' if brotli_available() else 'gzip, deflate'
+    return headers
+
+
+class RequestsTransport:
+    """requests 세션 기반 전송 계층 (HTTP/1.1 keep-alive)"""
+
+    name = 'requests'
+    errors: Tuple[type, ...] = (requests.RequestException,)
+
+    def __init__(self, pool_size: int, max_retries: int):
+        """
+        Args:
+            pool_size: 호스트당 유지할 커넥션 수 (동시 요청 수 이상)
+            max_retries: 최대 재시도 횟수
+        """
+        self.session = requests.Session()
+
+        # 재시도 전략
+        retry_strategy = Retry(
+            total=max_retries,
+            status_forcelist=list(HTTP_RETRY_STATUS),
+            allowed_methods=["HEAD", "GET", "OPTIONS"],
+            backoff_factor=1
+        )
+
+        # 동시 요청이 커넥션을 기다리거나 버리지 않도록 풀 크기 지정
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=HTTP_POOL_HOSTS,
+                              pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(default_headers())
+
+    def request(self, method: str, url: str, timeout: float, **kwargs) -> requests.Response:
+        """요청을 보내고 응답을 반환합니다"""
+        return self.session.request(method, url, timeout=timeout, allow_redirects=True, **kwargs)
+
+    @staticmethod
+    def wire_bytes(response: requests.Response) -> int:
+        """압축 해제 전 수신 크기 (Content-Length가 없으면 본문 크기)"""
+        length = response.headers.get('Content-Length')
+        return int(length) if length and length.isdigit() else len(response.content)
+
+    @staticmethod
+    def http_version(response: requests.Response) -> str:
+        """응답의 HTTP 버전"""
+        return {10: 'HTTP/1.0', 11: 'HTTP/1.1'}.get(getattr(response.raw, 'version', 11), 'HTTP/1.1')
+
+    def close(self):
+        """세션을 종료합니다"""
+        self.session.close()
+
+
+class HttpxTransport:
+    """httpx 클라이언트 기반 전송 계층 (HTTP/2 다중화 지원)"""
+
+    name = 'httpx'
+    errors: Tuple[type, ...] = (httpx.HTTPError,) if httpx is not None else ()
+
+    def __init__(self, pool_size: int, max_retries: int, http2: Optional[bool] = None):
+        """
+        Args:
+            pool_size: 최대 커넥션 수 (HTTP/2는 커넥션 하나로 여러 요청을 다중화)
+            max_retries: 최대 재시도 횟수 (연결 실패 및 HTTP_RETRY_STATUS 응답)
+            http2: HTTP/2 사용 여부 (None이면 h2 설치 여부로 결정)
+        """
+        if httpx is None:
+            raise ValueError("httpx 전송 계층을 사용하려면 httpx 패키지를 설치해주세요.")
+
+        self.http2 = http2_available() if http2 is None else http2
+        self.max_retries = max_retries
+
+        # HTTP/2에서는 연결 관련 헤더를 보낼 수 없음
+        headers = default_headers()
+        headers.pop('Connection', None)
+
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.client = httpx.Client(
+            headers=headers,
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(http2=self.http2, limits=limits, retries=max_retries),
+        )
+
+    def request(self, method: str, url: str, timeout: float, **kwargs) -> Any:
+        """요청을 보내고 응답을 반환합니다 (재시도 대상 상태 코드는 1, 2, 4초... 간격으로 재시도)"""
+        for attempt in range(self.max_retries + 1):
+            response = self.client.request(method, url, timeout=timeout, **kwargs)
+            if response.status_code not in HTTP_RETRY_STATUS or attempt == self.max_retries \
+                    or method not in ('GET', 'HEAD', 'OPTIONS'):
+                return response
+            time.sleep(2 ** attempt)
+        return response
+
+    @staticmethod
+    def wire_bytes(response: Any) -> int:
+        """압축 해제 전 수신 크기"""
+        return response.num_bytes_downloaded
+
+    @staticmethod
+    def http_version(response: Any) -> str:
+        """응답의 HTTP 버전"""
+        return response.http_version
+
+    def close(self):
+        """클라이언트를 종료합니다"""
+        self.client.close()
+
+
+def create_transport(kind: str = 'auto', pool_size: int = 4, max_retries: int = 3):
+    """
+    전송 계층을 생성합니다.
+
+    Args:
+        kind: 'auto' (httpx가 있으면 httpx, 없으면 requests), 'requests', 'httpx'
+        pool_size: 커넥션 풀 크기
+        max_retries: 최대 재시도 횟수
+    """
+    if kind not in TRANSPORTS:
+        raise ValueError(f"지원하지 않는 전송 계층: {kind}")
+    if kind == 'httpx' or (kind == 'auto' and httpx is not None):
+        return HttpxTransport(pool_size, max_retries)
+    return RequestsTransport(pool_size, max_retries)
@@ -0,0 +1,15 @@
+"""
+상품 데이터 스키마 관련 공통 함수
+"""
+
+from typing import Optional
+
+
+def goods_no_from_url(url: Optional[str]) -> Optional[str]:
+    """상품 URL에서 goodsNo 값을 추출합니다"""
+    if not url or 'goodsNo=' not in url:
+        return None
+    start = url.find('goodsNo=') + len('goodsNo=')
+    end = url.find('&', start)
+    goods_no = url[start:] if end == -1 else url[start:end]
+    return goods_no if goods_no and goods_no != 'UNKNOWN' else None
@@ -0,0 +1,973 @@
+#!/usr/bin/env python3
+"""
+크롤링 데이터 후처리 모듈
+게시(publish) 시점에 에이전트가 자주 묻는 집계 값(브랜드별 통계, 가격/평점 분포,
+성분 빈도, 리뷰 통계)과 정규화된 성분 목록, 유사 상품 인덱스, 토큰 예산 안의 상품 요약을
+미리 계산하여 SQLite 테이블로 저장
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, DB_FILENAME, INGREDIENTS_NOTICE_KEY, PRICE_BUCKET_SIZE, RATING_BUCKET_SIZE,
+    SIMILAR_TOP_K, SIMILARITY_MIN_SCORE, SIMILARITY_INGREDIENT_WEIGHT, SIMILARITY_REBUILD_RATIO,
+    SUMMARY_TOKEN_BUDGET, SUMMARY_TOP_INGREDIENTS, SUMMARY_REVIEW_HIGHLIGHTS, SUMMARY_HIGHLIGHT_MAX_CHARS,
+    SUMMARY_SPEC_MAX_CHARS, SUMMARY_NAME_MAX_CHARS
+)
+from models.data_schema import goods_no_from_url
+from storage.review_store import ReviewStore
+
+# 후처리 결과 테이블 (products 테이블이 재생성되어도 유지됨)
+PROCESSOR_SCHEMA = [
+    # 정규화된 성분 사전 (ID는 정규화된 이름의 해시라 DB를 다시 만들어도 동일)
+    '''
+    CREATE TABLE IF NOT EXISTS ingredient_dictionary (
+        ingredient_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    ''',
+    # 상품별 정규화 성분 목록 (전성분 표기 순서 유지)
+    '''
+    CREATE TABLE IF NOT EXISTS product_ingredients (
+        goods_no TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        ingredient_id INTEGER NOT NULL,
+        PRIMARY KEY (goods_no, position)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_product_ingredients_id ON product_ingredients(ingredient_id)',
+    # 단계별 상품 지문 (변경 감지용)
+    '''
+    CREATE TABLE IF NOT EXISTS processor_fingerprints (
+        stage TEXT NOT NULL,
+        goods_no TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        PRIMARY KEY (stage, goods_no)
+    ) WITHOUT ROWID
+    ''',
+    # 집계 계산에 사용한 상품별 스냅샷 (증분 갱신 시 이전 값 참조용)
+    '''
+    CREATE TABLE IF NOT EXISTS agg_product_snapshot (
+        goods_no TEXT PRIMARY KEY,
+        brand TEXT,
+        price INTEGER,
+        rating REAL,
+        rank INTEGER,
+        price_bucket REAL,
+        rating_bucket REAL,
+        review_count INTEGER,
+        review_chars INTEGER,
+        ingredients TEXT            -- JSON array of ingredients
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_agg_snapshot_brand ON agg_product_snapshot(brand)',
+    'CREATE INDEX IF NOT EXISTS idx_agg_snapshot_price ON agg_product_snapshot(price_bucket)',
+    'CREATE INDEX IF NOT EXISTS idx_agg_snapshot_rating ON agg_product_snapshot(rating_bucket)',
+    # 브랜드별 통계
+    '''
+    CREATE TABLE IF NOT EXISTS agg_brand_stats (
+        brand TEXT PRIMARY KEY,
+        product_count INTEGER,
+        min_price INTEGER,
+        avg_price REAL,
+        max_price INTEGER,
+        avg_rating REAL,
+        best_rank INTEGER,
+        review_count INTEGER,
+        avg_review_chars REAL,
+        updated_at TIMESTAMP
+    )
+    ''',
+    # 가격/평점 구간별 분포
+    '''
+    CREATE TABLE IF NOT EXISTS agg_distribution (
+        dimension TEXT NOT NULL,    -- 'price' 또는 'rating'
+        bucket_start REAL NOT NULL,
+        bucket_end REAL NOT NULL,
+        product_count INTEGER,
+        avg_price REAL,
+        avg_rating REAL,
+        updated_at TIMESTAMP,
+        PRIMARY KEY (dimension, bucket_start)
+    )
+    ''',
+    # 성분별 포함 상품 수
+    '''
+    CREATE TABLE IF NOT EXISTS agg_ingredient_freq (
+        ingredient TEXT PRIMARY KEY,
+        product_count INTEGER NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_agg_ingredient_count ON agg_ingredient_freq(product_count)',
+    # 상품별 유사 상품 top-k (성분 + 리뷰 TF-IDF 코사인 유사도)
+    '''
+    CREATE TABLE IF NOT EXISTS product_similar (
+        goods_no TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        neighbor_goods_no TEXT NOT NULL,
+        score REAL NOT NULL,
+        PRIMARY KEY (goods_no, position)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_product_similar_neighbor ON product_similar(neighbor_goods_no)',
+    # 상품별 리뷰 수/길이 통계
+    '''
+    CREATE TABLE IF NOT EXISTS agg_review_stats (
+        goods_no TEXT PRIMARY KEY,
+        review_count INTEGER,
+        total_chars INTEGER,
+        avg_chars REAL,
+        min_chars INTEGER,
+        max_chars INTEGER
+    )
+    ''',
+    # 상품별 요약 (에이전트 검색 도구가 원본 대신 반환하는 작은 결과)
+    '''
+    CREATE TABLE IF NOT EXISTS product_summaries (
+        goods_no TEXT PRIMARY KEY,
+        summary TEXT NOT NULL,      -- JSON: 주요 사양, 상위 성분, 리뷰 하이라이트
+        text TEXT NOT NULL,         -- SUMMARY_TOKEN_BUDGET 토큰 이하의 요약 문장
+        token_estimate INTEGER,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+]
+
+# 성분 정규화 단계가 참조하는 상품 필드
+INGREDIENT_FIELDS = ('ingredients_raw',)
+
+# 집계 단계가 참조하는 상품 필드 (이 값들이 바뀐 상품만 재계산)
+AGGREGATE_FIELDS = ('brand', 'price', 'rating', 'rank', 'ingredients', 'reviews')
+
+# 유사도 단계가 참조하는 상품 필드
+SIMILARITY_FIELDS = ('ingredients', 'reviews')
+
+# 요약 단계가 참조하는 상품 필드 (자주 바뀌는 순위는 요약에 넣지 않음)
+SUMMARY_FIELDS = ('name', 'brand', 'price', 'rating', 'category', 'ingredients', 'additional_info', 'reviews')
+
+# 요약에 넣을 상품정보 제공고시 항목 (표시 이름, 후보 키)
+SUMMARY_SPEC_KEYS = (
+    ('용량', ('내용물의 용량 또는 중량', '크기, 무게')),
+    ('주요 사양', ('제품 주요 사양', '주요 사양')),
+    ('기능성', ('기능성 화장품 식품의약품안전처 심사필 여부',)),
+    ('제조국', ('제조국',)),
+)
+
+# 정보가 없는 것과 같은 제공고시 값 (공백 제거 후 비교)
+SUMMARY_SPEC_PLACEHOLDERS = {'상세설명참조', '상세페이지참조', '해당사항없음', '해당없음', '없음', '-'}
+
+# 상품명 앞쪽의 행사 표기 ("[11월 올영픽] ", "[NEW/리뷰이벤트]")
+PRODUCT_NAME_TAG_PATTERN = re.compile(r'^(?:\s*\[[^\]]*\])+\s*')
+
+# 리뷰 문장 구분 (줄바꿈, 문장부호 뒤 공백) 및 하이라이트로 쓸 최소 길이
+REVIEW_SENTENCE_PATTERN = re.compile(r'\n+|(?<=[.!?~])\s+')
+REVIEW_SENTENCE_MIN_CHARS = 10
+
+# 리뷰 텍스트 토큰 (한글/영문/숫자 연속 구간)
+REVIEW_TOKEN_PATTERN = re.compile(r'[가-힣]+|[A-Za-z]+|[0-9]+')
+
+# 전성분 문자열 안의 구성품 라벨 ("[크림] 정제수, ...", "수분크림 : 정제수, ...")
+INGREDIENT_SECTION_PATTERN = re.compile(r'\[[^\[\]]*\]|【[^【】]*】')
+INGREDIENT_LABEL_PATTERN = re.compile(r'^(?:(?P<head>\S+)\s+)?(?P<label>[^:：]*?)\s*[:：]\s*')
+
+# 함량 표기 ("(10%)", "(1,000 ppm)", "(500IU/g)")
+INGREDIENT_AMOUNT_PATTERN = re.compile(
+    r'\(\s*[\d.,]+\s*(?:%|ppm|ppb|iu/g|mg/g|mg|g)?\s*\)', re.IGNORECASE
+)
+
+# 표기 변형 교정 규칙 (구 표기법 → 현행 표준 표기)
+INGREDIENT_SPELLING_RULES = [
+    (re.compile(r'에칠'), '에틸'),
+    (re.compile(r'메칠'), '메틸'),
+    (re.compile(r'디메치콘'), '다이메티콘'),
+    (re.compile(r'트리글리세라이드'), '트라이글리세라이드'),
+    (re.compile(r'헥산디올'), '헥산다이올'),
+    (re.compile(r'디소듐'), '다이소듐'),
+    (re.compile(r'^[-*·•\'"]+|[.\'"]+$'), ''),
+    (re.compile(r'^리뉴얼적용'), ''),      # "- 리뉴얼 적용 정제수" 같은 안내 문구
+]
+
+# 동의어 사전 (정규화된 이름 → 대표 이름)
+INGREDIENT_ALIASES = {
+    '물': '정제수',
+    '워터': '정제수',
+    '아쿠아': '정제수',
+    '정제수(아쿠아)': '정제수',
+    '트레할로스': '트레할로오스',
+    '다이소듐디티에이': '다이소듐이디티에이',
+}
+
+
+def _load_json(text: Optional[str], default):
+    """JSON 컬럼 값을 파싱합니다 (실패 시 기본값)"""
+    if not text:
+        return default
+    try:
+        value = json.loads(text)
+    except (TypeError, ValueError):
+        return default
+    return value if isinstance(value, type(default)) else default
+
+
+def _bucket(value: float, size: float) -> float:
+    """값이 속한 구간의 시작값을 계산합니다"""
+    return float(int(value // size) * size)
+
+
+def ingredient_id(name: str) -> int:
+    """정규화된 성분 이름으로 고정 ID(56비트)를 계산합니다"""
+    return int(hashlib.sha1(name.encode('utf-8')).hexdigest()[:14], 16)
+
+
+class IngredientNormalizer:
+    """
+    전성분 문자열을 정규화된 성분 목록으로 변환하는 클래스
+
+    괄호 안의 쉼표("1,2-헥산다이올", "(1,000ppm)")를 구분자로 취급하지 않는 토크나이저로
+    분리한 뒤, 함량 표기/공백을 제거하고 표기 변형 규칙과 동의어 사전으로 대표 이름을
+    정합니다. 같은 원본 문자열과 토큰은 한 번만 계산합니다.
+    """
+
+    def __init__(self):
+        self._string_cache: Dict[str, Tuple[str, ...]] = {}
+        self._token_cache: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """괄호 깊이와 숫자 사이 쉼표를 고려하여 전성분 문자열을 토큰으로 분리합니다"""
+        # 구성품 라벨은 구분자로 바꿔 앞뒤 성분이 붙지 않게 함
+        text = INGREDIENT_SECTION_PATTERN.sub(',', text)
+
+        tokens = []
+        current = []
+        depth = 0
+        for i, char in enumerate(text):
+            if char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth = max(depth - 1, 0)
+            elif char in ',，' and depth == 0:
+                # "1,2-헥산다이올", "2,3-부탄다이올"의 쉼표는 성분명의 일부
+                prev_char = text[i - 1] if i > 0 else ''
+                next_char = text[i + 1] if i + 1 < len(text) else ''
+                if not (prev_char.isdigit() and next_char.isdigit()):
+                    tokens.append(''.join(current))
+                    current = []
+                    continue
+            current.append(char)
+        tokens.append(''.join(current))
+
+        # "카프릴릴글라이콜 마스크팩 : 정제수" 처럼 라벨이 쉼표 없이 끼어든 경우 분리
+        result = []
+        for token in tokens:
+            token = token.strip()
+            match = INGREDIENT_LABEL_PATTERN.match(token)
+            if match:
+                if result and match.group('head') and match.group('label'):
+                    result.append(match.group('head'))
+                token = token[match.end():]
+            if token:
+                result.append(token)
+        return result
+
+    def canonicalize(self, token: str) -> Optional[str]:
+        """단일 성분 토큰을 대표 이름으로 변환합니다 (성분이 아니면 None)"""
+        if token in self._token_cache:
+            return self._token_cache[token]
+
+        name = INGREDIENT_AMOUNT_PATTERN.sub('', token)
+        name = ''.join(name.split())
+        for pattern, replacement in INGREDIENT_SPELLING_RULES:
+            name = pattern.sub(replacement, name)
+        name = INGREDIENT_ALIASES.get(name, name)
+
+        # 숫자/기호만 남은 조각은 성분이 아님
+        canonical = name if any(c.isalpha() for c in name) else None
+        self._token_cache[token] = canonical
+        return canonical
+
+    def normalize(self, text: str) -> Tuple[str, ...]:
+        """전성분 문자열 하나를 정규화합니다 (중복 성분은 첫 위치만 유지)"""
+        cached = self._string_cache.get(text)
+        if cached is not None:
+            return cached
+
+        seen = set()
+        names = []
+        for token in self.tokenize(text):
+            name = self.canonicalize(token)
+            if name and name not in seen:
+                seen.add(name)
+                names.append(name)
+
+        result = tuple(names)
+        self._string_cache[text] = result
+        return result
+
+    def normalize_many(self, texts: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+        """여러 전성분 문자열을 한 번에 정규화합니다 (서로 다른 문자열만 계산)"""
+        return {text: self.normalize(text) for text in set(texts)}
+
+
+def _ingredient_terms(ingredients: List[str]) -> List[str]:
+    """성분 목록을 유사도 계산용 용어로 변환합니다 (공백 차이 제거)"""
+    return [''.join(ingredient.split()) for ingredient in ingredients if ingredient.strip()]
+
+
+def _review_terms(reviews: List[str]) -> List[str]:
+    """리뷰 텍스트를 용어로 분리합니다 (한글은 음절 bigram 사용)"""
+    terms = []
+    for review in reviews:
+        for token in REVIEW_TOKEN_PATTERN.findall(review.lower()):
+            if len(token) <= 2 or not ('가' <= token[0] <= '힣'):
+                terms.append(token)
+            else:
+                terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return terms
+
+
+def _l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    """희소 행렬의 각 행을 L2 정규화합니다 (빈 행은 그대로 둠)"""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix, dtype=np.float32)
+
+
+def _tfidf_matrix(documents: List[List[str]]) -> sparse.csr_matrix:
+    """
+    용어 목록으로부터 L2 정규화된 TF-IDF 희소 행렬을 만듭니다.
+
+    tf는 1 + log(tf), idf는 log((1 + N) / (1 + df)) + 1 (smooth idf)을 사용합니다.
+    """
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, terms in enumerate(documents):
+        for term in terms:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+
+    shape = (len(documents), max(len(vocabulary), 1))
+    counts = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32),
+         (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=shape
+    )
+    counts.sum_duplicates()
+
+    df = np.bincount(counts.indices, minlength=shape[1])
+    idf = np.log((1.0 + shape[0]) / (1.0 + df)) + 1.0
+    counts.data = ((1.0 + np.log(counts.data)) * idf[counts.indices]).astype(np.float32)
+    return _l2_normalize(counts)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    LLM 토큰 수를 토크나이저 없이 보수적으로 추정합니다.
+    한글 등 ASCII가 아닌 문자는 1자 1토큰, ASCII 문자는 4자 1토큰으로 셉니다.
+    """
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return len(text) - ascii_chars + -(-ascii_chars // 4)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """공백을 정리하고 max_chars자를 넘으면 말줄임표로 자릅니다"""
+    text = ' '.join(text.split())
+    return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + '…'
+
+
+def _truncate_tokens(text: str, budget: int) -> str:
+    """토큰 예산을 넘는 뒷부분을 잘라냅니다"""
+    if estimate_tokens(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) < budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + '…'
+
+
+def _spec_summary(additional_info: Dict[str, Any]) -> Dict[str, str]:
+    """상품정보 제공고시에서 요약에 넣을 항목만 짧게 추립니다"""
+    specs = {}
+    for label, keys in SUMMARY_SPEC_KEYS:
+        for key in keys:
+            value = additional_info.get(key)
+            if isinstance(value, str) and value.strip() and ''.join(value.split()) not in SUMMARY_SPEC_PLACEHOLDERS:
+                specs[label] = _truncate(value, SUMMARY_SPEC_MAX_CHARS)
+                break
+    return specs
+
+
+def review_highlights(reviews: List[str], count: int = SUMMARY_REVIEW_HIGHLIGHTS) -> List[str]:
+    """
+    여러 리뷰에 공통으로 나오는 표현을 많이 담은 리뷰 문장을 고릅니다 (추출 요약, 항상 같은 결과).
+
+    문장 점수는 문장 용어가 등장한 리뷰 수(2개 이상인 용어만)의 합을 용어 수의 제곱근으로 나눈 값이며,
+    이미 고른 문장과 용어가 절반 이상 겹치는 문장은 건너뜁니다. 같은 점수는 먼저 나온 문장을 고릅니다.
+    """
+    sentences = []
+    review_frequency: Counter = Counter()
+    for review in reviews:
+        review_terms = set()
+        for sentence in REVIEW_SENTENCE_PATTERN.split(review):
+            sentence = ' '.join(sentence.split())
+            terms = set(_review_terms([sentence]))
+            review_terms |= terms
+            if len(sentence) >= REVIEW_SENTENCE_MIN_CHARS and terms:
+                sentences.append((len(sentences), sentence, terms))
+        review_frequency.update(review_terms)
+
+    def score(terms: Set[str]) -> float:
+        shared = sum(review_frequency[term] for term in terms if review_frequency[term] > 1)
+        return shared / len(terms) ** 0.5
+
+    ranked = sorted(sentences, key=lambda item: (-score(item[2]), item[0]))
+    chosen: List[Tuple[str, Set[str]]] = []
+    for _, sentence, terms in ranked:
+        if len(chosen) >= count:
+            break
+        if any(len(terms & other) / len(terms | other) >= 0.5 for _, other in chosen):
+            continue
+        chosen.append((_truncate(sentence, SUMMARY_HIGHLIGHT_MAX_CHARS), terms))
+    return [sentence for sentence, _ in chosen]
+
+
+def _summary_text(summary: Dict[str, Any], budget: int = SUMMARY_TOKEN_BUDGET) -> str:
+    """
+    요약 문장을 만듭니다. 토큰 예산을 넘으면 리뷰 하이라이트 수와 성분 수(전체, 5개, 3개)를 줄여
+    예산 안에서 가장 많은 내용이 남는 조합을 고르고 (하이라이트 하나와 성분 단계 하나를 같은 비중으로,
+    같으면 하이라이트 우선), 그래도 넘으면 뒷부분을 자릅니다.
+    """
+    name = summary['name'] or ''
+    brand = summary['brand'] or ''
+    head = name if brand and brand in name else ' '.join(filter(None, [brand, name]))
+    basics = [head]
+    if summary['price']:
+        basics.append(f"{summary['price']:,}원")
+    if summary['rating']:
+        basics.append(f"평점 {summary['rating']:.1f}")
+    if summary['specs']:
+        basics.append(', '.join(f"{label} {value}" for label, value in summary['specs'].items()))
+
+    ingredients = summary['top_ingredients']
+    highlights = summary['review_highlights']
+    ingredient_levels = sorted({len(ingredients), min(len(ingredients), 5), min(len(ingredients), 3)}, reverse=True)
+    combinations = sorted(
+        ((level, highlight_count) for level in range(len(ingredient_levels))
+         for highlight_count in range(len(highlights), -1, -1)),
+        key=lambda item: (item[0] - item[1], -item[1])
+    )
+
+    text = ''
+    for level, highlight_count in combinations:
+        ingredient_count = ingredient_levels[level]
+        parts = list(basics)
+        if ingredient_count:
+            rest = summary['ingredient_count'] - ingredient_count
+            parts.append(f"주요 성분 {', '.join(ingredients[:ingredient_count])}" + (f" 외 {rest}종" if rest > 0 else ''))
+        if summary['review_count']:
+            quoted = ' / '.join(f'"{sentence}"' for sentence in highlights[:highlight_count])
+            parts.append(f"리뷰 {summary['review_count']}개" + (f": {quoted}" if quoted else ''))
+        text = ' | '.join(parts)
+        if estimate_tokens(text) <= budget:
+            return text
+    return _truncate_tokens(text, budget)
+
+
+def build_summary(product: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """
+    상품 하나의 요약을 만듭니다 (같은 입력이면 항상 같은 결과).
+
+    Returns:
+        (요약 객체, 토큰 예산 안의 요약 문장)
+    """
+    ingredients = product.get('ingredients') or []
+    reviews = product.get('reviews') or []
+    name = PRODUCT_NAME_TAG_PATTERN.sub('', product.get('name') or '') or (product.get('name') or '')
+    summary = {
+        'goods_no': product['goods_no'],
+        'name': _truncate(name, SUMMARY_NAME_MAX_CHARS),
+        'brand': product.get('brand'),
+        'price': product.get('price'),
+        'rating': product.get('rating'),
+        'category': product.get('category'),
+        'specs': _spec_summary(product.get('additional_info') or {}),
+        'top_ingredients': ingredients[:SUMMARY_TOP_INGREDIENTS],
+        'ingredient_count': len(ingredients),
+        'review_count': len(reviews),
+        'review_highlights': review_highlights(reviews),
+    }
+    return summary, _summary_text(summary)
+
+
+class DataProcessor:
+    """products.db 후처리(집계 테이블 생성 및 증분 갱신)를 담당하는 클래스"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: 크롤러가 저장한 SQLite 파일 경로 (기본값: output/products.db)
+        """
+        self.db_path = Path(db_path) if db_path else Path(OUTPUT_DIR) / DB_FILENAME
+        self.normalizer = IngredientNormalizer()
+
+    def _connect(self) -> sqlite3.Connection:
+        """트랜잭션을 직접 관리하는 연결을 생성합니다"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        """후처리 테이블을 생성합니다"""
+        for statement in PROCESSOR_SCHEMA:
+            conn.execute(statement)
+
+    def _load_products(self, conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+        """products 테이블과 리뷰 테이블을 goodsNo 기준 딕셔너리로 읽어옵니다"""
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(products)')}
+        # 리뷰가 products 테이블에 JSON으로 들어있던 이전 스키마도 읽을 수 있도록 함
+        legacy_reviews = 'reviews' in columns
+
+        products = {}
+        rows = conn.execute(f'''
+            SELECT rank, name, brand, price, rating, category, url,
+                   ingredients, additional_info{', reviews' if legacy_reviews else ''}
+            FROM products
+        ''')
+        for row in rows:
+            goods_no = goods_no_from_url(row['url'])
+            if not goods_no:
+                continue
+
+            product = dict(row)
+            product['goods_no'] = goods_no
+            product['ingredients'] = _load_json(row['ingredients'], [])
+            product['additional_info'] = _load_json(row['additional_info'], {})
+            if legacy_reviews:
+                product['reviews'] = [r for r in _load_json(row['reviews'], []) if isinstance(r, str)]
+
+            # 정규화에는 split 전의 전성분 원문을 우선 사용
+            raw = product['additional_info'].get(INGREDIENTS_NOTICE_KEY)
+            product['ingredients_raw'] = raw if isinstance(raw, str) else ', '.join(product['ingredients'])
+            products[goods_no] = product
+
+        if not legacy_reviews:
+            review_store = ReviewStore(conn)
+            review_store.ensure_schema()
+            reviews = review_store.load_reviews()
+            for goods_no, product in products.items():
+                product['reviews'] = reviews.get(goods_no, [])
+
+        return products
+
+    @staticmethod
+    def _fingerprint(product: Dict[str, Any], fields: Iterable[str]) -> str:
+        """지정한 필드 값으로 상품 지문(해시)을 계산합니다"""
+        payload = json.dumps([product.get(field) for field in fields],
+                             ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _detect_changes(self, conn: sqlite3.Connection, stage: str,
+                        products: Dict[str, Dict[str, Any]], fields: Iterable[str],
+                        full: bool = False) -> Tuple[Dict[str, str], Set[str]]:
+        """
+        단계별 지문을 비교하여 변경된 상품을 찾습니다.
+
+        Returns:
+            (변경/추가된 goodsNo → 새 지문, 삭제된 goodsNo 집합)
+        """
+        previous = dict(conn.execute(
+            'SELECT goods_no, fingerprint FROM processor_fingerprints WHERE stage = ?', (stage,)
+        ).fetchall())
+
+        fields = tuple(fields)
+        changed = {}
+        for goods_no, product in products.items():
+            fingerprint = self._fingerprint(product, fields)
+            if full or previous.get(goods_no) != fingerprint:
+                changed[goods_no] = fingerprint
+
+        removed = set(previous) - set(products)
+        return changed, removed
+
+    def _commit_fingerprints(self, conn: sqlite3.Connection, stage: str,
+                             changed: Dict[str, str], removed: Set[str]):
+        """변경 감지 결과를 지문 테이블에 반영합니다 (호출한 트랜잭션 안에서 실행)"""
+        conn.executemany(
+            'INSERT OR REPLACE INTO processor_fingerprints (stage, goods_no, fingerprint) VALUES (?, ?, ?)',
+            [(stage, goods_no, fingerprint) for goods_no, fingerprint in changed.items()]
+        )
+        conn.executemany(
+            'DELETE FROM processor_fingerprints WHERE stage = ? AND goods_no = ?',
+            [(stage, goods_no) for goods_no in removed]
+        )
+
+    def normalize_ingredients(self, conn: sqlite3.Connection,
+                              products: Dict[str, Dict[str, Any]], full: bool = False) -> int:
+        """
+        전체 카탈로그의 전성분을 정규화하여 products의 'ingredients'를 교체하고,
+        원문이 바뀐 상품의 성분 목록만 product_ingredients 테이블에 다시 저장합니다.
+
+        Returns:
+            다시 저장한 상품 수
+        """
+        normalized = self.normalizer.normalize_many(p['ingredients_raw'] for p in products.values())
+        for product in products.values():
+            product['ingredients'] = list(normalized[product['ingredients_raw']])
+
+        changed, removed = self._detect_changes(conn, 'ingredients', products, INGREDIENT_FIELDS, full)
+        if full:
+            conn.execute('DELETE FROM product_ingredients')
+        if not changed and not removed:
+            return 0
+
+        names = {name for goods_no in changed for name in products[goods_no]['ingredients']}
+        conn.executemany('INSERT OR IGNORE INTO ingredient_dictionary (ingredient_id, name) VALUES (?, ?)',
+                         [(ingredient_id(name), name) for name in sorted(names)])
+
+        conn.executemany('DELETE FROM product_ingredients WHERE goods_no = ?',
+                         [(goods_no,) for goods_no in list(changed) + list(removed)])
+        conn.executemany('INSERT INTO product_ingredients (goods_no, position, ingredient_id) VALUES (?, ?, ?)', [
+            (goods_no, position, ingredient_id(name))
+            for goods_no in changed
+            for position, name in enumerate(products[goods_no]['ingredients'], 1)
+        ])
+
+        self._commit_fingerprints(conn, 'ingredients', changed, removed)
+        return len(changed) + len(removed)
+
+    def refresh_aggregates(self, conn: sqlite3.Connection,
+                           products: Dict[str, Dict[str, Any]], full: bool = False) -> int:
+        """
+        집계 테이블을 갱신합니다. 변경된 상품이 속한 브랜드/구간/성분만 다시 계산합니다.
+
+        Returns:
+            재계산한 상품 수
+        """
+        if full:
+            for table in ('agg_product_snapshot', 'agg_brand_stats', 'agg_distribution',
+                          'agg_ingredient_freq', 'agg_review_stats'):
+                conn.execute(f'DELETE FROM {table}')
+
+        changed, removed = self._detect_changes(conn, 'aggregates', products, AGGREGATE_FIELDS, full)
+        if not changed and not removed:
+            return 0
+
+        touched = list(changed) + list(removed)
+        old_rows = {}
+        for start in range(0, len(touched), 500):
+            chunk = touched[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row in conn.execute(
+                f'SELECT * FROM agg_product_snapshot WHERE goods_no IN ({placeholders})', chunk
+            ):
+                old_rows[row['goods_no']] = row
+
+        affected_brands: Set[str] = set()
+        affected_buckets: Set[Tuple[str, float]] = set()
+        ingredient_delta: Dict[str, int] = {}
+
+        # 이전 스냅샷 값 제거
+        for goods_no in touched:
+            old = old_rows.get(goods_no)
+            if old is None:
+                continue
+            affected_brands.add(old['brand'])
+            affected_buckets.add(('price', old['price_bucket']))
+            affected_buckets.add(('rating', old['rating_bucket']))
+            for ingredient in set(_load_json(old['ingredients'], [])):
+                ingredient_delta[ingredient] = ingredient_delta.get(ingredient, 0) - 1
+
+        conn.executemany('DELETE FROM agg_product_snapshot WHERE goods_no = ?',
+                         [(goods_no,) for goods_no in touched])
+        conn.executemany('DELETE FROM agg_review_stats WHERE goods_no = ?',
+                         [(goods_no,) for goods_no in touched])
+
+        # 새 스냅샷 및 상품별 리뷰 통계 추가
+        snapshot_rows = []
+        review_rows = []
+        for goods_no in changed:
+            product = products[goods_no]
+            price = int(product.get('price') or 0)
+            rating = float(product.get('rating') or 0.0)
+            reviews = product.get('reviews', [])
+            lengths = [len(review) for review in reviews]
+            ingredients = sorted(set(product.get('ingredients', [])))
+
+            price_bucket = _bucket(price, PRICE_BUCKET_SIZE)
+            rating_bucket = _bucket(rating, RATING_BUCKET_SIZE)
+            snapshot_rows.append((
+                goods_no, product.get('brand'), price, rating, product.get('rank'),
+                price_bucket, rating_bucket, len(reviews), sum(lengths),
+                json.dumps(ingredients, ensure_ascii=False)
+            ))
+            if lengths:
+                review_rows.append((goods_no, len(lengths), sum(lengths),
+                                    sum(lengths) / len(lengths), min(lengths), max(lengths)))
+
+            affected_brands.add(product.get('brand'))
+            affected_buckets.add(('price', price_bucket))
+            affected_buckets.add(('rating', rating_bucket))
+            for ingredient in ingredients:
+                ingredient_delta[ingredient] = ingredient_delta.get(ingredient, 0) + 1
+
+        conn.executemany('''
+            INSERT INTO agg_product_snapshot (goods_no, brand, price, rating, rank, price_bucket,
+                                              rating_bucket, review_count, review_chars, ingredients)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', snapshot_rows)
+        conn.executemany('''
+            INSERT INTO agg_review_stats (goods_no, review_count, total_chars, avg_chars, min_chars, max_chars)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', review_rows)
+
+        # 영향받은 브랜드만 재집계
+        for brand in affected_brands:
+            conn.execute('DELETE FROM agg_brand_stats WHERE brand IS ?', (brand,))
+            conn.execute('''
+                INSERT INTO agg_brand_stats (brand, product_count, min_price, avg_price, max_price,
+                                             avg_rating, best_rank, review_count, avg_review_chars, updated_at)
+                SELECT brand, COUNT(*), MIN(price), AVG(price), MAX(price), AVG(rating), MIN(rank),
+                       SUM(review_count), CAST(SUM(review_chars) AS REAL) / MAX(SUM(review_count), 1),
+                       CURRENT_TIMESTAMP
+                FROM agg_product_snapshot
+                WHERE brand IS ?
+                GROUP BY brand
+            ''', (brand,))
+
+        # 영향받은 가격/평점 구간만 재집계
+        bucket_sizes = {'price': PRICE_BUCKET_SIZE, 'rating': RATING_BUCKET_SIZE}
+        for dimension, bucket_start in affected_buckets:
+            conn.execute('DELETE FROM agg_distribution WHERE dimension = ? AND bucket_start = ?',
+                         (dimension, bucket_start))
+            conn.execute(f'''
+                INSERT INTO agg_distribution (dimension, bucket_start, bucket_end, product_count,
+                                              avg_price, avg_rating, updated_at)
+                SELECT ?, {dimension}_bucket, {dimension}_bucket + ?, COUNT(*), AVG(price), AVG(rating),
+                       CURRENT_TIMESTAMP
+                FROM agg_product_snapshot
+                WHERE {dimension}_bucket = ?
+                GROUP BY {dimension}_bucket
+            ''', (dimension, bucket_sizes[dimension], bucket_start))
+
+        # 성분 빈도는 증감분만 반영
+        for ingredient, delta in ingredient_delta.items():
+            if delta == 0:
+                continue
+            conn.execute('''
+                INSERT INTO agg_ingredient_freq (ingredient, product_count) VALUES (?, ?)
+                ON CONFLICT(ingredient) DO UPDATE SET product_count = product_count + excluded.product_count
+            ''', (ingredient, delta))
+        conn.execute('DELETE FROM agg_ingredient_freq WHERE product_count <= 0')
+
+        self._commit_fingerprints(conn, 'aggregates', changed, removed)
+        return len(changed) + len(removed)
+
+    def refresh_summaries(self, conn: sqlite3.Connection,
+                          products: Dict[str, Dict[str, Any]], full: bool = False) -> int:
+        """
+        상품별 요약(product_summaries)을 갱신합니다. 요약에 쓰이는 필드가 바뀐 상품만 다시 만듭니다.
+        성분은 normalize_ingredients가 정규화한 목록을 사용합니다.
+
+        Returns:
+            다시 만들거나 삭제한 상품 수
+        """
+        if full:
+            conn.execute('DELETE FROM product_summaries')
+
+        changed, removed = self._detect_changes(conn, 'summaries', products, SUMMARY_FIELDS, full)
+        if not changed and not removed:
+            return 0
+
+        rows = []
+        for goods_no in changed:
+            summary, text = build_summary(products[goods_no])
+            rows.append((goods_no, json.dumps(summary, ensure_ascii=False, separators=(',', ':')),
+                         text, estimate_tokens(text)))
+        conn.executemany('DELETE FROM product_summaries WHERE goods_no = ?', [(goods_no,) for goods_no in removed])
+        conn.executemany('''
+            INSERT OR REPLACE INTO product_summaries (goods_no, summary, text, token_estimate, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', rows)
+
+        self._commit_fingerprints(conn, 'summaries', changed, removed)
+        return len(changed) + len(removed)
+
+    def _similarity_matrix(self, products: Dict[str, Dict[str, Any]],
+                           goods_nos: List[str]) -> sparse.csr_matrix:
+        """성분/리뷰 TF-IDF 행렬을 가중 결합한 상품 벡터 행렬을 만듭니다 (행은 L2 정규화)"""
+        ingredient_matrix = _tfidf_matrix([_ingredient_terms(products[g].get('ingredients', [])) for g in goods_nos])
+        review_matrix = _tfidf_matrix([_review_terms(products[g].get('reviews', [])) for g in goods_nos])
+
+        # 코사인 = w * cos(성분) + (1 - w) * cos(리뷰) 가 되도록 블록별로 sqrt(w)를 곱함
+        combined = sparse.hstack([
+            ingredient_matrix * np.float32(np.sqrt(SIMILARITY_INGREDIENT_WEIGHT)),
+            review_matrix * np.float32(np.sqrt(1.0 - SIMILARITY_INGREDIENT_WEIGHT)),
+        ], format='csr')
+
+        # 한쪽 블록이 비어 있는 상품도 다른 블록만으로 비교되도록 다시 정규화
+        return _l2_normalize(combined)
+
+    @staticmethod
+    def _top_k_rows(scores: sparse.csr_matrix, row_ids: np.ndarray) -> List[List[Tuple[int, float]]]:
+        """유사도 행렬의 각 행에서 자기 자신을 제외한 상위 k개 (열 번호, 점수)를 구합니다"""
+        results = []
+        for i, self_index in enumerate(row_ids):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            cols = scores.indices[start:end]
+            values = scores.data[start:end]
+
+            mask = (cols != self_index) & (values >= SIMILARITY_MIN_SCORE)
+            cols, values = cols[mask], values[mask]
+            if len(values) > SIMILAR_TOP_K:
+                top = np.argpartition(-values, SIMILAR_TOP_K - 1)[:SIMILAR_TOP_K]
+                cols, values = cols[top], values[top]
+
+            order = np.lexsort((cols, -values))
+            results.append([(int(cols[j]), float(values[j])) for j in order])
+        return results
+
+    def refresh_similarity(self, conn: sqlite3.Connection,
+                           products: Dict[str, Dict[str, Any]], full: bool = False) -> int:
+        """
+        유사 상품 인덱스를 갱신합니다.
+
+        변경된 상품과, 변경된 상품이 top-k 목록에 새로 들어가거나 빠지는 상품의 행만 다시
+        계산합니다. IDF는 매번 전체 카탈로그로 계산하므로 다시 계산하지 않은 행의 점수는
+        다음 전체 재계산 전까지 약간 오래된 값일 수 있습니다.
+
+        Returns:
+            다시 계산한 상품 행 수
+        """
+        changed, removed = self._detect_changes(conn, 'similarity', products, SIMILARITY_FIELDS, full)
+        if not changed and not removed:
+            return 0
+
+        goods_nos = sorted(products)
+        index_of = {goods_no: i for i, goods_no in enumerate(goods_nos)}
+        matrix = self._similarity_matrix(products, goods_nos)
+        matrix_t = matrix.T.tocsr()
+
+        indexed = conn.execute('SELECT COUNT(DISTINCT goods_no) FROM product_similar').fetchone()[0]
+        rebuild = (full or indexed == 0
+                   or len(changed) + len(removed) > SIMILARITY_REBUILD_RATIO * max(len(goods_nos), 1))
+
+        if rebuild:
+            affected = set(goods_nos)
+            conn.execute('DELETE FROM product_similar')
+        else:
+            stale = list(changed) + list(removed)
+            affected = set(changed)
+
+            # 변경/삭제된 상품을 이웃으로 가진 상품
+            for start in range(0, len(stale), 500):
+                chunk = stale[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                affected.update(row[0] for row in conn.execute(
+                    f'SELECT goods_no FROM product_similar WHERE neighbor_goods_no IN ({placeholders})', chunk
+                ))
+
+            # 변경된 상품이 기존 k번째 이웃보다 가까워진 상품
+            thresholds = np.zeros(len(goods_nos), dtype=np.float32)
+            for goods_no, count, min_score in conn.execute(
+                'SELECT goods_no, COUNT(*), MIN(score) FROM product_similar GROUP BY goods_no'
+            ):
+                if goods_no in index_of and count >= SIMILAR_TOP_K:
+                    thresholds[index_of[goods_no]] = min_score
+
+            changed_rows = [index_of[goods_no] for goods_no in changed]
+            if changed_rows:
+                candidates = (matrix[changed_rows] @ matrix_t).tocoo()
+                hits = candidates.data > np.maximum(thresholds[candidates.col], SIMILARITY_MIN_SCORE)
+                affected.update(goods_nos[col] for col in np.unique(candidates.col[hits]))
+
+            affected &= set(index_of)
+            conn.executemany('DELETE FROM product_similar WHERE goods_no = ?',
+                             [(goods_no,) for goods_no in affected | removed])
+
+        affected_rows = np.array(sorted(index_of[goods_no] for goods_no in affected), dtype=np.int64)
+        for start in range(0, len(affected_rows), 512):
+            row_ids = affected_rows[start:start + 512]
+            scores = (matrix[row_ids] @ matrix_t).tocsr()
+            neighbours = self._top_k_rows(scores, row_ids)
+            conn.executemany('''
+                INSERT INTO product_similar (goods_no, position, neighbor_goods_no, score)
+                VALUES (?, ?, ?, ?)
+            ''', [
+                (goods_nos[row], position, goods_nos[col], round(score, 6))
+                for row, row_neighbours in zip(row_ids, neighbours)
+                for position, (col, score) in enumerate(row_neighbours, 1)
+            ])
+
+        self._commit_fingerprints(conn, 'similarity', changed, removed)
+        return len(affected_rows)
+
+    def process(self, full: bool = False) -> Dict[str, int]:
+        """
+        모든 후처리 단계를 실행합니다.
+
+        Args:
+            full: True이면 이전 결과를 무시하고 전체 재계산
+
+        Returns:
+            단계별 재계산 상품 수
+        """
+        started = time.time()
+        conn = self._connect()
+        try:
+            self._ensure_schema(conn)
+            products = self._load_products(conn)
+
+            stats = {}
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                stats['ingredients'] = self.normalize_ingredients(conn, products, full=full)
+                stats['aggregates'] = self.refresh_aggregates(conn, products, full=full)
+                stats['summaries'] = self.refresh_summaries(conn, products, full=full)
+                stats['similarity'] = self.refresh_similarity(conn, products, full=full)
+                # 랭킹에서 빠진 상품의 리뷰 본문 정리 (배포 DB에 남지 않도록)
+                review_store = ReviewStore(conn)
+                review_store.ensure_schema()
+                stats['pruned_reviews'] = review_store.prune_orphans()
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+            elapsed = time.time() - started
+            print(f"✅ 후처리 완료: 상품 {len(products)}개, 갱신 {stats} ({elapsed:.2f}초)")
+            return stats
+        finally:
+            conn.close()
+
+
+def main():
+    """후처리 단독 실행 함수"""
+    parser = argparse.ArgumentParser(description='크롤링 데이터 후처리 (집계 테이블, 유사 상품 인덱스, 상품 요약 생성)')
+    parser.add_argument('--db', type=str, default=None,
+                        help=f'SQLite 파일 경로 (기본값: {OUTPUT_DIR}/{DB_FILENAME})')
+    parser.add_argument('--full', action='store_true',
+                        help='증분 갱신 대신 전체 재계산')
+    args = parser.parse_args()
+
+    DataProcessor(args.db).process(full=args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+products.db 동시 읽기/쓰기 부하 테스트
+여러 읽기 프로세스가 백엔드(backend/src/services/dbInterface.js)와 같은 형태의 조회
+(searchProducts, getProductById, getReviewsByGoodsNo)를 반복하는 동안 크롤러의 저장 경로
+(save_to_sqlite + 후처리)를 주기적으로 실행하여, 저장 방식별 읽기 지연 시간(p50/p99),
+busy 오류 수, 처리량을 측정
+
+저장 방식:
+    delete   롤백 저널, 같은 파일을 읽고 씀 (크롤러 기본값)
+    wal      WAL 저널, 같은 파일을 읽고 씀 (백엔드가 연결할 때 설정하는 방식)
+    replace  크롤러는 별도 파일에 쓰고 백업 API 복사본으로 배포 파일을 교체 (publish --copy-to)
+             읽는 쪽은 파일이 바뀌면 다시 연결 (storage.database_interface와 같은 방식)
+
+원본 DB는 건드리지 않고 저장 방식별로 임시 디렉토리에 복사하여 측정
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, DB_FILENAME, LOAD_TEST_MODES, LOAD_TEST_READERS, LOAD_TEST_DURATION_SECONDS,
+    LOAD_TEST_WRITE_INTERVAL_SECONDS, LOAD_TEST_BUSY_TIMEOUT_MS
+)
+from storage import exporter
+
+# 조회 종류별 비율 (에이전트는 대부분 상품 검색, 일부 상세/리뷰 조회)
+QUERY_MIX = (('search', 0.7), ('product', 0.2), ('reviews', 0.1))
+
+# searchProducts 필터별 사용 확률
+SEARCH_FILTER_PROBABILITY = {
+    'name': 0.2, 'brand': 0.3, 'category': 0.1, 'price': 0.3, 'rank': 0.2, 'ingredients': 0.15,
+}
+SEARCH_ORDERS = (None, 'price', 'rank', 'rating', 'name')
+
+# searchProducts 조건 (백엔드와 같은 순서): (필터 이름, SQL 조건, LIKE 패턴 여부)
+SEARCH_CONDITIONS = (
+    ('name', 'name LIKE ?', True),
+    ('min_rank', 'rank >= ?', False),
+    ('max_rank', 'rank <= ?', False),
+    ('category', 'category LIKE ?', True),
+    ('brand', 'brand LIKE ?', True),
+    ('min_price', 'price >= ?', False),
+    ('max_price', 'price <= ?', False),
+    ('ingredients', 'ingredients LIKE ?', True),
+)
+# 후처리로 정규화 성분 테이블이 있으면 백엔드는 성분 조건을 이것으로 바꿈 (공백 제거 후 LIKE)
+NORMALIZED_INGREDIENT_CONDITION = '''EXISTS (SELECT 1 FROM product_ingredients pi
+                     JOIN ingredient_dictionary d ON d.ingredient_id = pi.ingredient_id
+                     WHERE pi.goods_no = products.goods_no AND d.name LIKE ?)'''
+
+# 압축 해제는 백엔드 프로세스 안에서 하므로 SQL 조회 시간만 측정
+REVIEWS_SQL = '''
+    SELECT r.codec, r.dict_id, r.body FROM product_reviews pr
+    JOIN reviews r ON r.review_hash = pr.review_hash
+    WHERE pr.goods_no = ?
+    ORDER BY pr.position
+'''
+
+
+def search_products_sql(filters: Dict[str, Any], limit: int = 10, offset: int = 0,
+                        normalized_ingredients: bool = False) -> Tuple[str, List[Any]]:
+    """
+    백엔드 DBInterface.searchProducts와 같은 SQL을 만듭니다 (조건 순서와 LIKE 패턴 포함).
+    normalized_ingredients가 True이면 성분 조건은 정규화 성분 테이블을 사용합니다.
+    """
+    query = 'SELECT * FROM products WHERE 1=1'
+    params: List[Any] = []
+    for name, condition, like in SEARCH_CONDITIONS:
+        value = filters.get(name)
+        if not (value if like else value is not None):
+            continue
+        if name == 'ingredients' and normalized_ingredients:
+            query += f' AND {NORMALIZED_INGREDIENT_CONDITION}'
+            params.append(f"%{''.join(str(value).split())}%")
+            continue
+        query += f' AND {condition}'
+        params.append(f'%{value}%' if like else value)
+
+    if filters.get('order_by'):
+        direction = 'DESC' if filters.get('order_direction') == 'desc' else 'ASC'
+        query += f" ORDER BY {filters['order_by']} {direction}"
+    else:
+        query += ' ORDER BY rating DESC, id ASC'
+    query += ' LIMIT ? OFFSET ?'
+    params += [limit, offset]
+    return query, params
+
+
+class Workload:
+    """원본 DB의 실제 값(브랜드, 상품명 단어, 성분, 가격대)으로 조회를 무작위 생성하는 클래스"""
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: 값을 뽑을 SQLite 파일 경로
+        """
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            rows = conn.execute('SELECT id, name, brand, category, price, rank, ingredients FROM products').fetchall()
+            has_reviews = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_reviews'"
+            ).fetchone()
+            self.reviewed = [row[0] for row in conn.execute(
+                'SELECT DISTINCT goods_no FROM product_reviews'
+            )] if has_reviews else []
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            self.normalized_ingredients = {'product_ingredients', 'ingredient_dictionary'} <= tables
+        finally:
+            conn.close()
+        if not rows:
+            raise ValueError(f"상품이 없는 DB입니다: {db_path}")
+
+        self.ids = [row[0] for row in rows]
+        self.brands = sorted({row[2] for row in rows if row[2]})
+        self.categories = sorted({row[3] for row in rows if row[3]})
+        self.name_words = sorted({word for row in rows for word in (row[1] or '').split() if len(word) >= 2})
+        self.prices = sorted(row[4] for row in rows if row[4])
+        self.max_rank = max((row[5] or 0 for row in rows), default=0) or len(rows)
+        ingredients = set()
+        for row in rows:
+            try:
+                ingredients.update(json.loads(row[6] or '[]')[:5])
+            except (TypeError, ValueError):
+                pass
+        self.ingredients = sorted(ingredients)
+        self.mix = [(kind, weight) for kind, weight in QUERY_MIX if kind != 'reviews' or self.reviewed]
+
+    def _search_filters(self, rng: random.Random) -> Dict[str, Any]:
+        """searchProducts 필터를 무작위로 고릅니다"""
+        filters: Dict[str, Any] = {}
+        chance = SEARCH_FILTER_PROBABILITY
+        if self.name_words and rng.random() < chance['name']:
+            filters['name'] = rng.choice(self.name_words)
+        if self.brands and rng.random() < chance['brand']:
+            filters['brand'] = rng.choice(self.brands)
+        if self.categories and rng.random() < chance['category']:
+            filters['category'] = rng.choice(self.categories)
+        if self.prices and rng.random() < chance['price']:
+            low, high = sorted(rng.sample(self.prices, 2) if len(self.prices) > 1 else self.prices * 2)
+            filters['min_price'], filters['max_price'] = low, high
+        if rng.random() < chance['rank']:
+            filters['max_rank'] = rng.randint(1, self.max_rank)
+        if self.ingredients and rng.random() < chance['ingredients']:
+            filters['ingredients'] = rng.choice(self.ingredients)
+        order_by = rng.choice(SEARCH_ORDERS)
+        if order_by:
+            filters['order_by'] = order_by
+            filters['order_direction'] = rng.choice(('asc', 'desc'))
+        return filters
+
+    def next_query(self, rng: random.Random) -> Tuple[str, str, List[Any]]:
+        """다음 조회를 만듭니다: (종류, SQL, 파라미터)"""
+        kind = rng.choices([kind for kind, _ in self.mix], weights=[weight for _, weight in self.mix])[0]
+        if kind == 'search':
+            sql, params = search_products_sql(self._search_filters(rng), limit=10,
+                                              normalized_ingredients=self.normalized_ingredients)
+            return kind, sql, params
+        if kind == 'product':
+            return kind, 'SELECT * FROM products WHERE id = ?', [rng.choice(self.ids)]
+        return kind, REVIEWS_SQL, [rng.choice(self.reviewed)]
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """SQLITE_BUSY/SQLITE_LOCKED 오류인지 확인합니다"""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def _reader(index: int, db_path: str, reopen: bool, workload: Workload, busy_timeout_ms: float,
+            think_ms: float, start_at: float, deadline: float, seed: int, results) -> None:
+    """
+    읽기 프로세스: deadline까지 조회를 반복하고 결과를 results 큐로 보냅니다.
+    reopen이 True이면 파일이 교체될 때마다 다시 연결합니다 (replace 방식).
+    """
+    rng = random.Random(seed * 1000 + index)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    busy = errors = reopens = 0
+    error_messages: Dict[str, int] = defaultdict(int)
+
+    def connect():
+        stat = os.stat(db_path)
+        return sqlite3.connect(db_path, timeout=busy_timeout_ms / 1000), (stat.st_dev, stat.st_ino)
+
+    conn, file_id = connect()
+    time.sleep(max(0.0, start_at - time.time()))
+    try:
+        while time.time() < deadline:
+            if reopen:
+                try:
+                    stat = os.stat(db_path)
+                    if (stat.st_dev, stat.st_ino) != file_id:
+                        conn.close()
+                        conn, file_id = connect()
+                        reopens += 1
+                except FileNotFoundError:
+                    pass  # 교체 중 잠시 없는 경우 기존 연결 계속 사용
+
+            kind, sql, params = workload.next_query(rng)
+            started = time.perf_counter()
+            try:
+                conn.execute(sql, params).fetchall()
+                latencies[kind].append((time.perf_counter() - started) * 1000)
+            except sqlite3.OperationalError as e:
+                if _is_busy(e):
+                    busy += 1
+                else:
+                    errors += 1
+                    error_messages[str(e)] += 1
+            except sqlite3.DatabaseError as e:
+                errors += 1
+                error_messages[str(e)] += 1
+            if think_ms:
+                time.sleep(think_ms / 1000)
+    finally:
+        conn.close()
+
+    results.put({'latencies': dict(latencies), 'busy': busy, 'errors': errors, 'reopens': reopens,
+                 'error_messages': dict(error_messages)})
+
+
+def _mutate(products: List[Dict[str, Any]], rng: random.Random):
+    """크롤링할 때처럼 순위 일부를 바꾸고 일부 상품의 가격을 조정합니다"""
+    ranks = [product['rank'] for product in products]
+    window = max(2, len(products) // 10)
+    start = rng.randrange(max(1, len(products) - window + 1))
+    moved = ranks[start:start + window]
+    rng.shuffle(moved)
+    ranks[start:start + window] = moved
+    for product, rank in zip(products, ranks):
+        product['rank'] = rank
+        if product.get('price') and rng.random() < 0.1:
+            product['price'] = int(product['price'] * rng.uniform(0.9, 1.1)) // 10 * 10
+
+
+class LoadTest:
+    """저장 방식별로 DB를 준비하고 읽기 프로세스와 쓰기 주기를 함께 실행하는 클래스"""
+
+    def __init__(self, source: Path, readers: int = LOAD_TEST_READERS,
+                 duration: float = LOAD_TEST_DURATION_SECONDS,
+                 write_interval: float = LOAD_TEST_WRITE_INTERVAL_SECONDS,
+                 busy_timeout_ms: float = LOAD_TEST_BUSY_TIMEOUT_MS, think_ms: float = 0.0,
+                 process: bool = True, write: bool = True, seed: int = 0):
+        """
+        Args:
+            source: 원본 products.db 경로 (읽기만 함)
+            readers: 읽기 프로세스 수
+            duration: 저장 방식별 측정 시간 (초)
+            write_interval: 쓰기 주기 사이 대기 시간 (초)
+            busy_timeout_ms: 읽기 커넥션의 busy 대기 시간 (ms)
+            think_ms: 읽기 프로세스의 조회 사이 대기 시간 (ms, 0이면 쉬지 않고 조회)
+            process: 쓰기 주기마다 후처리(DataProcessor)도 실행할지 여부
+            write: False이면 쓰기 없이 읽기만 측정 (기준값)
+            seed: 조회/변경 생성 시드
+        """
+        self.source = Path(source)
+        if not self.source.exists():
+            raise FileNotFoundError(f"SQLite 데이터베이스가 없습니다: {self.source}")
+        self.readers = readers
+        self.duration = duration
+        self.write_interval = write_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.think_ms = think_ms
+        self.process = process
+        self.write = write
+        self.seed = seed
+        self.workload = Workload(self.source)
+        self.products = exporter.load_from_sqlite(self.source.name, str(self.source.parent))
+
+    def _prepare(self, mode: str, work_dir: Path) -> Tuple[Path, Path]:
+        """
+        저장 방식에 맞게 원본을 복사합니다.
+
+        Returns:
+            (크롤러가 쓰는 DB, 읽기 프로세스가 읽는 DB)
+        """
+        work_db = exporter.copy_database(self.source, work_dir / DB_FILENAME)
+        conn = sqlite3.connect(work_db)
+        try:
+            conn.execute(f"PRAGMA journal_mode = {'WAL' if mode == 'wal' else 'DELETE'}")
+        finally:
+            conn.close()
+        if mode != 'replace':
+            return work_db, work_db
+        return work_db, exporter.copy_database(work_db, work_dir / 'published' / DB_FILENAME)
+
+    def _write_cycle(self, work_db: Path, published: Path, rng: random.Random) -> Optional[str]:
+        """
+        크롤러 저장 경로를 한 번 실행합니다 (저장 → 후처리 → replace 방식이면 배포 파일 교체).
+
+        Returns:
+            실패하면 오류 메시지, 성공하면 None
+        """
+        _mutate(self.products, rng)
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                if exporter.save_to_sqlite(self.products, db_path=work_db.name,
+                                           output_dir=str(work_db.parent)) is None:
+                    return output.getvalue().strip() or 'save_to_sqlite 실패'
+                if self.process:
+                    from scripts.data_processor import DataProcessor
+                    DataProcessor(str(work_db)).process()
+            if published != work_db:
+                exporter.copy_database(work_db, published)
+        except sqlite3.Error as e:
+            return str(e)
+        return None
+
+    def run_mode(self, mode: str, work_root: Path) -> Dict[str, Any]:
+        """저장 방식 하나를 측정하고 결과를 반환합니다"""
+        if mode not in LOAD_TEST_MODES:
+            raise ValueError(f"지원하지 않는 저장 방식: {mode} (사용 가능: {', '.join(LOAD_TEST_MODES)})")
+        work_db, published = self._prepare(mode, work_root / mode)
+
+        context = multiprocessing.get_context()
+        results = context.Queue()
+        start_at = time.time() + 1.0  # 읽기 프로세스가 모두 연결할 때까지 대기
+        deadline = start_at + self.duration
+        processes = [
+            context.Process(target=_reader, args=(
+                index, str(published), mode == 'replace', self.workload, self.busy_timeout_ms,
+                self.think_ms, start_at, deadline, self.seed, results,
+            ), daemon=True)
+            for index in range(self.readers)
+        ]
+        for process in processes:
+            process.start()
+
+        rng = random.Random(self.seed)
+        write_times: List[float] = []
+        write_failures: Dict[str, int] = defaultdict(int)
+        time.sleep(max(0.0, start_at - time.time()))
+        while self.write and time.time() < deadline:
+            started = time.perf_counter()
+            failure = self._write_cycle(work_db, published, rng)
+            if failure:
+                write_failures[failure] += 1
+            else:
+                write_times.append(time.perf_counter() - started)
+            time.sleep(max(0.0, min(self.write_interval, deadline - time.time())))
+        time.sleep(max(0.0, deadline - time.time()))
+
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        return self._summarize(mode, reports, write_times, write_failures)
+
+    def _summarize(self, mode: str, reports: List[Dict[str, Any]], write_times: List[float],
+                   write_failures: Dict[str, int]) -> Dict[str, Any]:
+        """읽기 프로세스 결과를 합쳐 저장 방식별 결과를 만듭니다"""
+        by_kind: Dict[str, List[float]] = defaultdict(list)
+        error_messages: Dict[str, int] = defaultdict(int)
+        for report in reports:
+            for kind, values in report['latencies'].items():
+                by_kind[kind].extend(values)
+            for message, count in report['error_messages'].items():
+                error_messages[message] += count
+        latencies = [value for values in by_kind.values() for value in values]
+        busy = sum(report['busy'] for report in reports)
+        attempts = len(latencies) + busy + sum(report['errors'] for report in reports)
+
+        return {
+            'mode': mode,
+            'readers': self.readers,
+            'seconds': self.duration,
+            'queries': len(latencies),
+            'qps': round(len(latencies) / self.duration, 1),
+            'p50_ms': _percentile(latencies, 50),
+            'p99_ms': _percentile(latencies, 99),
+            'max_ms': round(max(latencies), 3) if latencies else None,
+            'busy': busy,
+            'busy_rate': round(busy / attempts, 4) if attempts else 0.0,
+            'errors': sum(report['errors'] for report in reports),
+            'error_messages': dict(error_messages),
+            'reopens': sum(report['reopens'] for report in reports),
+            'by_kind': {
+                kind: {'queries': len(values), 'p50_ms': _percentile(values, 50), 'p99_ms': _percentile(values, 99)}
+                for kind, values in sorted(by_kind.items())
+            },
+            'writes': len(write_times),
+            'write_failures': dict(write_failures),
+            'write_p50_s': round(_percentile(write_times, 50) or 0.0, 3),
+        }
+
+    def run(self, modes: List[str], work_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+        """저장 방식을 차례로 측정합니다 (복사본은 임시 디렉토리에 만들고 끝나면 삭제)"""
+        results = []
+        if work_dir:
+            Path(work_dir).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=work_dir) as temp_dir:
+            for mode in modes:
+                print(f"⏱️  {mode}: 읽기 프로세스 {self.readers}개, {self.duration:.0f}초 "
+                      f"({'쓰기 주기 ' + format(self.write_interval, 'g') + '초' if self.write else '쓰기 없음'})")
+                results.append(self.run_mode(mode, Path(temp_dir)))
+        return results
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    """nearest-rank 방식 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, -(-len(ordered) * percent // 100) - 1))
+    return round(ordered[int(index)], 3)
+
+
+def print_report(results: List[Dict[str, Any]]):
+    """저장 방식별 결과 표를 출력합니다"""
+    def ms(value: Optional[float]) -> str:
+        return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+    # 한글은 터미널에서 두 칸을 차지하므로 표 머리글은 영문으로 정렬
+    print(f"\n📊 {'mode':<8} {'qps':>9} {'p50ms':>8} {'p99ms':>8} {'maxms':>8} "
+          f"{'busy':>7} {'error':>5} {'write':>5} {'fail':>5} {'write_p50s':>10}")
+    for result in results:
+        print(f"   {result['mode']:<8} {result['qps']:>9.1f} {ms(result['p50_ms'])} {ms(result['p99_ms'])} "
+              f"{ms(result['max_ms'])} {result['busy']:>7} {result['errors']:>5} {result['writes']:>5} "
+              f"{sum(result['write_failures'].values()):>5} {result['write_p50_s']:>10.3f}")
+    for result in results:
+        kinds = ', '.join(f"{kind} {entry['queries']}회 p99 {entry['p99_ms']}ms"
+                          for kind, entry in result['by_kind'].items())
+        print(f"   - {result['mode']}: {kinds}" + (f", 재연결 {result['reopens']}회" if result['reopens'] else ''))
+        for message, count in list(result['error_messages'].items()) + list(result['write_failures'].items()):
+            print(f"     ❌ {message} ({count}회)")
+
+
+def main():
+    """부하 테스트 실행 함수"""
+    parser = argparse.ArgumentParser(description='products.db 동시 읽기/쓰기 부하 테스트 (저장 방식별 지연 시간, busy 오류, 처리량)')
+    parser.add_argument('--db', type=str, default=None,
+                        help=f'원본 SQLite 파일 경로 (복사하여 사용, 기본값: {OUTPUT_DIR}/{DB_FILENAME})')
+    parser.add_argument('--modes', nargs='+', choices=LOAD_TEST_MODES, default=list(LOAD_TEST_MODES),
+                        help=f"측정할 저장 방식 (기본값: {' '.join(LOAD_TEST_MODES)})")
+    parser.add_argument('--readers', type=int, default=LOAD_TEST_READERS,
+                        help=f'읽기 프로세스 수 (기본값: {LOAD_TEST_READERS})')
+    parser.add_argument('--duration', type=float, default=LOAD_TEST_DURATION_SECONDS,
+                        help=f'저장 방식별 측정 시간 (초, 기본값: {LOAD_TEST_DURATION_SECONDS})')
+    parser.add_argument('--write-interval', type=float, default=LOAD_TEST_WRITE_INTERVAL_SECONDS,
+                        help=f'쓰기 주기 사이 대기 시간 (초, 기본값: {LOAD_TEST_WRITE_INTERVAL_SECONDS})')
+    parser.add_argument('--busy-timeout-ms', type=float, default=LOAD_TEST_BUSY_TIMEOUT_MS,
+                        help=f'읽기 커넥션의 busy 대기 시간 (ms, 기본값: {LOAD_TEST_BUSY_TIMEOUT_MS})')
+    parser.add_argument('--think-ms', type=float, default=0.0,
+                        help='읽기 프로세스의 조회 사이 대기 시간 (ms, 기본값: 0)')
+    parser.add_argument('--no-process', action='store_true', help='쓰기 주기에서 후처리를 생략 (저장만)')
+    parser.add_argument('--readers-only', action='store_true', help='쓰기 없이 읽기만 측정 (기준값)')
+    parser.add_argument('--seed', type=int, default=0, help='조회/변경 생성 시드 (기본값: 0)')
+    parser.add_argument('--work-dir', type=str, default=None, help='DB 복사본을 만들 디렉토리 (기본값: 시스템 임시 디렉토리)')
+    parser.add_argument('--json', type=str, default=None, help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    load_test = LoadTest(
+        Path(args.db) if args.db else Path(OUTPUT_DIR) / DB_FILENAME,
+        readers=args.readers, duration=args.duration, write_interval=args.write_interval,
+        busy_timeout_ms=args.busy_timeout_ms, think_ms=args.think_ms,
+        process=not args.no_process, write=not args.readers_only, seed=args.seed,
+    )
+    results = load_test.run(args.modes, args.work_dir)
+    print_report(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
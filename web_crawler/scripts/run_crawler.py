@@ -2,34 +2,71 @@
 """
 웹 크롤러 메인 실행 스크립트
 올리브영 스킨케어 데이터를 크롤링하고 CSV 및 SQLite에 저장
+
+하위 명령:
+    rank     랭킹 목록만 수집하여 저장 (기존 성분/상세 정보와 리뷰는 유지)
+    enrich   저장된 상품의 상세 정보(성분, 리뷰) 추출 (Selenium)
+    reextract 보관된 페이지 스냅샷에서 상세 정보를 다시 추출 (브라우저 없이)
+    export   저장된 SQLite 데이터를 CSV로 내보내기
+    changes  버전 N 이후의 상품 변경 내역을 NDJSON으로 내보내기
+    publish  후처리 테이블 갱신 후 배포 경로로 DB 복사
+    bench    가벼운 명령의 콜드 스타트 시간 측정
+    browser  상주 브라우저 서비스 시작/종료/상태 확인
+하위 명령 없이 실행하면 이전과 같이 전체 크롤링(랭킹 + 상세 정보 + 후처리)을 수행
+--profile을 주면 단계별 프로파일을 출력 디렉토리의 profiles/에 저장 (core.profiling)
+
+cron에서 자주 실행되는 명령의 시작 시간을 줄이기 위해 무거운 의존성(selenium, bs4,
+requests, numpy/scipy, Pillow)은 해당 명령 함수 안에서만 import
 """
 
-import sys
-import os
-import json
 import argparse
+import sys
 
-# 프로젝트 루트를 Python 경로에 추가
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, CSV_FILENAME, DB_FILENAME, MAX_REVIEWS_DEFAULT, SELENIUM_TABS_DEFAULT, SELENIUM_TAB_MEMORY_BUDGET_MB,
+    HTTP_TRANSPORT_DEFAULT, ENRICH_TIME_BUDGET_SECONDS, PROFILE_DIR
+)
 
-from core.spider import WebSpider
-from core.selenium_extractor import SeleniumProductExtractor
+# core.transport를 import하지 않고 선택지만 정의 (requests/httpx import 지연)
+TRANSPORT_CHOICES = ('auto', 'requests', 'httpx')
+PROFILE_CHOICES = ('sample', 'cprofile')
 
-def main():
-    """메인 실행 함수"""
-    parser = argparse.ArgumentParser(description='올리브영 스킨케어 상품 크롤러')
-    parser.add_argument('--max-pages', type=int, default=1,
-                       help='크롤링할 최대 페이지 수 (기본값: 1)')
-    parser.add_argument('--output-dir', type=str, default='output',
-                       help='출력 디렉토리 (기본값: output)')
-    parser.add_argument('--no-detailed', action='store_true',
-                       help='상세 정보 추출 비활성화 (기본적으로 켜져있음)')
-    parser.add_argument('--max-reviews', type=int, default=10,
-                       help='상품당 최대 리뷰 수 (기본값: 10)')
 
-    args = parser.parse_args()
+def _browser_service(args):
+    """--browser-service 옵션이 있으면 출력 디렉토리 기준의 상주 브라우저 서비스를 반환합니다 (점검/실행은 추출기가 담당)"""
+    if not args.browser_service:
+        return None
+    from core.browser_service import BrowserService
+    return BrowserService(output_dir=args.output_dir)
+
+
+def _snapshot_archive(args):
+    """--snapshot 옵션이 있으면 렌더링된 페이지를 보관할 SnapshotArchive를 반환합니다"""
+    if not args.snapshot:
+        return None
+    from pathlib import Path
+    from storage.snapshot_archive import SnapshotArchive
+    return SnapshotArchive(str(Path(args.output_dir) / DB_FILENAME))
+
+
+def _profiler(args):
+    """--profile 옵션에 따라 단계별 프로파일러를 만듭니다 (옵션이 없으면 아무것도 하지 않는 프로파일러)"""
+    from pathlib import Path
+
+    from core.profiling import Profiler
+    output_dir = Path(args.output_dir) / Path(PROFILE_DIR).relative_to(OUTPUT_DIR)
+    return Profiler(getattr(args, 'profile', None), output_dir=str(output_dir),
+                    browser_timing=getattr(args, 'profile_browser', False))
+
+
+def run_pipeline(args) -> int:
+    """하위 명령 없이 실행했을 때의 전체 크롤링 (이전 동작)"""
+    from pathlib import Path
+
+    from core.spider import WebSpider
+    from core.selenium_extractor import SeleniumProductExtractor
+    from scripts.data_processor import DataProcessor
 
     # 상세 정보 추출이 기본적으로 켜져있으며, --no-detailed 플래그로 끄기 가능
     args.detailed = not args.no_detailed
@@ -40,55 +77,462 @@ def main():
     print(f"🔍 상세 정보 추출: {'켜짐' if args.detailed else '꺼짐'}")
     print("-" * 50)
 
-    try:
-        # WebSpider 인스턴스 생성
-        spider = WebSpider()
+    profiler = args.profiler
+
+    # WebSpider 인스턴스 생성
+    spider = WebSpider(transport=args.transport, output_dir=args.output_dir)
+
+    # 크롤링 실행
+    with profiler.stage('crawl'):
+        products = spider.crawl_products(max_pages=args.max_pages)
+
+    # 상세 정보 추출 (선택적)
+    if args.detailed and products:
+        print(f"\n🔍 상세 정보 (성분, 리뷰) 추출 중... (Selenium)")
+        print(f"   - 상품당 최대 리뷰 수: {args.max_reviews}")
 
-        # 크롤링 실행
+        try:
+            with profiler.stage('enrich'), \
+                    SeleniumProductExtractor(headless=True, browser_service=_browser_service(args),
+                                             snapshot_archive=_snapshot_archive(args),
+                                             profiler=profiler, output_dir=args.output_dir) as extractor:
+                # 모든 상품에 대해 상세 정보 추출
+                enriched_products = extractor.batch_extract_details(
+                    products,
+                    max_reviews=args.max_reviews,
+                    tabs=args.tabs,
+                    memory_budget_mb=args.memory_budget_mb
+                )
+                # 상세 정보가 추가된 상품으로 교체
+                products = enriched_products
+            print("✅ 상세 정보 추출 완료!")
+        except Exception as e:
+            print(f"❌ 상세 정보 추출 실패: {e}")
+            print("📝 기본 정보만으로 진행합니다.")
+
+    # 결과 저장
+    with profiler.stage('save'):
+        spider.save_to_csv(products)
+        spider.save_to_sqlite(products)
+
+    # 에이전트용 집계 테이블 갱신 (변경된 상품만 재계산)
+    if products:
+        with profiler.stage('process'):
+            DataProcessor(str(Path(args.output_dir) / DB_FILENAME)).process()
+
+    print(f"\n✅ 크롤링 완료! 총 {len(products)}개 상품 수집")
+
+    if products:
+        print("\n📊 저장된 파일:")
+        print(f"   - CSV: web_crawler/{args.output_dir}/products.csv")
+        print(f"   - SQLite: web_crawler/{args.output_dir}/products.db")
+
+        if args.detailed:
+            print("   ✅ 성분 정보 포함됨")
+            print(f"   ✅ 상품당 최대 {args.max_reviews}개 리뷰 포함됨")
+
+    print("\n🎉 크롤러 실행 완료!")
+    return 0
+
+
+def cmd_rank(args) -> int:
+    """랭킹 목록만 크롤링하여 저장합니다 (상세 정보가 없는 상품은 기존 값 유지)"""
+    from core.spider import WebSpider
+
+    print(f"🐛 랭킹 수집 시작 (최대 {args.max_pages}페이지)")
+    spider = WebSpider(transport=args.transport, output_dir=args.output_dir)
+    with args.profiler.stage('crawl'):
         products = spider.crawl_products(max_pages=args.max_pages)
+    if not products:
+        print("❌ 수집된 상품이 없어 기존 데이터를 유지합니다.")
+        return 1
+
+    with args.profiler.stage('save'):
+        spider.save_to_sqlite(products, preserve_details=True)
+    print(f"✅ 랭킹 수집 완료: {len(products)}개 상품")
+    return 0
+
 
-        # 상세 정보 추출 (선택적)
-        if args.detailed and products:
-            print(f"\n🔍 상세 정보 (성분, 리뷰) 추출 중... (Selenium)")
-            print(f"   - 상품당 최대 리뷰 수: {args.max_reviews}")
+def cmd_enrich(args) -> int:
+    """
+    저장된 상품의 상세 정보(성분, 리뷰)를 Selenium으로 추출합니다.
+    순위/경과 시간/변경 여부로 정한 우선순위 순서로 처리하고, 상품마다 바로 커밋합니다.
+    """
+    import time
 
+    from core.enrichment_scheduler import EnrichmentScheduler
+    from storage import exporter
 
+    with EnrichmentScheduler(output_dir=args.output_dir) as scheduler:
+        with args.profiler.stage('plan'):
+            scheduler.ensure_products_schema()
+            products = exporter.load_from_sqlite(output_dir=args.output_dir, include_reviews=False)
+            targets = scheduler.plan(products, missing_only=args.missing_only, limit=args.limit)
+        if not targets:
+            print("✅ 상세 정보를 추출할 상품이 없습니다.")
+            return 0
+
+        from core.selenium_extractor import SeleniumProductExtractor
+
+        budget = f"{args.time_budget:.0f}초" if args.time_budget else "제한 없음"
+        print(f"🔍 상세 정보 추출 중... {len(targets)}/{len(products)}개 상품 "
+              f"(상품당 최대 리뷰 {args.max_reviews}개, 시간 예산 {budget})")
+        deadline = time.monotonic() + args.time_budget if args.time_budget else None
+        with args.profiler.stage('enrich'), \
+                SeleniumProductExtractor(headless=True, browser_service=_browser_service(args),
+                                         snapshot_archive=_snapshot_archive(args),
+                                         profiler=args.profiler, output_dir=args.output_dir) as extractor:
+            extractor.batch_extract_details(targets, max_reviews=args.max_reviews, tabs=args.tabs,
+                                            memory_budget_mb=args.memory_budget_mb,
+                                            on_result=scheduler.commit, deadline=deadline)
+
+        print(f"✅ 상세 정보 추출 완료! 저장 {scheduler.committed}개 (내용 변경 {scheduler.changed}개), "
+              f"실패 {scheduler.failed}개, 미처리 {len(targets) - scheduler.committed - scheduler.failed}개")
+    return 0
+
+
+def cmd_reextract(args) -> int:
+    """
+    보관된 페이지 스냅샷을 프로세스 풀에서 다시 파싱하여 상세 정보/리뷰를 갱신합니다.
+    테이블 파싱이나 리뷰 탐색 로직을 고친 뒤 브라우저 없이 전체 상품에 적용할 때 사용합니다.
+    """
+    import json
+    import os
+    import sqlite3
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from pathlib import Path
+
+    from core.parser import reextract_page
+    from storage import exporter
+    from storage.snapshot_archive import SnapshotArchive
+
+    db_path = Path(args.output_dir) / DB_FILENAME
+    if not db_path.exists():
+        print(f"❌ SQLite 데이터베이스가 없습니다: {db_path}")
+        return 1
+
+    with SnapshotArchive(str(db_path)) as archive:
+        snapshots = [snapshot for snapshot in archive.latest() if snapshot['documents']]
+    if args.limit is not None:
+        snapshots = snapshots[:args.limit]
+    if not snapshots:
+        print("❌ 보관된 페이지 스냅샷이 없습니다. enrich --snapshot으로 먼저 보관해주세요.")
+        return 1
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"♻️  스냅샷 {len(snapshots)}개 재추출 중... (프로세스 {workers}개)")
+    started = time.monotonic()
+    results = {}
+    with args.profiler.stage('parse'), ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(reextract_page, snapshot['documents'],
+                            args.max_reviews or snapshot['payload'].get('max_reviews', MAX_REVIEWS_DEFAULT)):
+                snapshot['goods_no']
+            for snapshot in snapshots
+        }
+        for future, goods_no in futures.items():
             try:
-                with SeleniumProductExtractor(headless=True) as extractor:
-                    # 모든 상품에 대해 상세 정보 추출
-                    enriched_products = extractor.batch_extract_details(
-                        products,
-                        max_reviews=args.max_reviews
-                    )
-                    # 상세 정보가 추가된 상품으로 교체
-                    products = enriched_products
-                print("✅ 상세 정보 추출 완료!")
+                results[goods_no] = future.result()
             except Exception as e:
-                print(f"❌ 상세 정보 추출 실패: {e}")
-                print("📝 기본 정보만으로 진행합니다.")
+                print(f"   ❌ 재추출 실패 ({goods_no}): {e}")
+    parse_seconds = time.monotonic() - started
 
-        # 결과 저장
-        spider.save_to_csv(products)
-        spider.save_to_sqlite(products)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    changed = updated = 0
+    try:
+        current = {
+            goods_no: (ingredients, additional_info)
+            for goods_no, ingredients, additional_info in conn.execute(
+                'SELECT goods_no, ingredients, additional_info FROM products WHERE goods_no IS NOT NULL'
+            )
+        }
+        with args.profiler.stage('save'):
+            conn.execute('BEGIN IMMEDIATE')
+            for goods_no, result in results.items():
+                if goods_no not in current:
+                    continue  # 랭킹에서 빠진 상품
+                detail_info = result['detail_info']
+                if detail_info:
+                    ingredients, additional_info = current[goods_no]
+                    if (json.loads(ingredients or '[]'), json.loads(additional_info or '{}')) != \
+                            (detail_info['ingredients'], detail_info['full_info']):
+                        changed += 1
+                if detail_info or result['reviews']:
+                    exporter.update_product_details(conn, goods_no, detail_info, result['reviews'])
+                    updated += 1
+            conn.execute('ROLLBACK' if args.dry_run else 'COMMIT')
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+    action = "변경 예정" if args.dry_run else "갱신"
+    print(f"✅ 재추출 완료: {len(results)}개 파싱 {parse_seconds:.1f}초, "
+          f"{action} {updated}개 (상세 정보가 달라진 상품 {changed}개)")
+    return 0
 
-        print(f"\n✅ 크롤링 완료! 총 {len(products)}개 상품 수집")
 
-        if products:
-            print("\n📊 저장된 파일:")
-            print(f"   - CSV: web_crawler/{args.output_dir}/products.csv")
-            print(f"   - SQLite: web_crawler/{args.output_dir}/products.db")
+def cmd_export(args) -> int:
+    """저장된 SQLite 데이터를 CSV로 내보냅니다"""
+    from storage import exporter
 
-            if args.detailed:
-                print("   ✅ 성분 정보 포함됨")
-                print(f"   ✅ 상품당 최대 {args.max_reviews}개 리뷰 포함됨")
+    products = exporter.load_from_sqlite(output_dir=args.output_dir)
+    if not products:
+        return 1
+    filepath = exporter.save_to_csv(products, args.filename, output_dir=args.dest or args.output_dir)
+    return 0 if filepath else 1
 
-        print("\n🎉 크롤러 실행 완료!")
 
+def cmd_changes(args) -> int:
+    """버전 --since 이후의 상품 변경 내역을 NDJSON으로 내보냅니다 (한 줄에 변경 하나, 버전 순)"""
+    import json
+    from pathlib import Path
+
+    from storage.change_log import ChangeLog
+
+    db_path = Path(args.output_dir) / DB_FILENAME
+    if not db_path.exists():
+        print(f"❌ SQLite 데이터베이스가 없습니다: {db_path}")
+        return 1
+
+    with ChangeLog(str(db_path)) as log:
+        if args.current:
+            print(json.dumps({'log_id': log.log_id(), 'version': log.current_version()}))
+            return 0
+        try:
+            if not args.dest:
+                log.export_ndjson(sys.stdout, args.since, args.limit)
+                return 0
+            with open(args.dest, 'w', encoding='utf-8') as out:
+                count, last_version = log.export_ndjson(out, args.since, args.limit)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    print(f"📤 변경 {count}개 내보내기 완료: {args.dest} (버전 {args.since} → {last_version})")
+    return 0
+
+
+def cmd_publish(args) -> int:
+    """후처리 테이블을 갱신하고, 지정된 경우 배포 경로로 DB를 복사합니다"""
+    from pathlib import Path
+
+    from scripts.data_processor import DataProcessor
+    from storage import exporter
+
+    db_path = Path(args.output_dir) / DB_FILENAME
+    if not db_path.exists():
+        print(f"❌ SQLite 데이터베이스가 없습니다: {db_path}")
+        return 1
+
+    with args.profiler.stage('process'):
+        DataProcessor(str(db_path)).process(full=args.full)
+
+    if args.copy_to:
+        target = exporter.copy_database(db_path, Path(args.copy_to))
+        print(f"📦 배포용 DB 복사 완료: {target}")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """가벼운 명령의 콜드 스타트 시간과 무거운 모듈 import 여부를 측정합니다"""
+    import os
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+    from pathlib import Path
+
+    from config.constants import CLI_COLD_START_BUDGET_MS, CLI_HEAVY_MODULES
+
+    project_root = Path(__file__).resolve().parent.parent
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(project_root), env.get('PYTHONPATH')]))
+    output_dir = str(Path(args.output_dir).resolve())
+    budget = args.budget_ms or CLI_COLD_START_BUDGET_MS
+
+    failed = False
+    with tempfile.TemporaryDirectory() as temp_dir:
+        commands = [
+            ('--help', ['--help']),
+            ('rank --help', ['rank', '--help']),
+            ('enrich --help', ['enrich', '--help']),
+            ('export', ['export', '--output-dir', output_dir, '--dest', temp_dir]),
+            ('changes --current', ['changes', '--current', '--output-dir', output_dir]),
+        ]
+        print(f"⏱️  콜드 스타트 측정 ({args.runs}회, 허용 {budget}ms)")
+        for label, command in commands:
+            base = [sys.executable, '-m', 'scripts.run_crawler'] + command
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run(base, cwd=project_root, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            # -X importtime 출력(stderr)에서 import된 최상위 패키지 수집
+            result = subprocess.run([sys.executable, '-X', 'importtime'] + base[1:], cwd=project_root, env=env,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            imported = set()
+            for line in result.stderr.splitlines():
+                if line.startswith('import time:') and '|' in line:
+                    imported.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+            heavy = sorted(imported & set(CLI_HEAVY_MODULES))
+
+            best, median = min(timings), statistics.median(timings)
+            ok = median <= budget and not heavy
+            failed = failed or not ok
+            print(f"   {'✅' if ok else '❌'} {label:<18} 최소 {best:6.1f}ms / 중앙값 {median:6.1f}ms"
+                  + (f"  무거운 모듈: {', '.join(heavy)}" if heavy else ''))
+
+    return 1 if failed else 0
+
+
+def cmd_browser(args) -> int:
+    """상주 브라우저 서비스를 관리합니다"""
+    from core.browser_service import BrowserService
+
+    service = BrowserService(headless=not args.headful, output_dir=args.output_dir)
+    if args.action == 'start':
+        service.ensure()
+    elif args.action == 'stop':
+        service.stop()
+    elif args.action == 'restart':
+        service.restart()
+
+    status = service.status()
+    print(f"🌐 브라우저 서비스: {'정상' if status['healthy'] else '중지됨'}")
+    for key, value in status.items():
+        print(f"   - {key}: {value}")
+    return 0 if status['healthy'] or args.action == 'stop' else 1
+
+
+def _add_extraction_arguments(parser: argparse.ArgumentParser, suppress: bool = False):
+    """
+    상세 정보 추출(Selenium) 공통 옵션을 추가합니다.
+    하위 명령에서는 suppress=True로 기본값을 SUPPRESS로 두어 상위 옵션 값을 유지합니다.
+    """
+    def default(value):
+        return argparse.SUPPRESS if suppress else value
+
+    parser.add_argument('--tabs', type=int, default=default(SELENIUM_TABS_DEFAULT),
+                        help=f'한 브라우저에서 동시에 사용할 탭 수 (기본값: {SELENIUM_TABS_DEFAULT})')
+    parser.add_argument('--memory-budget-mb', type=float, default=default(SELENIUM_TAB_MEMORY_BUDGET_MB),
+                        help=f'멀티 탭 모드의 브라우저 메모리 상한 (기본값: {SELENIUM_TAB_MEMORY_BUDGET_MB}MB)')
+    parser.add_argument('--snapshot', action='store_true', default=default(False),
+                        help='렌더링된 상세 페이지를 보관하여 reextract로 다시 추출할 수 있게 함')
+    parser.add_argument('--browser-service', action='store_true', default=default(False),
+                        help='상주 브라우저 서비스에 연결하여 상세 정보 추출 (없으면 실행)')
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser, default):
+    """프로파일링 옵션을 추가합니다 (하위 명령에서는 기본값을 SUPPRESS로 두어 상위 옵션 값을 유지)"""
+    parser.add_argument('--profile', nargs='?', const='sample', choices=PROFILE_CHOICES, default=default,
+                        help='단계별 프로파일을 --output-dir의 profiles/에 저장 '
+                             '(sample: 전체 스레드 스택 수집 + collapsed 스택, cprofile: 메인 스레드 결정적 측정)')
+    parser.add_argument('--profile-browser', action='store_true', default=default,
+                        help='--profile과 함께 주입 스크립트의 브라우저 안 실행 시간 기록')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """명령행 파서를 생성합니다"""
+    parser = argparse.ArgumentParser(description='올리브영 스킨케어 상품 크롤러')
+    parser.add_argument('--max-pages', type=int, default=1,
+                       help='크롤링할 최대 페이지 수 (기본값: 1)')
+    parser.add_argument('--output-dir', type=str, default=OUTPUT_DIR,
+                       help=f'출력 디렉토리 (기본값: {OUTPUT_DIR})')
+    parser.add_argument('--no-detailed', action='store_true',
+                       help='상세 정보 추출 비활성화 (기본적으로 켜져있음)')
+    parser.add_argument('--max-reviews', type=int, default=10,
+                       help='상품당 최대 리뷰 수 (기본값: 10)')
+    parser.add_argument('--transport', choices=TRANSPORT_CHOICES, default=HTTP_TRANSPORT_DEFAULT,
+                       help=f'HTTP 전송 계층 (기본값: {HTTP_TRANSPORT_DEFAULT}, httpx가 있으면 HTTP/2)')
+    _add_extraction_arguments(parser)
+    _add_profile_arguments(parser, default=None)
+
+    # 하위 명령 공통 옵션
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--output-dir', type=str, default=argparse.SUPPRESS,
+                        help=f'products.db가 있는 출력 디렉토리 (기본값: {OUTPUT_DIR})')
+    _add_profile_arguments(common, default=argparse.SUPPRESS)
+
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+    rank = subparsers.add_parser('rank', parents=[common], help='랭킹 목록만 수집 (기존 상세 정보 유지)')
+    # 상위 파서와 겹치는 옵션은 SUPPRESS로 두어 `--transport httpx rank`처럼 앞에 준 값이 유지되게 함
+    rank.add_argument('--max-pages', type=int, default=argparse.SUPPRESS,
+                      help='크롤링할 최대 페이지 수 (기본값: 1)')
+    rank.add_argument('--transport', choices=TRANSPORT_CHOICES, default=argparse.SUPPRESS,
+                      help=f'HTTP 전송 계층 (기본값: {HTTP_TRANSPORT_DEFAULT})')
+    rank.set_defaults(handler=cmd_rank)
+
+    enrich = subparsers.add_parser('enrich', parents=[common], help='저장된 상품의 성분/리뷰 추출 (Selenium)')
+    _add_extraction_arguments(enrich, suppress=True)
+    enrich.add_argument('--max-reviews', type=int, default=MAX_REVIEWS_DEFAULT,
+                        help=f'상품당 최대 리뷰 수 (기본값: {MAX_REVIEWS_DEFAULT})')
+    enrich.add_argument('--limit', type=int, default=None, help='우선순위 상위 N개 상품만 처리')
+    enrich.add_argument('--missing-only', action='store_true', help='상세 정보가 없는 상품만 처리')
+    enrich.add_argument('--time-budget', type=float, default=ENRICH_TIME_BUDGET_SECONDS,
+                        help=f'실행 시간 예산 (초, 0이면 제한 없음, 기본값: {ENRICH_TIME_BUDGET_SECONDS})')
+    enrich.set_defaults(handler=cmd_enrich)
+
+    reextract = subparsers.add_parser('reextract', parents=[common],
+                                      help='보관된 페이지 스냅샷에서 상세 정보 재추출 (브라우저 불필요)')
+    reextract.add_argument('--workers', type=int, default=None, help='파싱 프로세스 수 (기본값: CPU 코어 수)')
+    reextract.add_argument('--max-reviews', type=int, default=None,
+                           help='상품당 최대 리뷰 수 (기본값: 스냅샷을 보관할 때의 값)')
+    reextract.add_argument('--limit', type=int, default=None, help='처리할 최대 상품 수')
+    reextract.add_argument('--dry-run', action='store_true', help='DB를 갱신하지 않고 달라지는 상품 수만 확인')
+    reextract.set_defaults(handler=cmd_reextract)
+
+    export = subparsers.add_parser('export', parents=[common], help='저장된 데이터를 CSV로 내보내기')
+    export.add_argument('--dest', type=str, default=None, help='CSV 저장 디렉토리 (기본값: --output-dir)')
+    export.add_argument('--filename', type=str, default=CSV_FILENAME,
+                        help=f'CSV 파일명 (기본값: {CSV_FILENAME})')
+    export.set_defaults(handler=cmd_export)
+
+    changes = subparsers.add_parser('changes', parents=[common], help='상품 변경 내역을 NDJSON으로 내보내기')
+    changes.add_argument('--since', type=int, default=0, help='이 버전 이후의 변경만 내보내기 (기본값: 0)')
+    changes.add_argument('--limit', type=int, default=None, help='최대 변경 수')
+    changes.add_argument('--dest', type=str, default=None, help='NDJSON 파일 경로 (기본값: 표준 출력)')
+    changes.add_argument('--current', action='store_true', help='로그 식별자와 현재 버전만 출력')
+    changes.set_defaults(handler=cmd_changes)
+
+    publish = subparsers.add_parser('publish', parents=[common], help='후처리 테이블 갱신 및 배포용 DB 복사')
+    publish.add_argument('--full', action='store_true', help='증분 갱신 대신 전체 재계산')
+    publish.add_argument('--copy-to', type=str, default=None, help='갱신된 DB를 복사할 경로')
+    publish.set_defaults(handler=cmd_publish)
+
+    bench = subparsers.add_parser('bench', parents=[common], help='가벼운 명령의 콜드 스타트 시간 측정')
+    bench.add_argument('--runs', type=int, default=5, help='명령별 반복 횟수 (기본값: 5)')
+    bench.add_argument('--budget-ms', type=float, default=None, help='허용 시간 (ms)')
+    bench.set_defaults(handler=cmd_bench)
+
+    browser = subparsers.add_parser('browser', parents=[common], help='상주 브라우저 서비스 관리')
+    browser.add_argument('action', choices=['start', 'stop', 'restart', 'status'], help='수행할 작업')
+    browser.add_argument('--headful', action='store_true', help='브라우저 창을 표시하여 실행')
+    browser.set_defaults(handler=cmd_browser)
+
+    return parser
+
+
+def main():
+    """메인 실행 함수"""
+    args = build_parser().parse_args()
+    handler = getattr(args, 'handler', run_pipeline)
+    args.profiler = _profiler(args)
+
+    try:
+        sys.exit(handler(args))
     except KeyboardInterrupt:
         print("\n⏹️  사용자가 크롤링을 중단했습니다.")
     except Exception as e:
         print(f"\n❌ 크롤링 중 오류 발생: {e}")
         sys.exit(1)
+    finally:
+        args.profiler.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,248 @@
+"""
+상품 변경 로그 모듈
+products 테이블을 저장할 때마다 이전 상태와 비교하여 추가/수정/삭제된 상품을 변경 필드와 함께
+단조 증가하는 버전으로 product_changes 테이블에 기록
+(백엔드 캐시나 검색 인덱스가 버전 N 이후의 변경만 읽어 증분 갱신)
+"""
+
+import hashlib
+import json
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from models.data_schema import goods_no_from_url
+# 상수 import
+from config.constants import OUTPUT_DIR, DB_FILENAME
+
+CHANGE_LOG_SCHEMA = [
+    # 상품 단위 변경 기록 (AUTOINCREMENT라 버전이 재사용되지 않음)
+    '''
+    CREATE TABLE IF NOT EXISTS product_changes (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        goods_no TEXT NOT NULL,
+        op TEXT NOT NULL,                   -- 'insert', 'update', 'delete'
+        fields TEXT,                        -- JSON: 변경된 필드의 새 값 (delete는 NULL)
+        previous TEXT,                      -- JSON: 변경된 필드의 이전 값 (insert는 NULL)
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # 로그 식별자 (DB 파일을 새로 만들면 바뀌므로 읽는 쪽에서 버전 초기화를 감지)
+    '''
+    CREATE TABLE IF NOT EXISTS change_log_info (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    ''',
+]
+
+# 변경을 추적하는 products 컬럼 (+ 리뷰 목록 해시 'reviews')
+TRACKED_FIELDS = (
+    'rank', 'name', 'brand', 'price', 'rating', 'category', 'url',
+    'image_url', 'image_path', 'thumbnail_path', 'ingredients', 'additional_info',
+)
+JSON_FIELDS = {'ingredients': list, 'additional_info': dict}
+
+ProductState = Dict[str, Dict[str, Any]]
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    """변경 로그 테이블과 로그 식별자를 준비합니다"""
+    for statement in CHANGE_LOG_SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT OR IGNORE INTO change_log_info (key, value) VALUES ('log_id', ?)", (uuid.uuid4().hex,))
+
+
+def _decode(field: str, value: Any) -> Any:
+    """JSON 컬럼은 파이썬 객체로 비교합니다 (직렬화 형식 차이는 변경으로 보지 않음)"""
+    if field not in JSON_FIELDS:
+        return value
+    try:
+        return json.loads(value) if value else JSON_FIELDS[field]()
+    except (TypeError, ValueError):
+        return JSON_FIELDS[field]()
+
+
+def _review_digests(conn: sqlite3.Connection, goods_nos: Iterable[str]) -> Dict[str, str]:
+    """상품별 리뷰 목록(순서 포함) 해시"""
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_reviews'"
+    ).fetchone()
+    if not has_table:
+        return {}
+    # 요청한 상품의 매핑만 읽음 (PRIMARY KEY (goods_no, position) 인덱스 사용)
+    wanted = list(goods_nos)
+    hashers: Dict[str, Any] = {}
+    for start in range(0, len(wanted), 500):
+        chunk = wanted[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        for goods_no, digest in conn.execute(
+            f'SELECT goods_no, review_hash FROM product_reviews WHERE goods_no IN ({placeholders}) '
+            'ORDER BY goods_no, position', chunk
+        ):
+            hashers.setdefault(goods_no, hashlib.sha1()).update(digest)
+    return {goods_no: hasher.hexdigest() for goods_no, hasher in hashers.items()}
+
+
+def snapshot_products(conn: sqlite3.Connection, goods_nos: Optional[List[str]] = None) -> ProductState:
+    """
+    변경 비교용으로 products 테이블의 추적 필드를 goodsNo 기준으로 읽어옵니다.
+
+    Args:
+        conn: DB 연결 (저장과 같은 트랜잭션 안에서 호출)
+        goods_nos: 지정하면 해당 상품만 읽음
+
+    Returns:
+        goodsNo → {필드: 값} (goods_no 컬럼이 없는 이전 스키마는 URL에서 추출)
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(products)')}
+    if not columns:
+        return {}
+
+    selected = [c for c in TRACKED_FIELDS if c in columns]
+    sql = f'SELECT {", ".join(selected + ["goods_no" if "goods_no" in columns else "NULL"])} FROM products'
+    params: Tuple[str, ...] = ()
+    if goods_nos is not None and 'goods_no' in columns:
+        sql += f' WHERE goods_no IN ({",".join("?" * len(goods_nos))})'
+        params = tuple(goods_nos)
+
+    wanted = set(goods_nos) if goods_nos is not None else None
+    state: ProductState = {}
+    for row in conn.execute(sql, params):
+        values = {field: _decode(field, value) for field, value in zip(selected, row)}
+        goods_no = row[-1] or goods_no_from_url(values.get('url') or '')
+        if not goods_no or (wanted is not None and goods_no not in wanted):
+            continue
+        state[goods_no] = values
+
+    for goods_no, digest in _review_digests(conn, state).items():
+        state[goods_no]['reviews'] = digest
+    return state
+
+
+def record_changes(conn: sqlite3.Connection, before: ProductState, after: ProductState) -> int:
+    """
+    저장 전후 상태를 비교하여 변경 내역을 기록합니다 (트랜잭션은 호출자가 관리).
+    이전 스키마에 없던 필드는 None으로 보고 비교합니다.
+
+    Returns:
+        기록된 변경 수
+    """
+    rows = []
+    for goods_no, new in after.items():
+        old = before.get(goods_no)
+        if old is None:
+            rows.append((goods_no, 'insert', json.dumps(new, ensure_ascii=False), None))
+            continue
+        changed = [field for field in new.keys() | old.keys() if old.get(field) != new.get(field)]
+        if changed:
+            changed.sort()
+            rows.append((goods_no, 'update',
+                         json.dumps({field: new.get(field) for field in changed}, ensure_ascii=False),
+                         json.dumps({field: old.get(field) for field in changed}, ensure_ascii=False)))
+    for goods_no in sorted(before.keys() - after.keys()):
+        rows.append((goods_no, 'delete', None, json.dumps(before[goods_no], ensure_ascii=False)))
+
+    ensure_schema(conn)
+    conn.executemany(
+        'INSERT INTO product_changes (goods_no, op, fields, previous) VALUES (?, ?, ?, ?)', rows
+    )
+    return len(rows)
+
+
+class ChangeLog:
+    """
+    변경 로그 읽기 전용 인터페이스.
+
+    처음 캐시를 만들 때는 current_version()을 먼저 읽은 뒤 전체 데이터를 읽고, 이후에는
+    changes_since(마지막 버전)으로 받은 변경을 적용합니다. 변경에는 새 값이 들어있으므로
+    같은 변경을 다시 적용해도 결과가 같습니다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본값: output/products.db)
+        """
+        self.db_path = Path(db_path) if db_path else Path(OUTPUT_DIR) / DB_FILENAME
+        self.conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True)
+
+    def _has_log(self) -> bool:
+        """변경 로그 테이블이 있는지 확인합니다 (한 번도 저장하지 않은 DB에는 없음)"""
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_changes'"
+        ).fetchone() is not None
+
+    def log_id(self) -> Optional[str]:
+        """로그 식별자 (DB를 새로 만들면 바뀌며, 이때 읽는 쪽은 캐시를 다시 만들어야 함)"""
+        if not self._has_log():
+            return None
+        row = self.conn.execute("SELECT value FROM change_log_info WHERE key = 'log_id'").fetchone()
+        return row[0] if row else None
+
+    def current_version(self) -> int:
+        """마지막 변경 버전 (변경이 없으면 0)"""
+        if not self._has_log():
+            return 0
+        return self.conn.execute('SELECT COALESCE(MAX(version), 0) FROM product_changes').fetchone()[0]
+
+    def iter_changes(self, since: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        버전 since 이후의 변경을 버전 순으로 반환합니다.
+
+        Raises:
+            ValueError: since가 현재 버전보다 큼 (로그가 초기화되어 전체 재구성이 필요)
+        """
+        current = self.current_version()
+        if since > current:
+            raise ValueError(f"버전 {since}이(가) 현재 버전 {current}보다 큽니다. "
+                             f"변경 로그가 초기화되었으므로 전체 데이터를 다시 읽어주세요.")
+        if not current:
+            return
+
+        sql = '''
+            SELECT version, goods_no, op, fields, previous, changed_at
+            FROM product_changes WHERE version > ? ORDER BY version
+        '''
+        params: Tuple[int, ...] = (since,)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        for version, goods_no, op, fields, previous, changed_at in self.conn.execute(sql, params):
+            yield {
+                'version': version,
+                'goods_no': goods_no,
+                'op': op,
+                'fields': json.loads(fields) if fields else None,
+                'previous': json.loads(previous) if previous else None,
+                'changed_at': changed_at,
+            }
+
+    def changes_since(self, since: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """버전 since 이후의 변경 리스트"""
+        return list(self.iter_changes(since, limit))
+
+    def export_ndjson(self, out: TextIO, since: int = 0, limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        버전 since 이후의 변경을 한 줄에 하나씩 JSON으로 씁니다.
+
+        Returns:
+            (변경 수, 마지막 버전) — 다음 호출의 since로 사용
+        """
+        count, last_version = 0, since
+        for change in self.iter_changes(since, limit):
+            out.write(json.dumps(change, ensure_ascii=False) + '\n')
+            count += 1
+            last_version = change['version']
+        return count, last_version
+
+    def close(self):
+        """DB 연결을 종료합니다"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,397 @@
+"""
+상품 DB 읽기 전용 조회 모듈
+정해진 필터/정렬 어휘만 허용하여 SQL을 조립하고(값은 항상 바인딩 파라미터),
+mmap I/O를 켠 읽기 전용 커넥션 풀과 DB data_version 기준으로 무효화되는 LRU 결과 캐시를 제공
+(Python 도구, 벤치마크, 서비스에서 products.db를 직접 SQL로 읽지 않도록 하는 공용 조회 계층)
+"""
+
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from storage.review_store import ReviewStore
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, DB_FILENAME, DB_READ_POOL_SIZE, DB_MMAP_SIZE, DB_QUERY_CACHE_SIZE, DB_QUERY_MAX_LIMIT
+)
+
+# 조회할 수 있는 products 컬럼 (분리 이전 DB의 reviews 컬럼은 제외)
+PRODUCT_COLUMNS = (
+    'id', 'goods_no', 'rank', 'name', 'brand', 'price', 'rating', 'category', 'url',
+    'image_url', 'image_path', 'thumbnail_path', 'ingredients', 'additional_info', 'created_at',
+)
+DEFAULT_COLUMNS = ('id', 'goods_no', 'rank', 'name', 'brand', 'price', 'rating', 'category', 'url', 'thumbnail_path')
+# 후처리(publish)가 만든 상품 요약 (product_summaries를 LEFT JOIN, 요약이 없으면 None)
+SUMMARY_COLUMNS = {'summary': 's.summary', 'summary_text': 's.text'}
+JSON_COLUMNS = {'ingredients': list, 'additional_info': dict, 'summary': dict}
+
+# 필터 이름 → (SQL 조건, 값 변환 함수)
+FILTERS = {
+    'id': ('p.id = ?', int),
+    'goods_no': ('p.goods_no = ?', str),
+    'name': ('p.name LIKE ?', lambda value: f'%{value}%'),
+    'brand': ('p.brand LIKE ?', lambda value: f'%{value}%'),
+    'category': ('p.category LIKE ?', lambda value: f'%{value}%'),
+    'min_rank': ('p.rank >= ?', int),
+    'max_rank': ('p.rank <= ?', int),
+    'min_price': ('p.price >= ?', int),
+    'max_price': ('p.price <= ?', int),
+    'min_rating': ('p.rating >= ?', float),
+    'max_rating': ('p.rating <= ?', float),
+    # 후처리(publish)가 정규화한 성분 목록으로 비교 (성분명 공백 차이 무시)
+    'ingredient': ('EXISTS (SELECT 1 FROM product_ingredients pi '
+                   'JOIN ingredient_dictionary d ON d.ingredient_id = pi.ingredient_id '
+                   'WHERE pi.goods_no = p.goods_no AND d.name LIKE ?)',
+                   lambda value: f"%{''.join(str(value).split())}%"),
+}
+# 후처리 전 DB용 필터: 성분 JSON은 ASCII 이스케이프로 저장되므로 LIKE 대신 json_each로 성분 단위 비교
+UNNORMALIZED_FILTERS = {
+    'ingredient': ('EXISTS (SELECT 1 FROM json_each(p.ingredients) WHERE json_each.value LIKE ?)',
+                   lambda value: f'%{value}%'),
+}
+NORMALIZED_INGREDIENT_TABLES = {'product_ingredients', 'ingredient_dictionary'}
+
+# 정렬 이름 → SQL 식 (동순위는 항상 id 순)
+SORTS = {
+    'id': 'p.id',
+    'rank': 'p.rank',
+    'name': 'p.name',
+    'brand': 'p.brand',
+    'price': 'p.price',
+    'rating': 'p.rating',
+    'created_at': 'p.created_at',
+}
+DEFAULT_ORDER = ('rating', 'desc')
+COLUMN_REFERENCE = re.compile(r'\bp\.(\w+)')
+
+
+def _decode(column: str, value: Any) -> Any:
+    """JSON 컬럼 값을 파이썬 객체로 변환합니다 (비어있거나 깨진 값은 빈 값)"""
+    if column not in JSON_COLUMNS:
+        return value
+    try:
+        return json.loads(value) if value else JSON_COLUMNS[column]()
+    except (TypeError, ValueError):
+        return JSON_COLUMNS[column]()
+
+
+def compile_search(columns: Sequence[str], filter_names: Sequence[str], order_by: str,
+                   order_direction: str, filters: Dict[str, Tuple[str, Any]] = FILTERS) -> str:
+    """
+    조회 SQL을 만듭니다. 식별자는 모두 허용 목록에서만 가져오므로 같은 조합은 항상 같은 SQL이 되어
+    sqlite3의 커넥션별 prepared statement 캐시를 재사용합니다.
+
+    Raises:
+        ValueError: 허용되지 않은 컬럼/필터/정렬
+    """
+    unknown = [c for c in columns if c not in PRODUCT_COLUMNS and c not in SUMMARY_COLUMNS]
+    if unknown:
+        raise ValueError(f"조회할 수 없는 컬럼: {', '.join(unknown)}")
+    unknown = [f for f in filter_names if f not in filters]
+    if unknown:
+        raise ValueError(f"지원하지 않는 필터: {', '.join(unknown)} (사용 가능: {', '.join(filters)})")
+    if order_by not in SORTS:
+        raise ValueError(f"지원하지 않는 정렬: {order_by} (사용 가능: {', '.join(SORTS)})")
+    if order_direction not in ('asc', 'desc'):
+        raise ValueError(f"정렬 방향은 asc 또는 desc: {order_direction}")
+
+    selected = [f'{SUMMARY_COLUMNS[c]} AS {c}' if c in SUMMARY_COLUMNS else 'p.' + c for c in columns]
+    sql = f"SELECT {', '.join(selected)} FROM products p"
+    if any(c in SUMMARY_COLUMNS for c in columns):
+        sql += ' LEFT JOIN product_summaries s ON s.goods_no = p.goods_no'
+    if filter_names:
+        sql += ' WHERE ' + ' AND '.join(filters[name][0] for name in filter_names)
+    sql += f" ORDER BY {SORTS[order_by]} {order_direction.upper()}"
+    if order_by != 'id':
+        sql += ', p.id ASC'
+    return sql + ' LIMIT ? OFFSET ?'
+
+
+class ReadOnlyPool:
+    """mmap I/O를 켠 읽기 전용 SQLite 커넥션 풀"""
+
+    def __init__(self, db_path: Path, size: int = DB_READ_POOL_SIZE):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            size: 커넥션 수
+        """
+        self.db_path = db_path
+        self.size = size
+        self._idle: 'queue.Queue[sqlite3.Connection]' = queue.Queue()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(self.open())
+
+    def open(self) -> sqlite3.Connection:
+        """읽기 전용 커넥션을 엽니다"""
+        conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, check_same_thread=False,
+                               cached_statements=256)
+        conn.execute(f'PRAGMA mmap_size = {int(DB_MMAP_SIZE)}')
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """커넥션을 빌려 사용합니다 (모두 사용 중이면 반납될 때까지 대기)"""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        """커넥션을 닫습니다 (사용 중인 커넥션은 반납될 때 닫힘)"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class DatabaseInterface:
+    """products.db 읽기 전용 조회 클래스"""
+
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = DB_READ_POOL_SIZE,
+                 cache_size: int = DB_QUERY_CACHE_SIZE):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본값: output/products.db)
+            pool_size: 읽기 전용 커넥션 수
+            cache_size: 조회 결과 캐시 항목 수 (0이면 캐시 사용 안 함)
+        """
+        self.db_path = Path(db_path) if db_path else Path(OUTPUT_DIR) / DB_FILENAME
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"SQLite 데이터베이스가 없습니다: {self.db_path}")
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[Tuple, Tuple[Tuple[str, ...], List[tuple]]]' = OrderedDict()
+        self._generation = 0  # 캐시를 비울 때마다 증가 (무효화 전에 시작한 조회 결과는 캐시하지 않음)
+        self.hits = 0
+        self.misses = 0
+        self._open()
+
+    def _open(self):
+        """커넥션 풀과 변경 감지용 커넥션을 엽니다"""
+        stat = os.stat(self.db_path)
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self.pool = ReadOnlyPool(self.db_path, self.pool_size)
+        # data_version은 커넥션마다 값이 달라 한 커넥션에서만 비교
+        self._probe = self.pool.open()
+        self._data_version = self._probe.execute('PRAGMA data_version').fetchone()[0]
+        self._read_schema()
+
+    def _read_schema(self):
+        """products 컬럼과 테이블 목록을 읽습니다 (이전 스키마, 후처리 전 DB 대응)"""
+        self._columns = {row[1] for row in self._probe.execute('PRAGMA table_info(products)')}
+        self._tables = {row[0] for row in self._probe.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    def _check_version(self):
+        """
+        DB가 바뀌었으면 캐시를 비웁니다.
+        다른 커넥션의 커밋은 data_version으로, 파일 교체(publish --copy-to의 os.replace)는 inode로 감지합니다.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.db_path)
+                replaced = (stat.st_dev, stat.st_ino) != self._file_id
+            except FileNotFoundError:
+                replaced = False  # 교체 중 잠시 없는 경우 기존 파일 계속 사용
+
+            if replaced:
+                self._probe.close()
+                self.pool.close()
+                self._open()
+                self._invalidate()
+                return
+
+            version = self._probe.execute('PRAGMA data_version').fetchone()[0]
+            if version != self._data_version:
+                self._data_version = version
+                self._read_schema()
+                self._invalidate()
+
+    def _invalidate(self):
+        """결과 캐시를 비웁니다 (self._lock을 잡은 상태에서 호출)"""
+        self._cache.clear()
+        self._generation += 1
+
+    def _query(self, sql: str, params: Tuple) -> Tuple[Tuple[str, ...], List[tuple]]:
+        """SQL을 실행하고 (컬럼명, 행 목록)을 반환합니다 (결과 캐시 사용, 호출 전에 _check_version)"""
+        key = (sql, params)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+            pool, generation = self.pool, self._generation
+
+        with pool.connection() as conn:
+            cursor = conn.execute(sql, params)
+            result = (tuple(d[0] for d in cursor.description), cursor.fetchall())
+
+        if self.cache_size > 0:
+            with self._lock:
+                if generation != self._generation:
+                    return result
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def _projection(self, columns: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        """조회할 컬럼을 정합니다 (기본 컬럼 중 이전 스키마에 없는 컬럼은 제외)"""
+        if columns is None:
+            return tuple(c for c in DEFAULT_COLUMNS if c in self._columns)
+        missing = [c for c in columns if c in PRODUCT_COLUMNS and c not in self._columns]
+        if missing:
+            raise ValueError(f"products 테이블에 없는 컬럼: {', '.join(missing)}")
+        if any(c in SUMMARY_COLUMNS for c in columns) and not self._has_summaries():
+            raise ValueError("상품 요약이 없습니다. publish로 후처리를 먼저 실행해주세요.")
+        return tuple(columns)
+
+    def _filters(self) -> Dict[str, Tuple[str, Any]]:
+        """현재 DB에 맞는 필터 목록 (정규화 성분 테이블이 없으면 products.ingredients로 비교)"""
+        if NORMALIZED_INGREDIENT_TABLES <= self._tables and 'goods_no' in self._columns:
+            return FILTERS
+        return {**FILTERS, **UNNORMALIZED_FILTERS}
+
+    def _has_summaries(self) -> bool:
+        """요약 테이블이 있고 products에 goods_no 컬럼이 있는지 확인합니다"""
+        return 'product_summaries' in self._tables and 'goods_no' in self._columns
+
+    def _require_columns(self, filter_names: Sequence[str], order_by: Optional[str] = None):
+        """필터/정렬이 참조하는 컬럼이 현재 스키마에 있는지 확인합니다 (이전 스키마 DB 대응)"""
+        filters = self._filters()
+        expressions = [filters[name][0] for name in filter_names if name in filters]
+        if order_by in SORTS:
+            expressions.append(SORTS[order_by])
+        missing = sorted({c for expr in expressions for c in COLUMN_REFERENCE.findall(expr)} - self._columns)
+        if missing:
+            raise ValueError(f"products 테이블에 없는 컬럼: {', '.join(missing)}")
+
+    def search_products(self, filters: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+                        order_by: Optional[str] = None, order_direction: Optional[str] = None,
+                        limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        상품을 조회합니다.
+
+        Args:
+            filters: 필터 이름 → 값 (FILTERS의 이름만 허용, None 값은 무시)
+            columns: 조회할 컬럼 (기본값: DEFAULT_COLUMNS, PRODUCT_COLUMNS와 SUMMARY_COLUMNS의 이름만 허용)
+            order_by: 정렬 기준 (SORTS의 이름, 기본값: rating 내림차순)
+            order_direction: 'asc' 또는 'desc'
+            limit: 최대 상품 수 (최대 DB_QUERY_MAX_LIMIT)
+            offset: 건너뛸 상품 수
+
+        Returns:
+            상품 딕셔너리 리스트 (ingredients/additional_info/summary는 파이썬 객체로 변환)
+
+        Raises:
+            ValueError: 허용되지 않은 필터/컬럼/정렬 또는 잘못된 값
+        """
+        filters = {name: value for name, value in (filters or {}).items() if value is not None}
+        if order_by is None:
+            order_by, default_direction = DEFAULT_ORDER
+        else:
+            default_direction = 'asc'
+        order_direction = (order_direction or default_direction).lower()
+
+        names = tuple(sorted(filters))
+        self._check_version()
+        projection = self._projection(columns)
+        available = self._filters()
+        sql = compile_search(projection, names, order_by, order_direction, available)
+        self._require_columns(names, order_by)
+        try:
+            params = tuple(available[name][1](filters[name]) for name in names)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"잘못된 필터 값: {e}")
+        params += (max(0, min(int(limit), DB_QUERY_MAX_LIMIT)), max(0, int(offset)))
+
+        names_out, rows = self._query(sql, params)
+        return [{c: _decode(c, v) for c, v in zip(names_out, row)} for row in rows]
+
+    def count_products(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """필터에 맞는 상품 수를 반환합니다"""
+        filters = {name: value for name, value in (filters or {}).items() if value is not None}
+        names = tuple(sorted(filters))
+        self._check_version()
+        available = self._filters()
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(f"지원하지 않는 필터: {', '.join(unknown)}")
+        sql = 'SELECT COUNT(*) FROM products p'
+        if names:
+            sql += ' WHERE ' + ' AND '.join(available[name][0] for name in names)
+        try:
+            params = tuple(available[name][1](filters[name]) for name in names)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"잘못된 필터 값: {e}")
+        self._require_columns(names)
+        return self._query(sql, params)[1][0][0]
+
+    def get_product(self, goods_no: str, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """goodsNo로 상품 하나를 조회합니다 (없으면 None)"""
+        products = self.search_products({'goods_no': goods_no}, columns=columns, order_by='id', limit=1)
+        return products[0] if products else None
+
+    def get_summaries(self, goods_nos: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        상품 요약을 한 번에 조회합니다 (에이전트 컨텍스트용, 토큰 예산 안의 요약 문장 포함).
+
+        Returns:
+            goodsNo → {'summary': 구조화된 요약, 'text': 요약 문장, 'token_estimate': 추정 토큰 수}
+            (요약이 없는 상품은 제외)
+        """
+        goods_nos = tuple(sorted(set(goods_nos)))[:DB_QUERY_MAX_LIMIT]
+        self._check_version()
+        if not goods_nos or 'product_summaries' not in self._tables:
+            return {}
+        sql = ('SELECT goods_no, summary, text, token_estimate FROM product_summaries '
+               f'WHERE goods_no IN ({",".join("?" * len(goods_nos))})')
+        return {
+            goods_no: {'summary': _decode('summary', summary), 'text': text, 'token_estimate': tokens}
+            for goods_no, summary, text, tokens in self._query(sql, goods_nos)[1]
+        }
+
+    def get_reviews(self, goods_no: str, limit: Optional[int] = None) -> List[str]:
+        """상품 리뷰를 저장 순서대로 반환합니다 (압축된 리뷰도 해제, 캐시하지 않음)"""
+        with self.pool.connection() as conn:
+            has_reviews = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_reviews'"
+            ).fetchone()
+            if not has_reviews:
+                return []
+            reviews = ReviewStore(conn).load_reviews([goods_no]).get(goods_no, [])
+        return reviews[:limit] if limit is not None else reviews
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계 (적중, 실패, 현재 항목 수)"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
+
+    def close(self):
+        """커넥션을 모두 닫습니다"""
+        self._probe.close()
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
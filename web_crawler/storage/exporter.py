@@ -0,0 +1,327 @@
+"""
+상품 데이터 저장/불러오기 모듈
+CSV 및 SQLite 저장과 저장된 상품 목록 복원을 담당
+(requests/bs4/selenium 없이 import 가능하여 export, publish 같은 가벼운 명령에서 사용)
+"""
+
+import csv
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from models.data_schema import goods_no_from_url
+from storage import change_log
+from storage.review_store import ReviewStore
+# 상수 import
+from config.constants import OUTPUT_DIR, CSV_FILENAME, DB_FILENAME, REVIEW_CODEC_DEFAULT
+
+# CSV 기본 필드 순서
+# 리뷰 본문은 reviews/product_reviews 테이블에만 두고 CSV에는 개수만 기록
+CSV_ORDERED_FIELDS = ['rank', 'name', 'brand', 'price', 'rating', 'category', 'url', 'ingredients', 'review_count']
+
+PRODUCTS_SCHEMA = '''
+    CREATE TABLE products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        goods_no TEXT,           -- 올리브영 상품 번호 (리뷰/후처리 테이블의 키)
+        rank INTEGER,
+        name TEXT NOT NULL,
+        brand TEXT,
+        price INTEGER,
+        rating REAL,
+        category TEXT,
+        url TEXT,
+        image_url TEXT,          -- Original image URL
+        image_path TEXT,         -- Local image path (content-addressed)
+        thumbnail_path TEXT,     -- Local WebP thumbnail path
+        ingredients TEXT,        -- JSON array of ingredients
+        additional_info TEXT,    -- JSON object of detailed info (full_info)
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def _load_json(text: Optional[str], default):
+    """JSON 컬럼 값을 읽습니다 (비어있거나 깨진 값은 기본값)"""
+    if not text:
+        return default
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return default
+
+
+def _existing_rows(conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+    """기존 products 테이블의 상세 정보 컬럼(및 분리 이전의 reviews 컬럼)을 goodsNo 기준으로 읽어옵니다"""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(products)')}
+    if not columns:
+        return {}
+
+    # goods_no 컬럼이 없는 이전 스키마는 URL에서 추출
+    selected = ['url', 'ingredients', 'additional_info'] + [c for c in ('goods_no', 'reviews') if c in columns]
+    existing = {}
+    for row in conn.execute(f'SELECT {", ".join(selected)} FROM products'):
+        row = dict(zip(selected, row))
+        goods_no = row.get('goods_no') or goods_no_from_url(row['url'])
+        if goods_no:
+            existing[goods_no] = row
+    return existing
+
+
+def save_to_csv(products: List[Dict[str, Any]], filename: str = CSV_FILENAME,
+                output_dir: str = OUTPUT_DIR) -> Optional[Path]:
+    """상품 데이터를 CSV 파일로 저장합니다"""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    filepath = output_path / filename
+
+    if not products:
+        print("저장할 상품 데이터가 없습니다.")
+        return None
+
+    try:
+        rows = []
+        for product in products:
+            row = {key: value for key, value in product.items() if key != 'reviews'}
+            row['review_count'] = len(product.get('reviews') or [])
+            rows.append(row)
+
+        # 동적으로 필드명 결정 (모든 상품의 키를 수집)
+        fieldnames = set()
+        for row in rows:
+            fieldnames.update(row.keys())
+
+        # 기본 필드 순서 보장
+        additional_fields = sorted(fieldnames - set(CSV_ORDERED_FIELDS))
+        final_fieldnames = CSV_ORDERED_FIELDS + additional_fields
+
+        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=final_fieldnames)
+
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+
+        print(f"CSV 파일로 {len(products)}개 상품 저장 완료: {filepath}")
+        return filepath
+
+    except Exception as e:
+        print(f"CSV 저장 실패: {e}")
+        return None
+
+
+def save_to_sqlite(products: List[Dict[str, Any]], db_path: str = DB_FILENAME,
+                   review_codec: str = REVIEW_CODEC_DEFAULT, output_dir: str = OUTPUT_DIR,
+                   preserve_details: bool = False) -> Optional[Path]:
+    """
+    상품 데이터를 SQLite 데이터베이스로 저장합니다.
+    리뷰는 products 행이 아닌 reviews/product_reviews 테이블에 본문 해시 기준으로 저장합니다.
+    products 테이블 삭제/재생성과 삽입은 하나의 트랜잭션으로 처리되어 읽는 쪽에서 빈 테이블이 보이지 않습니다.
+    이전 상태와 달라진 상품은 같은 트랜잭션에서 변경 로그(product_changes)에 기록합니다.
+
+    Args:
+        products: 상품 리스트
+        db_path: 출력 디렉토리 기준 DB 파일명
+        review_codec: 새 리뷰 본문의 압축 방식
+        output_dir: 출력 디렉토리
+        preserve_details: detail_info가 없는 상품은 기존 행의 성분/상세 정보를 유지 (랭킹만 갱신할 때)
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    db_filepath = output_path / db_path
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_filepath, isolation_level=None)
+        conn.execute('BEGIN IMMEDIATE')
+
+        existing = _existing_rows(conn)
+        before = change_log.snapshot_products(conn)
+
+        # 기존 테이블 삭제 후 새로 생성 (스키마 변경을 위해)
+        conn.execute('DROP TABLE IF EXISTS products')
+        conn.execute(PRODUCTS_SCHEMA)
+        conn.execute('CREATE INDEX idx_products_goods_no ON products(goods_no)')
+
+        review_store = ReviewStore(conn, codec=review_codec)
+        review_store.ensure_schema()
+        reviews_by_product = {}
+        preserved = 0
+
+        # 데이터 삽입
+        rows = []
+        for product in products:
+            goods_no = goods_no_from_url(product['url'])
+
+            # 상세 정보에서 데이터를 추출
+            detail_info = product.get('detail_info')
+            if isinstance(detail_info, dict):
+                ingredients_json = json.dumps(detail_info.get('ingredients', []))
+                additional_info_json = json.dumps(detail_info.get('full_info', {}))
+            elif preserve_details and goods_no in existing:
+                ingredients_json = existing[goods_no]['ingredients']
+                additional_info_json = existing[goods_no]['additional_info']
+                preserved += 1
+            else:
+                ingredients_json, additional_info_json = json.dumps([]), json.dumps({})
+
+            # 리뷰를 추출한 상품만 리뷰 매핑 갱신 (기본 정보만 크롤링한 경우 기존 리뷰 유지)
+            if goods_no and 'reviews' in product:
+                reviews_by_product[goods_no] = product['reviews']
+            elif goods_no in existing and existing[goods_no].get('reviews'):
+                # 리뷰가 products.reviews 컬럼에 있던 이전 DB는 테이블을 지우기 전에 리뷰 테이블로 옮김
+                reviews_by_product[goods_no] = _load_json(existing[goods_no]['reviews'], [])
+
+            rows.append((
+                goods_no,
+                product['rank'],
+                product['name'],
+                product['brand'],
+                product['price'],
+                product['rating'],
+                product['category'],
+                product['url'],
+                product.get('image_url'),
+                product.get('image_path'),
+                product.get('thumbnail_path'),
+                ingredients_json,
+                additional_info_json
+            ))
+
+        conn.executemany('''
+            INSERT INTO products (goods_no, rank, name, brand, price, rating, category, url,
+                                 image_url, image_path, thumbnail_path, ingredients, additional_info)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+        new_reviews = review_store.save_product_reviews(reviews_by_product)
+        # 랭킹에서 빠진 상품의 리뷰는 같은 트랜잭션에서 정리
+        pruned_reviews = review_store.prune_orphans()
+        changes = change_log.record_changes(conn, before, change_log.snapshot_products(conn))
+        conn.execute('COMMIT')
+
+        message = (f"SQLite 데이터베이스로 {len(products)}개 상품 저장 완료: {db_filepath} "
+                   f"(신규 리뷰 {new_reviews}개, 삭제 리뷰 {pruned_reviews}개, 변경 기록 {changes}개")
+        if preserve_details:
+            message += f", 상세 정보 유지 {preserved}개"
+        print(message + ")")
+        return db_filepath
+
+    except Exception as e:
+        if conn is not None and conn.in_transaction:
+            conn.execute('ROLLBACK')
+        print(f"SQLite 저장 실패: {e}")
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def update_product_details(conn: sqlite3.Connection, goods_no: str, detail_info: Optional[Dict[str, Any]],
+                           reviews: Optional[List[str]], review_codec: str = REVIEW_CODEC_DEFAULT) -> int:
+    """
+    상품 하나의 상세 정보/리뷰만 갱신합니다 (트랜잭션은 호출자가 관리).
+    비어있는 값(None, 빈 딕셔너리/리스트)은 기존 데이터를 유지합니다.
+
+    Returns:
+        변경 로그에 기록된 변경 수 (내용이 같으면 0)
+    """
+    before = change_log.snapshot_products(conn, [goods_no])
+    if detail_info:
+        conn.execute('UPDATE products SET ingredients = ?, additional_info = ? WHERE goods_no = ?', (
+            json.dumps(detail_info.get('ingredients', [])),
+            json.dumps(detail_info.get('full_info', {})),
+            goods_no,
+        ))
+    if reviews:
+        review_store = ReviewStore(conn, codec=review_codec)
+        review_store.ensure_schema()
+        review_store.save_product_reviews({goods_no: reviews})
+    return change_log.record_changes(conn, before, change_log.snapshot_products(conn, [goods_no]))
+
+
+def copy_database(source: Path, target: Path) -> Path:
+    """
+    SQLite 백업 API로 일관된 스냅샷을 임시 파일에 만든 뒤 target을 교체합니다.
+    os.replace로 한 번에 바꾸므로 읽는 쪽은 항상 완전한 파일을 봅니다 (publish --copy-to).
+
+    Returns:
+        교체된 target 경로
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(target.name + '.tmp')
+    source_conn = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+    dest_conn = sqlite3.connect(temp_path)
+    try:
+        source_conn.backup(dest_conn)
+    finally:
+        dest_conn.close()
+        source_conn.close()
+    os.replace(temp_path, target)
+    return target
+
+
+def load_from_sqlite(db_path: str = DB_FILENAME, output_dir: str = OUTPUT_DIR,
+                     include_reviews: bool = True) -> List[Dict[str, Any]]:
+    """
+    저장된 products 테이블을 크롤러의 상품 딕셔너리 형태로 복원합니다 (랭킹 순).
+
+    Args:
+        db_path: 출력 디렉토리 기준 DB 파일명
+        output_dir: 출력 디렉토리
+        include_reviews: 리뷰 테이블의 리뷰를 'reviews' 키로 포함할지 여부
+
+    Returns:
+        상품 리스트 (DB가 없으면 빈 리스트)
+    """
+    db_filepath = Path(output_dir) / db_path
+    if not db_filepath.exists():
+        print(f"SQLite 데이터베이스가 없습니다: {db_filepath}")
+        return []
+
+    conn = sqlite3.connect(f'file:{db_filepath}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(products)')}
+        if not columns:
+            return []
+
+        products = []
+        for row in conn.execute('SELECT * FROM products ORDER BY rank, id'):
+            ingredients = _load_json(row['ingredients'], [])
+            full_info = _load_json(row['additional_info'], {})
+            product = {
+                'rank': row['rank'],
+                'name': row['name'],
+                'brand': row['brand'],
+                'price': row['price'],
+                'rating': row['rating'],
+                'category': row['category'],
+                'url': row['url'],
+                'image_url': row['image_url'],
+                'image_path': row['image_path'],
+                'thumbnail_path': row['thumbnail_path'] if 'thumbnail_path' in columns else None,
+            }
+            if ingredients or full_info:
+                product['detail_info'] = {'ingredients': ingredients, 'full_info': full_info}
+            if include_reviews and 'reviews' in columns:
+                # 리뷰 테이블 분리 이전에 저장된 DB
+                product['reviews'] = _load_json(row['reviews'], [])
+            products.append(product)
+
+        if include_reviews and 'reviews' not in columns:
+            has_review_table = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_reviews'"
+            ).fetchone()
+            if has_review_table:
+                reviews = ReviewStore(conn).load_reviews()
+                for product in products:
+                    goods_no = goods_no_from_url(product['url'])
+                    if goods_no in reviews:
+                        product['reviews'] = reviews[goods_no]
+
+        return products
+    finally:
+        conn.close()
@@ -0,0 +1,313 @@
+"""
+상품 이미지 저장 모듈
+원본 이미지를 SHA-256 기준으로 한 번만 저장하고, goodsNo → 이미지 해시 매핑을 SQLite에 기록
+dHash(perceptual hash) 인덱스로 거의 같은 이미지를 하나로 합치고, 썸네일/WebP 변환본을 프로세스 풀에서 생성
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+# 상수 import
+from config.constants import (
+    OUTPUT_DIR, DB_FILENAME, IMAGE_OBJECTS_DIR, IMAGE_VARIANTS_DIR,
+    IMAGE_THUMBNAIL_SIZES, IMAGE_WEBP_QUALITY, IMAGE_PHASH_MAX_DISTANCE
+)
+
+IMAGE_SCHEMA = [
+    # 바이트 단위로 서로 다른 이미지 (canonical_sha256이 자기 자신이 아니면 파일을 따로 저장하지 않음)
+    '''
+    CREATE TABLE IF NOT EXISTS image_assets (
+        sha256 TEXT PRIMARY KEY,
+        canonical_sha256 TEXT NOT NULL,     -- 거의 같은 이미지의 대표 해시
+        path TEXT,                          -- 대표 이미지만 파일 경로를 가짐
+        phash INTEGER NOT NULL,             -- 64비트 dHash (signed)
+        width INTEGER,
+        height INTEGER,
+        bytes INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # dHash를 16비트씩 나눈 구간 인덱스 (해밍 거리 3 이하면 최소 한 구간이 일치)
+    '''
+    CREATE TABLE IF NOT EXISTS image_phash_bands (
+        band INTEGER NOT NULL,
+        value INTEGER NOT NULL,
+        sha256 TEXT NOT NULL,
+        PRIMARY KEY (band, value, sha256)
+    ) WITHOUT ROWID
+    ''',
+    # 상품 → 이미지 매핑
+    '''
+    CREATE TABLE IF NOT EXISTS product_images (
+        goods_no TEXT PRIMARY KEY,
+        sha256 TEXT NOT NULL,
+        source_url TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # 썸네일/WebP 변환본
+    '''
+    CREATE TABLE IF NOT EXISTS image_variants (
+        sha256 TEXT NOT NULL,               -- 대표 이미지 해시
+        variant TEXT NOT NULL,              -- 'webp', 'thumb_160' ...
+        path TEXT NOT NULL,
+        width INTEGER,
+        height INTEGER,
+        bytes INTEGER,
+        PRIMARY KEY (sha256, variant)
+    ) WITHOUT ROWID
+    ''',
+]
+
+PHASH_BANDS = 4
+PHASH_BAND_BITS = 64 // PHASH_BANDS
+
+
+def dhash(image: Image.Image) -> int:
+    """이미지의 64비트 difference hash를 계산합니다 (unsigned)"""
+    gray = image.convert('L').resize((9, 8), Image.LANCZOS)
+    pixels = list(gray.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+def _to_signed(value: int) -> int:
+    """SQLite INTEGER에 저장할 수 있도록 64비트 unsigned 값을 signed로 변환합니다"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _bands(value: int) -> List[Tuple[int, int]]:
+    """dHash를 (구간 번호, 16비트 값) 목록으로 나눕니다"""
+    mask = (1 << PHASH_BAND_BITS) - 1
+    return [(band, (value >> (band * PHASH_BAND_BITS)) & mask) for band in range(PHASH_BANDS)]
+
+
+def _relative(path: Path) -> str:
+    """현재 디렉토리 기준 상대 경로 (계산할 수 없으면 절대 경로)"""
+    try:
+        return str(path.relative_to(Path.cwd()))
+    except ValueError:
+        return str(path)
+
+
+def render_variants(sha256: str, source_path: str, variants_dir: str) -> List[Tuple[str, str, int, int, int]]:
+    """
+    원본 이미지 하나의 WebP/썸네일 변환본을 생성합니다 (프로세스 풀 작업 함수).
+
+    Returns:
+        (variant, 경로, 너비, 높이, 바이트 수) 리스트
+    """
+    output_dir = Path(variants_dir) / sha256[:2]
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    with Image.open(source_path) as image:
+        image = image.convert('RGB')
+        targets = [('webp', None)] + [(f'thumb_{size}', size) for size in IMAGE_THUMBNAIL_SIZES]
+        for variant, size in targets:
+            rendered = image.copy()
+            if size:
+                rendered.thumbnail((size, size), Image.LANCZOS)
+            path = output_dir / f"{sha256}_{variant}.webp"
+            rendered.save(path, 'WEBP', quality=IMAGE_WEBP_QUALITY, method=6)
+            results.append((variant, str(path), rendered.width, rendered.height, path.stat().st_size))
+    return results
+
+
+class ImageStore:
+    """콘텐츠 주소 기반 이미지 저장소"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: 매핑을 기록할 SQLite 파일 경로 (기본값: output/products.db)
+                     이미지 파일은 DB와 같은 출력 디렉토리 아래(images/objects, images/variants)에 저장
+        """
+        self.db_path = Path(db_path) if db_path else Path(OUTPUT_DIR) / DB_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.objects_dir = self.db_path.parent / Path(IMAGE_OBJECTS_DIR).relative_to(OUTPUT_DIR)
+        self.variants_dir = self.db_path.parent / Path(IMAGE_VARIANTS_DIR).relative_to(OUTPUT_DIR)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        for statement in IMAGE_SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def lookup(self, goods_no: str, source_url: Optional[str] = None) -> Optional[str]:
+        """
+        이미 저장된 상품 이미지의 대표 파일 경로를 반환합니다.
+        source_url을 주면 원본 URL이 같을 때만 반환합니다.
+        """
+        row = self.conn.execute('''
+            SELECT canonical.path, pi.source_url
+            FROM product_images pi
+            JOIN image_assets asset ON asset.sha256 = pi.sha256
+            JOIN image_assets canonical ON canonical.sha256 = asset.canonical_sha256
+            WHERE pi.goods_no = ?
+        ''', (goods_no,)).fetchone()
+        if row is None or (source_url is not None and row[1] != source_url):
+            return None
+        return row[0] if row[0] and Path(row[0]).exists() else None
+
+    def has_image(self, goods_no: str) -> bool:
+        """상품에 연결된 이미지 매핑이 있는지 확인합니다 (원본 URL/파일 존재 여부와 무관)"""
+        return self.conn.execute(
+            'SELECT 1 FROM product_images WHERE goods_no = ?', (goods_no,)
+        ).fetchone() is not None
+
+    def _find_near_duplicate(self, phash: int) -> Optional[str]:
+        """해밍 거리가 기준 이하인 대표 이미지를 찾습니다"""
+        candidates = set()
+        for band, value in _bands(phash):
+            candidates.update(row[0] for row in self.conn.execute(
+                'SELECT sha256 FROM image_phash_bands WHERE band = ? AND value = ?', (band, value)
+            ))
+
+        best = None
+        for sha256 in candidates:
+            row = self.conn.execute(
+                'SELECT phash, canonical_sha256 FROM image_assets WHERE sha256 = ?', (sha256,)
+            ).fetchone()
+            distance = bin(_to_unsigned(row[0]) ^ phash).count('1')
+            if distance <= IMAGE_PHASH_MAX_DISTANCE and (best is None or distance < best[0]):
+                best = (distance, row[1])
+        return best[1] if best else None
+
+    def put(self, goods_no: str, data: bytes, source_url: Optional[str] = None) -> str:
+        """
+        이미지 바이트를 저장하고 상품에 연결합니다.
+
+        Returns:
+            상품 이미지로 사용할 대표 파일 경로
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        row = self.conn.execute(
+            'SELECT canonical_sha256 FROM image_assets WHERE sha256 = ?', (sha256,)
+        ).fetchone()
+
+        if row is None:
+            with Image.open(io.BytesIO(data)) as image:
+                width, height = image.size
+                image_format = (image.format or 'JPEG').lower()
+                phash = dhash(image)
+
+            canonical = self._find_near_duplicate(phash)
+            path = None
+            if canonical is None:
+                # 새 대표 이미지: 해시 앞 2글자 디렉토리에 저장
+                canonical = sha256
+                extension = 'jpg' if image_format == 'jpeg' else image_format
+                file_path = self.objects_dir / sha256[:2] / f"{sha256}.{extension}"
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                if not file_path.exists():
+                    tmp_path = file_path.with_suffix('.tmp')
+                    tmp_path.write_bytes(data)
+                    os.replace(tmp_path, file_path)
+                path = _relative(file_path)
+
+            self.conn.execute('''
+                INSERT INTO image_assets (sha256, canonical_sha256, path, phash, width, height, bytes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (sha256, canonical, path, _to_signed(phash), width, height, len(data)))
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO image_phash_bands (band, value, sha256) VALUES (?, ?, ?)',
+                [(band, value, sha256) for band, value in _bands(phash)]
+            )
+            if canonical != sha256:
+                print(f"이미지 중복 병합: {goods_no} → {canonical[:12]}")
+
+        self.conn.execute('''
+            INSERT INTO product_images (goods_no, sha256, source_url, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(goods_no) DO UPDATE SET
+                sha256 = excluded.sha256, source_url = excluded.source_url, updated_at = CURRENT_TIMESTAMP
+        ''', (goods_no, sha256, source_url))
+        self.conn.commit()
+
+        return self.lookup(goods_no)
+
+    def thumbnail_path(self, goods_no: str, size: int = IMAGE_THUMBNAIL_SIZES[0]) -> Optional[str]:
+        """상품 이미지의 썸네일 경로를 반환합니다 (아직 생성되지 않았으면 None)"""
+        row = self.conn.execute('''
+            SELECT v.path
+            FROM product_images pi
+            JOIN image_assets asset ON asset.sha256 = pi.sha256
+            JOIN image_variants v ON v.sha256 = asset.canonical_sha256 AND v.variant = ?
+            WHERE pi.goods_no = ?
+        ''', (f'thumb_{size}', goods_no)).fetchone()
+        return row[0] if row else None
+
+    def build_variants(self, max_workers: Optional[int] = None) -> int:
+        """
+        변환본이 없는 대표 이미지의 WebP/썸네일을 프로세스 풀에서 생성합니다.
+
+        Returns:
+            변환본을 생성한 이미지 수
+        """
+        pending = self.conn.execute('''
+            SELECT a.sha256, a.path FROM image_assets a
+            WHERE a.sha256 = a.canonical_sha256 AND a.path IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM image_variants v WHERE v.sha256 = a.sha256)
+        ''').fetchall()
+        pending = [(sha256, path) for sha256, path in pending if Path(path).exists()]
+        if not pending:
+            return 0
+
+        built = 0
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(render_variants, sha256, path, str(self.variants_dir)): sha256
+                for sha256, path in pending
+            }
+            for future, sha256 in futures.items():
+                try:
+                    variants = future.result()
+                except Exception as e:
+                    print(f"이미지 변환 실패 ({sha256[:12]}): {e}")
+                    continue
+                self.conn.executemany('''
+                    INSERT OR REPLACE INTO image_variants (sha256, variant, path, width, height, bytes)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(sha256, variant, _relative(Path(path)), width, height, size)
+                      for variant, path, width, height, size in variants])
+                built += 1
+
+        self.conn.commit()
+        print(f"이미지 변환본 생성 완료: {built}개")
+        return built
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 통계 (상품 수, 고유 이미지 수, 대표 이미지 수, 저장 바이트)"""
+        products, = self.conn.execute('SELECT COUNT(*) FROM product_images').fetchone()
+        assets, canonical, stored = self.conn.execute('''
+            SELECT COUNT(*), SUM(sha256 = canonical_sha256), COALESCE(SUM(CASE WHEN path IS NOT NULL THEN bytes END), 0)
+            FROM image_assets
+        ''').fetchone()
+        return {'products': products, 'assets': assets, 'canonical': canonical or 0, 'stored_bytes': stored}
+
+    def close(self):
+        """DB 연결을 종료합니다"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
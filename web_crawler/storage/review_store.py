@@ -0,0 +1,285 @@
+"""
+리뷰 저장 모듈
+리뷰를 상품 행과 분리하여 1리뷰 1행으로 저장하고, 본문 해시로 재크롤링 간 중복을 제거
+선택적으로 공유 사전을 사용한 zlib/zstd 압축을 지원
+"""
+
+import hashlib
+import sqlite3
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축을 사용하지 않으면 필요 없음
+    zstandard = None
+
+# 상수 import
+from config.constants import REVIEW_CODEC_DEFAULT, REVIEW_DICT_SIZE, REVIEW_DICT_MIN_SAMPLES
+
+REVIEW_SCHEMA = [
+    # 리뷰 본문 (본문 해시 기준으로 한 번만 저장)
+    '''
+    CREATE TABLE IF NOT EXISTS reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        review_hash BLOB NOT NULL UNIQUE,   -- sha256(본문) 앞 16바이트
+        codec TEXT NOT NULL,                -- 'plain', 'zlib', 'zstd'
+        dict_id INTEGER,                    -- review_dictionaries.dict_id (사전 압축 시)
+        body BLOB NOT NULL,                 -- plain이면 TEXT
+        char_length INTEGER NOT NULL,
+        first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # 상품 ↔ 리뷰 매핑 (상품 페이지 노출 순서 유지)
+    '''
+    CREATE TABLE IF NOT EXISTS product_reviews (
+        goods_no TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        review_hash BLOB NOT NULL,
+        PRIMARY KEY (goods_no, position)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_product_reviews_hash ON product_reviews(review_hash)',
+    # 리뷰 압축용 공유 사전
+    '''
+    CREATE TABLE IF NOT EXISTS review_dictionaries (
+        dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        codec TEXT NOT NULL,
+        data BLOB NOT NULL,
+        sample_count INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+]
+
+CODECS = ('plain', 'zlib', 'zstd')
+
+
+def review_hash(text: str) -> bytes:
+    """리뷰 본문의 해시(sha256 앞 16바이트)를 계산합니다"""
+    return hashlib.sha256(text.encode('utf-8')).digest()[:16]
+
+
+def _build_zlib_dictionary(samples: List[str], size: int) -> bytes:
+    """
+    자주 등장하는 단어로 zlib 사전을 만듭니다.
+    zlib은 사전 뒤쪽 문자열을 더 짧은 거리로 참조하므로 빈도가 높은 단어를 뒤에 둡니다.
+    """
+    counts = Counter(word for sample in samples for word in sample.split() if len(word) > 1)
+    words = []
+    total = 0
+    for word, count in counts.most_common():
+        if count < 2:
+            break
+        encoded = (word + ' ').encode('utf-8')
+        if total + len(encoded) > size:
+            break
+        words.append(encoded)
+        total += len(encoded)
+    return b''.join(reversed(words))
+
+
+class ReviewStore:
+    """SQLite 리뷰 테이블 읽기/쓰기를 담당하는 클래스 (트랜잭션은 호출자가 관리)"""
+
+    def __init__(self, conn: sqlite3.Connection, codec: str = REVIEW_CODEC_DEFAULT):
+        """
+        Args:
+            conn: products.db 연결
+            codec: 새로 저장하는 리뷰의 압축 방식 ('plain', 'zlib', 'zstd')
+        """
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 리뷰 압축 방식: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise ValueError("zstd 압축을 사용하려면 zstandard 패키지를 설치해주세요.")
+
+        self.conn = conn
+        self.codec = codec
+        self._dictionaries: Dict[int, Tuple[str, bytes]] = {}
+        self._compressor = None
+        self._compressor_dict_id: Optional[int] = None
+
+    def ensure_schema(self):
+        """리뷰 테이블을 생성합니다"""
+        for statement in REVIEW_SCHEMA:
+            self.conn.execute(statement)
+
+    def _dictionary(self, dict_id: int) -> Tuple[str, bytes]:
+        """압축 사전을 읽어옵니다 (연결 단위로 캐시)"""
+        if dict_id not in self._dictionaries:
+            row = self.conn.execute(
+                'SELECT codec, data FROM review_dictionaries WHERE dict_id = ?', (dict_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"리뷰 압축 사전을 찾을 수 없음: {dict_id}")
+            self._dictionaries[dict_id] = (row[0], bytes(row[1]))
+        return self._dictionaries[dict_id]
+
+    def _prepare_compressor(self, new_texts: List[str]):
+        """현재 codec의 최신 사전을 불러오거나, 없으면 새 리뷰로 학습합니다"""
+        if self.codec == 'plain' or self._compressor is not None:
+            return
+
+        row = self.conn.execute(
+            'SELECT dict_id FROM review_dictionaries WHERE codec = ? ORDER BY dict_id DESC LIMIT 1',
+            (self.codec,)
+        ).fetchone()
+
+        if row is None:
+            samples = list(new_texts)
+            if len(samples) < REVIEW_DICT_MIN_SAMPLES:
+                # 샘플이 부족하면 사전 없이 압축 (다음 저장 때 다시 시도)
+                self._compressor = self._make_compressor(b'')
+                return
+            if self.codec == 'zstd':
+                data = zstandard.train_dictionary(
+                    REVIEW_DICT_SIZE, [s.encode('utf-8') for s in samples]
+                ).as_bytes()
+            else:
+                data = _build_zlib_dictionary(samples, REVIEW_DICT_SIZE)
+            cursor = self.conn.execute(
+                'INSERT INTO review_dictionaries (codec, data, sample_count) VALUES (?, ?, ?)',
+                (self.codec, data, len(samples))
+            )
+            dict_id = cursor.lastrowid
+            print(f"✅ 리뷰 압축 사전 학습 완료: {self.codec}, {len(data)} bytes, 샘플 {len(samples)}개")
+        else:
+            dict_id = row[0]
+
+        self._compressor_dict_id = dict_id
+        self._compressor = self._make_compressor(self._dictionary(dict_id)[1])
+
+    def _make_compressor(self, dictionary: bytes):
+        """codec과 사전에 맞는 압축 함수를 만듭니다"""
+        if self.codec == 'zstd':
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            compressor = zstandard.ZstdCompressor(level=9, dict_data=dict_data)
+            return compressor.compress
+
+        def compress(data: bytes) -> bytes:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=dictionary) if dictionary \
+                else zlib.compressobj(9, zlib.DEFLATED, -15)
+            return compressor.compress(data) + compressor.flush()
+        return compress
+
+    def _decode(self, codec: str, dict_id: Optional[int], body) -> str:
+        """저장된 리뷰 본문을 복원합니다"""
+        if codec == 'plain':
+            return body if isinstance(body, str) else bytes(body).decode('utf-8')
+
+        dictionary = self._dictionary(dict_id)[1] if dict_id is not None else b''
+        if codec == 'zstd':
+            if zstandard is None:
+                raise ValueError("zstd로 압축된 리뷰를 읽으려면 zstandard 패키지를 설치해주세요.")
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            data = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(bytes(body))
+        else:
+            decompressor = zlib.decompressobj(-15, zdict=dictionary) if dictionary else zlib.decompressobj(-15)
+            data = decompressor.decompress(bytes(body)) + decompressor.flush()
+        return data.decode('utf-8')
+
+    def save_product_reviews(self, reviews_by_product: Dict[str, List[str]]) -> int:
+        """
+        상품별 리뷰 목록을 저장합니다. 이미 저장된 본문은 다시 저장하지 않습니다.
+
+        Args:
+            reviews_by_product: goodsNo → 리뷰 텍스트 리스트
+
+        Returns:
+            새로 저장된 리뷰 본문 수
+        """
+        mappings = []
+        texts: Dict[bytes, str] = {}
+        for goods_no, reviews in reviews_by_product.items():
+            position = 0
+            for review in reviews:
+                if not isinstance(review, str) or not review.strip():
+                    continue
+                text = review.strip()
+                digest = review_hash(text)
+                texts.setdefault(digest, text)
+                position += 1
+                mappings.append((goods_no, position, digest))
+
+        # 이미 저장된 본문 제외
+        digests = list(texts)
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for (existing,) in self.conn.execute(
+                f'SELECT review_hash FROM reviews WHERE review_hash IN ({placeholders})', chunk
+            ):
+                texts.pop(existing, None)
+
+        self._prepare_compressor(list(texts.values()))
+        rows = []
+        for digest, text in texts.items():
+            if self.codec == 'plain':
+                rows.append((digest, 'plain', None, text, len(text)))
+            else:
+                rows.append((digest, self.codec, self._compressor_dict_id,
+                             self._compressor(text.encode('utf-8')), len(text)))
+
+        self.conn.executemany('''
+            INSERT OR IGNORE INTO reviews (review_hash, codec, dict_id, body, char_length)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        self.conn.executemany('DELETE FROM product_reviews WHERE goods_no = ?',
+                              [(goods_no,) for goods_no in reviews_by_product])
+        self.conn.executemany(
+            'INSERT INTO product_reviews (goods_no, position, review_hash) VALUES (?, ?, ?)', mappings
+        )
+        return len(rows)
+
+    def load_reviews(self, goods_nos: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        상품별 리뷰 텍스트를 읽어옵니다.
+
+        Args:
+            goods_nos: 읽을 상품 목록 (None이면 전체)
+
+        Returns:
+            goodsNo → 리뷰 텍스트 리스트 (저장 순서)
+        """
+        query = '''
+            SELECT pr.goods_no, r.codec, r.dict_id, r.body
+            FROM product_reviews pr
+            JOIN reviews r ON r.review_hash = pr.review_hash
+        '''
+        if goods_nos is None:
+            batches = [(query + ' ORDER BY pr.goods_no, pr.position', [])]
+        else:
+            goods_nos = list(goods_nos)
+            batches = []
+            for start in range(0, len(goods_nos), 500):
+                chunk = goods_nos[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                batches.append((query + f' WHERE pr.goods_no IN ({placeholders}) ORDER BY pr.goods_no, pr.position',
+                                chunk))
+
+        result: Dict[str, List[str]] = {}
+        for sql, params in batches:
+            for goods_no, codec, dict_id, body in self.conn.execute(sql, params):
+                result.setdefault(goods_no, []).append(self._decode(codec, dict_id, body))
+        return result
+
+    def prune_orphans(self) -> int:
+        """
+        products 테이블에 없는 상품(랭킹에서 빠진 상품)의 리뷰 매핑과,
+        어떤 상품에도 연결되지 않은 리뷰 본문을 삭제합니다 (트랜잭션은 호출자가 관리).
+
+        Returns:
+            삭제한 리뷰 본문 수
+        """
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(products)')}
+        if 'goods_no' in columns:
+            self.conn.execute('''
+                DELETE FROM product_reviews
+                WHERE goods_no NOT IN (SELECT goods_no FROM products WHERE goods_no IS NOT NULL)
+            ''')
+        cursor = self.conn.execute('''
+            DELETE FROM reviews
+            WHERE review_hash NOT IN (SELECT review_hash FROM product_reviews)
+        ''')
+        return cursor.rowcount
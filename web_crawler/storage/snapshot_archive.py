@@ -0,0 +1,192 @@
+"""
+상품 페이지 스냅샷 보관 모듈
+렌더링이 끝난 상세 페이지 DOM(섀도 루트 포함)을 본문 SHA-256 기준으로 한 번만 압축 저장하고,
+상품별 스냅샷 목록과 당시 실시간 추출 결과를 SQLite에 기록
+(파싱 로직을 고친 뒤 브라우저 없이 core.parser.reextract_page로 다시 추출)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # 없으면 zlib으로 압축
+    zstandard = None
+
+# 상수 import
+from config.constants import OUTPUT_DIR, DB_FILENAME, SNAPSHOT_OBJECTS_DIR, SNAPSHOT_COMPRESSION_LEVEL
+
+SNAPSHOT_SCHEMA = [
+    # 압축된 문서 (본문 해시 기준으로 한 번만 저장)
+    '''
+    CREATE TABLE IF NOT EXISTS snapshot_objects (
+        sha256 TEXT PRIMARY KEY,            -- 압축 전 본문 해시
+        codec TEXT NOT NULL,                -- 'zstd', 'zlib'
+        path TEXT NOT NULL,
+        raw_bytes INTEGER NOT NULL,
+        stored_bytes INTEGER NOT NULL
+    ) WITHOUT ROWID
+    ''',
+    # 상품 페이지 스냅샷 (추출 단계별 문서 + 실시간 추출 결과)
+    '''
+    CREATE TABLE IF NOT EXISTS page_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        goods_no TEXT NOT NULL,
+        url TEXT,
+        info_sha256 TEXT,                   -- 상품정보 제공고시를 펼친 상태의 DOM
+        reviews_sha256 TEXT,                -- 리뷰 탭을 스크롤한 상태의 DOM
+        payload TEXT,                       -- JSON: 실시간 추출 결과 (테이블 행, 리뷰, max_reviews)
+        captured_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_page_snapshots_goods_no ON page_snapshots(goods_no, id)',
+]
+
+SNAPSHOT_STAGES = ('info', 'reviews')
+
+
+def read_object(path: str, codec: str) -> bytes:
+    """압축된 스냅샷 문서를 읽어 원본 바이트를 반환합니다"""
+    data = Path(path).read_bytes()
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("zstd로 압축된 스냅샷을 읽으려면 zstandard 패키지를 설치해주세요.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class SnapshotArchive:
+    """콘텐츠 주소 기반 상품 페이지 스냅샷 저장소"""
+
+    def __init__(self, db_path: Optional[str] = None, objects_dir: Optional[str] = None):
+        """
+        Args:
+            db_path: 스냅샷 목록을 기록할 SQLite 파일 경로 (기본값: output/products.db)
+            objects_dir: 압축 문서 저장 디렉토리 (기본값: DB와 같은 출력 디렉토리의 snapshots/objects)
+        """
+        self.db_path = Path(db_path) if db_path else Path(OUTPUT_DIR) / DB_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.objects_dir = (Path(objects_dir) if objects_dir
+                            else self.db_path.parent / Path(SNAPSHOT_OBJECTS_DIR).relative_to(OUTPUT_DIR))
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+
+        self.conn = sqlite3.connect(self.db_path)
+        for statement in SNAPSHOT_SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def _compress(self, data: bytes) -> bytes:
+        """설정된 방식으로 압축합니다"""
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=SNAPSHOT_COMPRESSION_LEVEL).compress(data)
+        return zlib.compress(data, SNAPSHOT_COMPRESSION_LEVEL)
+
+    def put_object(self, data: bytes) -> str:
+        """
+        문서를 압축 저장합니다 (같은 본문은 한 번만 저장).
+
+        Returns:
+            본문 SHA-256
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        if self.conn.execute('SELECT 1 FROM snapshot_objects WHERE sha256 = ?', (sha256,)).fetchone():
+            return sha256
+
+        compressed = self._compress(data)
+        extension = 'zst' if self.codec == 'zstd' else 'z'
+        file_path = self.objects_dir / sha256[:2] / f"{sha256}.html.{extension}"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_suffix('.tmp')
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, file_path)
+
+        self.conn.execute('''
+            INSERT OR IGNORE INTO snapshot_objects (sha256, codec, path, raw_bytes, stored_bytes)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (sha256, self.codec, str(file_path), len(data), len(compressed)))
+        return sha256
+
+    def put(self, goods_no: str, url: str, documents: Dict[str, str], payload: Dict[str, Any]) -> int:
+        """
+        상품 페이지 스냅샷을 저장합니다.
+
+        Args:
+            goods_no: 상품 번호
+            url: 상품 상세 페이지 URL
+            documents: 단계('info', 'reviews') → 직렬화된 HTML
+            payload: 실시간 추출 결과 (재추출 결과와 비교용)
+
+        Returns:
+            스냅샷 id
+        """
+        hashes = {stage: self.put_object(html.encode('utf-8')) for stage, html in documents.items()}
+        cursor = self.conn.execute('''
+            INSERT INTO page_snapshots (goods_no, url, info_sha256, reviews_sha256, payload)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (goods_no, url, hashes.get('info'), hashes.get('reviews'), json.dumps(payload, ensure_ascii=False)))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def latest(self, goods_nos: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        상품별 최신 스냅샷을 반환합니다.
+
+        Returns:
+            {'goods_no', 'url', 'captured_at', 'payload', 'documents': 단계 → (경로, 압축 방식)} 리스트
+        """
+        objects: Dict[str, Tuple[str, str]] = {
+            sha256: (path, codec)
+            for sha256, path, codec in self.conn.execute('SELECT sha256, path, codec FROM snapshot_objects')
+        }
+        rows = self.conn.execute('''
+            SELECT s.goods_no, s.url, s.captured_at, s.payload, s.info_sha256, s.reviews_sha256
+            FROM page_snapshots s
+            WHERE s.id = (SELECT MAX(id) FROM page_snapshots WHERE goods_no = s.goods_no)
+            ORDER BY s.goods_no
+        ''').fetchall()
+
+        wanted = set(goods_nos) if goods_nos is not None else None
+        snapshots = []
+        for goods_no, url, captured_at, payload, info_sha256, reviews_sha256 in rows:
+            if wanted is not None and goods_no not in wanted:
+                continue
+            documents = {
+                stage: objects[sha256]
+                for stage, sha256 in zip(SNAPSHOT_STAGES, (info_sha256, reviews_sha256))
+                if sha256 in objects and Path(objects[sha256][0]).exists()
+            }
+            snapshots.append({
+                'goods_no': goods_no,
+                'url': url,
+                'captured_at': captured_at,
+                'payload': json.loads(payload) if payload else {},
+                'documents': documents,
+            })
+        return snapshots
+
+    def stats(self) -> Dict[str, int]:
+        """저장소 통계 (스냅샷 수, 상품 수, 문서 수, 원본/저장 바이트)"""
+        snapshots, products = self.conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT goods_no) FROM page_snapshots'
+        ).fetchone()
+        objects, raw, stored = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(stored_bytes), 0) FROM snapshot_objects'
+        ).fetchone()
+        return {'snapshots': snapshots, 'products': products, 'objects': objects,
+                'raw_bytes': raw, 'stored_bytes': stored}
+
+    def close(self):
+        """DB 연결을 종료합니다"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
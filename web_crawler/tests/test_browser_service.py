@@ -0,0 +1,22 @@
+"""core.browser_service 테스트 (브라우저를 실행하지 않음)"""
+
+import os
+
+from core.browser_service import BrowserService
+
+
+def test_paths_follow_output_dir(tmp_path):
+    service = BrowserService(output_dir=str(tmp_path))
+    assert service.profile_dir == tmp_path / 'browser_profile'
+    assert service.state_path == tmp_path / 'browser_service.json'
+
+
+def test_pid_and_rss_come_from_this_services_state(tmp_path):
+    service = BrowserService(port=9333, output_dir=str(tmp_path))
+    assert service.pid() is None
+    assert service.rss_mb() == 0.0
+
+    # 현재 프로세스를 브라우저로 기록해두고 측정
+    service._write_state({'pid': os.getpid(), 'port': service.port})
+    assert service.pid() == os.getpid()
+    assert service.rss_mb() > 0
@@ -0,0 +1,43 @@
+"""storage.change_log 테스트"""
+
+import hashlib
+import sqlite3
+
+from storage.change_log import _review_digests
+
+
+def _conn(goods_count, reviews_per_product=3):
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''
+        CREATE TABLE product_reviews (
+            goods_no TEXT NOT NULL, position INTEGER NOT NULL, review_hash BLOB NOT NULL,
+            PRIMARY KEY (goods_no, position)
+        ) WITHOUT ROWID
+    ''')
+    # 위치 역순으로 넣어 ORDER BY position이 적용되는지 확인
+    conn.executemany('INSERT INTO product_reviews VALUES (?, ?, ?)', [
+        (f'A{i:04d}', position, f'{i}-{position}'.encode())
+        for i in range(goods_count) for position in reversed(range(1, reviews_per_product + 1))
+    ])
+    return conn
+
+
+def _expected(i, reviews_per_product=3):
+    hasher = hashlib.sha1()
+    for position in range(1, reviews_per_product + 1):
+        hasher.update(f'{i}-{position}'.encode())
+    return hasher.hexdigest()
+
+
+def test_review_digests_reads_only_requested_products_across_chunks():
+    conn = _conn(1200)
+    wanted = [f'A{i:04d}' for i in range(0, 1200, 2)] + ['B0000']  # 600개 → 두 번에 나눠 조회
+
+    digests = _review_digests(conn, wanted)
+
+    assert digests == {f'A{i:04d}': _expected(i) for i in range(0, 1200, 2)}
+
+
+def test_review_digests_without_review_table():
+    assert _review_digests(sqlite3.connect(':memory:'), ['A0001']) == {}
+    assert _review_digests(_conn(3), []) == {}
@@ -0,0 +1,61 @@
+"""storage.database_interface 조회 계층 테스트"""
+
+import pytest
+
+from config.constants import INGREDIENTS_NOTICE_KEY
+from scripts.data_processor import DataProcessor
+from storage import exporter
+from storage.database_interface import DatabaseInterface
+
+RAW_INGREDIENTS = '정제수, 2,3-부탄다이올, 부틸렌 글라이콜, 글리세린'
+
+
+def _product(goods_no, rank, ingredients_raw):
+    return {
+        'rank': rank,
+        'name': f'테스트 상품 {goods_no}',
+        'brand': '테스트',
+        'price': 10000 * rank,
+        'rating': 4.5,
+        'category': '스킨케어',
+        'url': f'https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={goods_no}',
+        # 파서는 전성분을 쉼표로만 나누므로 "2,3-부탄다이올"이 "2", "3-부탄다이올"로 쪼개짐
+        'detail_info': {
+            'ingredients': [part.strip() for part in ingredients_raw.split(',')],
+            'full_info': {INGREDIENTS_NOTICE_KEY: ingredients_raw},
+        },
+        'reviews': [],
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    products = [_product('A001', 1, RAW_INGREDIENTS), _product('A002', 2, '정제수, 글리세린')]
+    return exporter.save_to_sqlite(products, output_dir=str(tmp_path))
+
+
+def _goods_nos(db, filters):
+    return [row['goods_no'] for row in db.search_products(filters, columns=['goods_no'], order_by='id')]
+
+
+def test_ingredient_filter_uses_normalized_ingredients(db_path):
+    DataProcessor(str(db_path)).process()
+    with DatabaseInterface(str(db_path)) as db:
+        assert _goods_nos(db, {'ingredient': '2,3-부탄다이올'}) == ['A001']
+        assert _goods_nos(db, {'ingredient': '부틸렌글라이콜'}) == ['A001']
+        assert _goods_nos(db, {'ingredient': '부틸렌 글라이콜'}) == ['A001']
+        assert db.count_products({'ingredient': '글리세린'}) == 2
+
+
+def test_ingredient_filter_before_processing_matches_stored_list(db_path):
+    with DatabaseInterface(str(db_path)) as db:
+        assert _goods_nos(db, {'ingredient': '글리세린'}) == ['A001', 'A002']
+        assert _goods_nos(db, {'ingredient': '2,3-부탄다이올'}) == []
+
+
+def test_unknown_filter_and_sort_are_rejected(db_path):
+    with DatabaseInterface(str(db_path)) as db:
+        with pytest.raises(ValueError):
+            db.search_products({'name; DROP TABLE products': 'x'})
+        with pytest.raises(ValueError):
+            db.search_products(order_by='rank; --')
@@ -0,0 +1,34 @@
+"""core.enrichment_scheduler 상품 단위 커밋 테스트"""
+
+import sqlite3
+
+from core.enrichment_scheduler import EnrichmentScheduler
+from storage import exporter
+
+
+def _product(goods_no, rank):
+    return {
+        'rank': rank,
+        'name': f'테스트 상품 {goods_no}',
+        'brand': '테스트',
+        'price': 10000,
+        'rating': 4.5,
+        'category': '스킨케어',
+        'url': f'https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={goods_no}',
+    }
+
+
+def test_failed_commit_rolls_back_and_later_products_still_commit(tmp_path):
+    exporter.save_to_sqlite([_product('A001', 1), _product('A002', 2)], output_dir=str(tmp_path))
+
+    with EnrichmentScheduler(output_dir=str(tmp_path)) as scheduler:
+        # JSON으로 직렬화할 수 없는 값 → 해시 계산 중 TypeError
+        scheduler.commit(dict(_product('A001', 1), detail_info={'ingredients': {'정제수'}}, reviews=['좋아요']))
+        assert not scheduler.conn.in_transaction
+
+        scheduler.commit(dict(_product('A002', 2), detail_info={'ingredients': ['정제수']}, reviews=['좋아요']))
+
+    assert (scheduler.failed, scheduler.committed) == (1, 1)
+    with sqlite3.connect(tmp_path / 'products.db') as conn:
+        rows = dict(conn.execute('SELECT goods_no, ingredients FROM products'))
+    assert rows == {'A001': '[]', 'A002': '["\\uc815\\uc81c\\uc218"]'}
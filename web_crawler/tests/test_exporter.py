@@ -0,0 +1,46 @@
+"""storage.exporter 저장 테스트"""
+
+import csv
+import sqlite3
+
+from storage import exporter
+
+
+def _product(goods_no, rank, reviews):
+    return {
+        'rank': rank,
+        'name': f'테스트 상품 {goods_no}',
+        'brand': '테스트',
+        'price': 10000,
+        'rating': 4.5,
+        'category': '스킨케어',
+        'url': f'https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={goods_no}',
+        'detail_info': {'ingredients': ['정제수'], 'full_info': {}},
+        'reviews': reviews,
+    }
+
+
+def _review_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        mapped = {row[0] for row in conn.execute('SELECT DISTINCT goods_no FROM product_reviews')}
+        bodies, = conn.execute('SELECT COUNT(*) FROM reviews').fetchone()
+    return mapped, bodies
+
+
+def test_reviews_of_products_leaving_the_ranking_are_pruned(tmp_path):
+    products = [_product('A001', 1, ['촉촉해요', '공통 리뷰']), _product('A002', 2, ['순해요', '공통 리뷰'])]
+    db_path = exporter.save_to_sqlite(products, output_dir=str(tmp_path))
+    assert _review_rows(db_path) == ({'A001', 'A002'}, 3)
+
+    exporter.save_to_sqlite(products[:1], output_dir=str(tmp_path))
+
+    assert _review_rows(db_path) == ({'A001'}, 2)
+
+
+def test_csv_records_review_count_instead_of_bodies(tmp_path):
+    path = exporter.save_to_csv([_product('A001', 1, ['촉촉해요', '순해요'])], output_dir=str(tmp_path))
+
+    with open(path, encoding='utf-8') as f:
+        [row] = list(csv.DictReader(f))
+    assert row['review_count'] == '2'
+    assert 'reviews' not in row
@@ -0,0 +1,37 @@
+"""core.profiling 브라우저 스크립트 측정 테스트 (가짜 드라이버 사용)"""
+
+from core.profiling import Profiler
+from core.selector_resolver import PROBE_SCRIPT, SelectorResolver
+
+
+class FakeDriver:
+    """실행한 스크립트를 기록하고 미리 정한 값을 돌려주는 WebDriver 대역"""
+
+    def __init__(self, result):
+        self.result = result
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return self.result
+
+
+def test_browser_timing_wraps_scripts_containing_percent():
+    script = "return (arguments[0] % 2) + '%s%d' + `${arguments[0]}`;"
+    driver = FakeDriver(['1%s%d7', 0.5])
+    profiler = Profiler('cprofile', browser_timing=True)
+
+    assert profiler.execute_script(driver, 'percent', script, 7) == '1%s%d7'
+    assert script in driver.scripts[0]
+    assert driver.scripts[0].rstrip().endswith('return [__oyResult, performance.now() - __oyStart];')
+    assert profiler.script_times['percent'][0][1] == 0.5
+
+
+def test_selector_probe_is_recorded_by_profiler(tmp_path):
+    driver = FakeDriver([0, 'element', [True]])
+    profiler = Profiler('cprofile')
+    resolver = SelectorResolver(driver, cache_path=str(tmp_path / 'selectors.json'), profiler=profiler)
+
+    assert resolver.find('product_detail', 'info_button', ['#info']) == 'element'
+    assert driver.scripts == [PROBE_SCRIPT]
+    assert len(profiler.script_times['selector_probe']) == 1
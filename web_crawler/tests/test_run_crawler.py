@@ -0,0 +1,90 @@
+"""scripts.run_crawler 명령행 파서 테스트"""
+
+import sqlite3
+
+from config.constants import HTTP_TRANSPORT_DEFAULT, SELENIUM_TABS_DEFAULT, SELENIUM_TAB_MEMORY_BUDGET_MB
+from core import spider as spider_module
+from scripts.run_crawler import _profiler, build_parser, run_pipeline
+from storage import exporter
+
+
+def _parse(argv):
+    return build_parser().parse_args(argv)
+
+
+def test_top_level_options_survive_subcommand():
+    args = _parse(['--tabs', '4', '--memory-budget-mb', '900', '--snapshot',
+                   '--transport', 'httpx', '--browser-service', 'enrich'])
+    assert args.tabs == 4
+    assert args.memory_budget_mb == 900
+    assert args.snapshot is True
+    assert args.browser_service is True
+
+    args = _parse(['--transport', 'httpx', '--max-pages', '3', 'rank'])
+    assert args.transport == 'httpx'
+    assert args.max_pages == 3
+
+
+def test_subcommand_options_override_top_level():
+    args = _parse(['--tabs', '4', 'enrich', '--tabs', '2', '--browser-service'])
+    assert args.tabs == 2
+    assert args.browser_service is True
+
+    args = _parse(['--transport', 'httpx', 'rank', '--transport', 'requests'])
+    assert args.transport == 'requests'
+
+
+def test_defaults_without_options():
+    for argv in ([], ['enrich'], ['rank']):
+        args = _parse(argv)
+        assert args.tabs == SELENIUM_TABS_DEFAULT
+        assert args.memory_budget_mb == SELENIUM_TAB_MEMORY_BUDGET_MB
+        assert args.snapshot is False
+        assert args.browser_service is False
+        assert args.transport == HTTP_TRANSPORT_DEFAULT
+        assert args.max_pages == 1
+
+
+class FakeSpider:
+    """네트워크 없이 고정된 랭킹을 돌려주는 WebSpider 대역 (저장은 실제 exporter 사용)"""
+
+    def __init__(self, transport=None, output_dir=None):
+        self.output_dir = output_dir
+
+    def crawl_products(self, max_pages=1):
+        return [{
+            'rank': rank,
+            'name': f'테스트 상품 {goods_no}',
+            'brand': '테스트',
+            'price': 10000,
+            'rating': 4.5,
+            'category': '스킨케어',
+            'url': f'https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={goods_no}',
+            'detail_info': {'ingredients': ['정제수', '글리세린'], 'full_info': {}},
+            'reviews': ['촉촉해요'],
+        } for rank, goods_no in enumerate(['A001', 'A002'], 1)]
+
+    def save_to_csv(self, products):
+        return exporter.save_to_csv(products, output_dir=self.output_dir)
+
+    def save_to_sqlite(self, products):
+        return exporter.save_to_sqlite(products, output_dir=self.output_dir)
+
+
+def test_default_pipeline_saves_and_post_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(spider_module, 'WebSpider', FakeSpider)
+    args = _parse(['--no-detailed', '--output-dir', str(tmp_path)])
+    args.profiler = _profiler(args)
+
+    assert run_pipeline(args) == 0
+
+    assert (tmp_path / 'products.csv').exists()
+    with sqlite3.connect(tmp_path / 'products.db') as conn:
+        normalized, = conn.execute('SELECT COUNT(DISTINCT goods_no) FROM product_ingredients').fetchone()
+    assert normalized == 2
+
+
+def test_profiles_follow_output_dir(tmp_path):
+    args = _parse(['--profile', 'cprofile', '--output-dir', str(tmp_path), 'export'])
+    profiler = _profiler(args)
+    assert profiler.output_dir.parent == tmp_path / 'profiles'
@@ -0,0 +1,77 @@
+"""core.selenium_extractor 테스트 (브라우저 없이 가짜 드라이버 사용)"""
+
+import pytest
+
+from config.constants import BROWSER_MAX_RSS_MB
+from core import selenium_extractor
+from core.selector_resolver import SelectorResolver
+from core.selenium_extractor import SeleniumProductExtractor
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.setattr(selenium_extractor.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(SeleniumProductExtractor, '_setup_driver',
+                        lambda self: setattr(self, 'driver', FakeDriver()))
+    monkeypatch.setattr(SeleniumProductExtractor, 'extract_product_details',
+                        lambda self, url, max_reviews: {'detail_info': {}, 'reviews': [], 'driver': self.driver})
+    return SeleniumProductExtractor(output_dir=str(tmp_path / 'custom'))
+
+
+def test_selector_cache_follows_output_dir(extractor, tmp_path):
+    assert extractor.selector_resolver.cache_path == tmp_path / 'custom' / 'selector_cache.json'
+
+
+def test_sequential_batch_recycles_browser_over_memory_limit(extractor, monkeypatch):
+    readings = iter([BROWSER_MAX_RSS_MB / 2, BROWSER_MAX_RSS_MB + 1])
+    monkeypatch.setattr(extractor, '_browser_rss_mb', lambda: next(readings))
+    products = [{'url': f'https://example.com/{i}'} for i in range(3)]
+    first_driver = extractor.driver
+
+    results = extractor.batch_extract_details(products, tabs=1)
+
+    # 2번째 상품 전에는 한도 이하, 3번째 상품 전에 한도를 넘어 재시작
+    assert [result['driver'] for result in results[:2]] == [first_driver, first_driver]
+    assert results[2]['driver'] is extractor.driver is not first_driver
+    assert first_driver.quit_called
+    assert isinstance(extractor.selector_resolver, SelectorResolver)
+    assert extractor.selector_resolver.driver is extractor.driver
+
+
+class FakeBrowserService:
+    """메모리 측정값과 재시작 횟수를 기록하는 BrowserService 대역"""
+
+    def __init__(self, rss_mb):
+        self.rss = rss_mb
+        self.restarts = 0
+
+    def ensure(self):
+        return '127.0.0.1:9333'
+
+    def rss_mb(self):
+        return self.rss
+
+    def restart(self):
+        self.restarts += 1
+        return '127.0.0.1:9444'
+
+
+def test_browser_service_instance_is_measured_and_restarted(tmp_path, monkeypatch):
+    monkeypatch.setattr(SeleniumProductExtractor, '_setup_driver',
+                        lambda self: setattr(self, 'driver', FakeDriver()))
+    service = FakeBrowserService(BROWSER_MAX_RSS_MB + 1)
+    extractor = SeleniumProductExtractor(output_dir=str(tmp_path), browser_service=service)
+    assert extractor.debugger_address == '127.0.0.1:9333'
+
+    assert extractor._browser_rss_mb() == BROWSER_MAX_RSS_MB + 1
+    assert extractor._recycle_browser_if_needed(extractor._browser_rss_mb())
+    assert service.restarts == 1
+    assert extractor.debugger_address == '127.0.0.1:9444'
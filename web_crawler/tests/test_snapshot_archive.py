@@ -0,0 +1,17 @@
+"""storage.snapshot_archive 테스트"""
+
+from storage.snapshot_archive import SnapshotArchive, read_object
+
+DOCUMENT = '<!DOCTYPE html><html><body><div data-oy-role="info_table">성분</div></body></html>'
+
+
+def test_objects_are_stored_next_to_the_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with SnapshotArchive('custom/products.db') as archive:
+        archive.put('A001', 'https://example.com/A001', {'info': DOCUMENT}, {'max_reviews': 5})
+        [snapshot] = archive.latest(['A001'])
+
+    path, codec = snapshot['documents']['info']
+    assert path.startswith('custom/snapshots/objects/')
+    assert read_object(path, codec).decode('utf-8') == DOCUMENT
+    assert not (tmp_path / 'output').exists()
@@ -0,0 +1,109 @@
+"""core.spider 테스트 (네트워크 요청 없이 가짜 응답 사용)"""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from core.spider import WebSpider
+
+IMAGE_URL = 'https://image.oliveyoung.co.kr/uploads/images/goods/A001.jpg'
+
+
+def _jpeg(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (32, 32), color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class FakeRequestHandler:
+    """요청 URL을 기록하고 미리 정한 바이트를 돌려주는 RequestHandler 대역"""
+
+    def __init__(self, content):
+        self.content = content
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return SimpleNamespace(content=self.content)
+
+    def stats(self):
+        return {'requests': len(self.urls), 'transport': 'fake', 'versions': '-',
+                'avg_latency_ms': 0, 'wire_bytes': 0}
+
+
+@pytest.fixture
+def spider(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    spider = WebSpider()
+    spider.request_handler = FakeRequestHandler(_jpeg('blue'))
+    yield spider
+    spider.image_store.close()
+
+
+def test_legacy_image_is_imported_once(spider):
+    legacy_path = spider.images_dir / 'A001.jpg'
+    legacy_path.write_bytes(_jpeg('red'))
+
+    path = spider._download_image(IMAGE_URL, 'A001')
+
+    assert path is not None
+    assert spider.request_handler.urls == []
+    assert not legacy_path.exists()
+    assert (spider.images_dir / 'A001.jpg.imported').exists()
+    assert spider._download_image(IMAGE_URL, 'A001') == path
+    assert spider.request_handler.urls == []
+
+
+def test_legacy_image_is_ignored_when_mapping_exists(spider):
+    spider.image_store.put('A001', _jpeg('red'), IMAGE_URL)
+    legacy_path = spider.images_dir / 'A001.jpg'
+    legacy_path.write_bytes(_jpeg('red'))
+
+    # 이미지 URL이 바뀌면 예전 파일 대신 새 이미지를 받아야 함
+    new_url = IMAGE_URL.replace('A001.jpg', 'A001_v2.jpg')
+    spider._download_image(new_url, 'A001')
+
+    assert spider.request_handler.urls == [new_url]
+    assert legacy_path.exists()
+
+
+def test_images_follow_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    spider = WebSpider(output_dir='custom')
+    spider.request_handler = FakeRequestHandler(_jpeg('green'))
+    try:
+        path = spider._download_image(IMAGE_URL, 'A001')
+    finally:
+        spider.image_store.close()
+
+    assert path.startswith('custom/images/objects/')
+    assert (tmp_path / 'custom' / 'products.db').exists()
+    assert not (tmp_path / 'output').exists()
+
+
+@pytest.mark.parametrize('total_count, last_page, page_size, max_products, expected', [
+    (1000, None, 100, 8, 1),    # 기본값 --max-pages 1 → 8개 상품이면 100개 페이지 하나로 충분
+    (1000, None, 8, 16, 2),
+    (1000, None, 48, 100, 3),
+    (120, None, 100, 800, 2),   # 전체 상품 수가 상한보다 적으면 전체 페이지 수
+    (None, 5, 24, 80, 4),
+    (None, None, 100, 8, None),
+])
+def test_plan_pages_caps_on_product_count(spider, total_count, last_page, page_size, max_products, expected):
+    assert spider._plan_pages(total_count, last_page, page_size, max_products) == expected
+
+
+def test_crawl_products_keeps_legacy_page_meaning(spider, monkeypatch):
+    rows = [(f'상품 {i}', '브랜드', 10000, 4.5, f'A{i:03d}', None) for i in range(100)]
+    monkeypatch.setattr(spider, '_probe_first_page', lambda: (100, (rows, 1000, None)))
+    built = []
+    original = spider._build_products
+    monkeypatch.setattr(spider, '_build_products',
+                        lambda page_rows, offset=0: built.extend(page_rows) or original(page_rows, offset))
+
+    products = spider.crawl_products(max_pages=1)
+
+    assert [product['rank'] for product in products] == list(range(1, 9))
+    assert len(built) == 8